@@ -5,14 +5,21 @@ from dotenv import load_dotenv
 from app.database import init_db, db
 from app.models import *
 from app.routes import main 
-from sqlalchemy import inspect
-from sqlalchemy import text 
+from app.schema import schema_registry
+from app.view_counter import view_buffer
+from app.json_provider import FastJSONProvider
+from app.sync import prune_tombstones_command
+from app.events import event_hub, prune_events_command
+from app.geo import geocode_requests_command
+from app.analytics import backfill_daily_stats_command
 
 def create_app():
     #  Load .env variables before config
     load_dotenv()
 
     app = Flask(__name__)
+    # orjson-backed JSON with MessagePack negotiation (see app/json_provider.py)
+    app.json = FastJSONProvider(app)
     # Single CORS configuration for the whole app (dev: Vite on 5173)
     #  Single CORS configuration for the whole app. Read allowed frontend origin from env
     frontend_origin = os.getenv('FRONTEND_ORIGIN') or os.getenv('VITE_API_ORIGIN') or os.getenv('REACT_APP_FRONTEND') or 'http://localhost:5173'
@@ -41,67 +48,26 @@ def create_app():
         # Ensure feedback table exists (create if it doesn't)
         try:
             from app.models import Feedback
-            inspector = inspect(db.engine)
-            if 'feedback' not in inspector.get_table_names():
+            schema_registry.refresh(db.engine)
+            if not schema_registry.has_table('feedback'):
                 Feedback.__table__.create(db.engine, checkfirst=True)
+                schema_registry.refresh(db.engine)
                 print("✅ Feedback table created")
         except Exception as e:
             print(f"⚠️  Note: {str(e)}")
-        
-        # CRITICAL: Add new columns to pin_requests BEFORE any routes/queries
-        try:
-            inspector = inspect(db.engine)
-            
-            # Check if pin_requests table exists
-            if 'pin_requests' in inspector.get_table_names():
-                columns = [col['name'] for col in inspector.get_columns('pin_requests')]
-                
-                # Add preferred_time if it doesn't exist
-                if 'preferred_time' not in columns:
-                    try:
-                        with db.engine.begin() as conn:
-                            conn.execute(text("ALTER TABLE pin_requests ADD COLUMN preferred_time VARCHAR(255)"))
-                        print("✅ Added preferred_time column to pin_requests")
-                    except Exception as e:
-                        error_str = str(e).lower()
-                        if 'already exists' in error_str or 'duplicate' in error_str or 'column' in error_str:
-                            print("✅ preferred_time column already exists")
-                        else:
-                            print(f"⚠️  Could not add preferred_time: {str(e)}")
-                
-                # Add special_requirements if it doesn't exist
-                if 'special_requirements' not in columns:
-                    try:
-                        with db.engine.begin() as conn:
-                            conn.execute(text("ALTER TABLE pin_requests ADD COLUMN special_requirements TEXT"))
-                        print("✅ Added special_requirements column to pin_requests")
-                    except Exception as e:
-                        error_str = str(e).lower()
-                        if 'already exists' in error_str or 'duplicate' in error_str or 'column' in error_str:
-                            print("✅ special_requirements column already exists")
-                        else:
-                            print(f"⚠️  Could not add special_requirements: {str(e)}")
 
-                # Add view_count if it doesn't exist
-                if 'view_count' not in columns:
-                    try:
-                        with db.engine.begin() as conn:
-                            conn.execute(text("ALTER TABLE pin_requests ADD COLUMN view_count INTEGER DEFAULT 0"))
-                        print("✅ Added view_count column to pin_requests")
-                    except Exception as e:
-                        error_str = str(e).lower()
-                        if 'already exists' in error_str or 'duplicate' in error_str or 'column' in error_str:
-                            print("✅ view_count column already exists")
-                        else:
-                            print(f"⚠️  Could not add view_count: {str(e)}")
-        except Exception as e:
-            print(f"⚠️  Note: Could not add columns to pin_requests: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        # Background flush of buffered request view counts (see app/view_counter.py)
+        view_buffer.init_app(app, db.engine)
+        # LISTEN/NOTIFY fan-out for /api/events (see app/events.py)
+        event_hub.init_app(app, db.engine)
 
     # Register blueprints AFTER database setup
     from app.routes import main
     app.register_blueprint(main)
+    app.cli.add_command(prune_tombstones_command)
+    app.cli.add_command(prune_events_command)
+    app.cli.add_command(geocode_requests_command)
+    app.cli.add_command(backfill_daily_stats_command)
 
     print(f"✅ Connected to database: {app.config['SQLALCHEMY_DATABASE_URI']}")
     return app
@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, text
+
+from app.cache import bump_generations
+from app.database import db
+from app.models import DailyRequestStat
+
+# The canonical definition of the daily_request_stats counting rules:
+# 'created' by created_at day, 'completed' by completed_at day for completed
+# requests, with NULL category and urgency counted as 0 and ''. Migration
+# d9f4b2c6e813 copies it as REBUILD and its trigger function applies the same
+# rules per row; change all three together (tests/test_analytics.py pins them)
+REBUILD_SQL = text("""
+    INSERT INTO daily_request_stats (day, transition, category_id, urgency, request_count)
+    SELECT created_at::date, 'created', coalesce(category_id, 0), coalesce(urgency, ''), count(*)
+    FROM pin_requests
+    WHERE created_at IS NOT NULL AND (CAST(:since AS date) IS NULL OR created_at >= CAST(:since AS date))
+    GROUP BY 1, 3, 4
+    UNION ALL
+    SELECT completed_at::date, 'completed', coalesce(category_id, 0), coalesce(urgency, ''), count(*)
+    FROM pin_requests
+    WHERE status = 'completed' AND completed_at IS NOT NULL
+      AND (CAST(:since AS date) IS NULL OR completed_at >= CAST(:since AS date))
+    GROUP BY 1, 3, 4
+""")
+
+BREAKDOWNS = {
+    "day": DailyRequestStat.day,
+    "category": DailyRequestStat.category_id,
+    "urgency": DailyRequestStat.urgency,
+}
+
+
+def rebuild_daily_stats(since=None):
+    """Recount daily_request_stats from pin_requests, for every day or from `since` on.
+
+    pin_requests is share-locked meanwhile, so no write (and no trigger
+    update) lands between the delete and the recount.
+    """
+    db.session.execute(text("LOCK TABLE pin_requests IN SHARE MODE"))
+    query = DailyRequestStat.query
+    if since is not None:
+        query = query.filter(DailyRequestStat.day >= since)
+    query.delete(synchronize_session=False)
+    inserted = db.session.execute(REBUILD_SQL, {"since": since}).rowcount
+    bump_generations('daily_request_stats')
+    db.session.commit()
+    return inserted
+
+
+def daily_request_counts(start_day, end_day):
+    """(day, transition, count) rows for the days from `start_day` through `end_day`."""
+    return db.session.query(
+        DailyRequestStat.day, DailyRequestStat.transition, func.sum(DailyRequestStat.request_count)
+    ).filter(
+        DailyRequestStat.day.between(start_day, end_day)
+    ).group_by(DailyRequestStat.day, DailyRequestStat.transition).all()
+
+
+def request_breakdown(start_day, end_day, transition, by):
+    """{key: count} of one transition over a window, by day, category id or urgency."""
+    key = BREAKDOWNS[by]
+    rows = db.session.query(key, func.sum(DailyRequestStat.request_count)).filter(
+        DailyRequestStat.day.between(start_day, end_day),
+        DailyRequestStat.transition == transition,
+    ).group_by(key).having(func.sum(DailyRequestStat.request_count) != 0).order_by(key).all()
+    return dict(rows)
+
+
+# Bucket name -> generate_series step; the name is also the date_trunc unit
+BUCKETS = {"hour": "1 hour", "day": "1 day", "week": "1 week", "month": "1 month"}
+MAX_BUCKETS = 1500
+# Breakdown -> SQL key over pin_requests p; never NULL, so buckets join on plain equality
+TIMESERIES_GROUPS = {"category": "coalesce(p.category_id, 0)", "urgency": "coalesce(p.urgency, '')"}
+
+# Created (created_at), matched (match_history.matched_at) and completed
+# (completed_at of completed requests) counts per bucket of [:start, :end);
+# generate_series supplies the empty buckets, kept even when there are no groups
+TIMESERIES_SQL = """
+    WITH events AS (
+        SELECT date_trunc('{unit}', p.created_at) AS bucket, {group} AS grp, 1 AS created, 0 AS matched, 0 AS completed
+        FROM pin_requests p
+        WHERE p.created_at >= :start AND p.created_at < :end
+        UNION ALL
+        SELECT date_trunc('{unit}', m.matched_at), {group}, 0, 1, 0
+        FROM match_history m JOIN pin_requests p ON p.pin_requests_id = m.request_id
+        WHERE m.matched_at >= :start AND m.matched_at < :end
+        UNION ALL
+        SELECT date_trunc('{unit}', p.completed_at), {group}, 0, 0, 1
+        FROM pin_requests p
+        WHERE p.status = 'completed' AND p.completed_at >= :start AND p.completed_at < :end
+    ), totals AS (
+        SELECT bucket, grp, sum(created) AS created, sum(matched) AS matched, sum(completed) AS completed
+        FROM events GROUP BY bucket, grp
+    ), buckets AS (
+        SELECT generate_series(
+            date_trunc('{unit}', CAST(:start AS timestamp)),
+            date_trunc('{unit}', CAST(:end AS timestamp) - interval '1 microsecond'),
+            interval '{step}'
+        ) AS bucket
+    ), groups AS (
+        {groups}
+    )
+    SELECT b.bucket, g.grp, coalesce(t.created, 0), coalesce(t.matched, 0), coalesce(t.completed, 0)
+    FROM buckets b LEFT JOIN groups g ON true
+    LEFT JOIN totals t ON t.bucket = b.bucket AND t.grp = g.grp
+    ORDER BY b.bucket, g.grp
+"""
+
+
+def bucket_count(start, end, bucket):
+    """Upper bound on the buckets generate_series returns for [start, end)."""
+    if bucket == 'month':
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    step = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}[bucket]
+    return int((end - start) / step) + 2
+
+
+def request_timeseries(start, end, bucket, group_by=None):
+    """(bucket start, group key, created, matched, completed) rows, every bucket present.
+
+    Without `group_by` the group key is 0. With it, every group that has an
+    event in the window gets a row in every bucket; if no group has one,
+    each bucket comes back once with a None group key.
+    """
+    if group_by:
+        sql = TIMESERIES_SQL.format(unit=bucket, step=BUCKETS[bucket], group=TIMESERIES_GROUPS[group_by],
+                                    groups="SELECT DISTINCT grp FROM totals")
+    else:
+        sql = TIMESERIES_SQL.format(unit=bucket, step=BUCKETS[bucket], group="0", groups="SELECT 0 AS grp")
+    return db.session.execute(text(sql), {"start": start, "end": end}).all()
+
+
+@click.command('backfill-daily-stats')
+@click.option('--since', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Only recount days from this date (YYYY-MM-DD); default is all history.')
+@with_appcontext
+def backfill_daily_stats_command(since):
+    """Rebuild the daily_request_stats rollup from pin_requests."""
+    since = since.date() if since else None
+    inserted = rebuild_daily_stats(since)
+    click.echo(f"Rebuilt {inserted} daily_request_stats rows" + (f" from {since.isoformat()}" if since else ""))
@@ -0,0 +1,219 @@
+import functools
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import Response, make_response, request
+from sqlalchemy import bindparam, text
+
+from app.database import db
+from app.compression import strip_etag_suffix
+from app.json_provider import MSGPACK_MIMETYPE, preferred_format
+
+# New rows start from the clock (epoch ms) rather than 1, so a recreated
+# database never hands out generations (and ETags) an old client has seen
+BUMP_SQL = text("""
+    INSERT INTO cache_generations (table_name, generation)
+    SELECT name, (extract(epoch FROM clock_timestamp()) * 1000)::bigint
+    FROM unnest(CAST(:names AS TEXT[])) AS name
+    ON CONFLICT (table_name) DO UPDATE SET generation = cache_generations.generation + 1
+""")
+
+READ_SQL = text(
+    "SELECT table_name, generation FROM cache_generations WHERE table_name IN :names"
+).bindparams(bindparam('names', expanding=True))
+
+
+def bump_generations(*tables):
+    """Invalidate cached responses that read `tables`.
+
+    Runs in the caller's transaction, so the new generation becomes visible
+    to other workers together with the write itself. Call it before commit.
+    """
+    # Sorted so concurrent writers lock the generation rows in the same order
+    db.session.execute(BUMP_SQL, {"names": sorted(set(tables))})
+
+
+def current_generations(tables):
+    # Memoized per request so stacked decorators share one probe query
+    memo = request.environ.setdefault('app.cache_generations', {})
+    if tables not in memo:
+        rows = db.session.execute(READ_SQL, {"names": list(tables)}).all()
+        found = dict(rows)
+        memo[tables] = tuple(found.get(t, 0) for t in tables)
+    return memo[tables]
+
+
+def _source_fingerprint():
+    # Changes whenever the app code (and so possibly a payload shape) changes,
+    # so a deploy never answers 304 for a body the client has in the old shape
+    digest = hashlib.sha1()
+    package_dir = os.path.dirname(__file__)
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith('.py'):
+            with open(os.path.join(package_dir, name), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+ETAG_VERSION = os.getenv('APP_VERSION') or _source_fingerprint()
+
+
+class ResponseCache:
+    """Per-worker LRU of serialized JSON responses.
+
+    Entries are tagged with the generations of the tables they were built
+    from; an entry is only served while those generations are unchanged.
+    Capped by entry count and by total body bytes.
+    """
+
+    def __init__(self, max_entries=512, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (generations, expires_at, body)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, generations, now=None):
+        now = now or datetime.utcnow()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_generations, expires_at, body = entry
+                if entry_generations == generations and (expires_at is None or expires_at > now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, generations, body, expires_at=None):
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (generations, expires_at, body)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, _, body = self._entries.pop(key)
+        self._bytes -= len(body)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 512)),
+    max_bytes=int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024)),
+)
+
+
+def cached_response(*tables, expires=None):
+    """Serve a GET endpoint's 200 JSON response from response_cache.
+
+    The key is the endpoint plus its view and query arguments. `expires`
+    is an optional callable(now) -> datetime for results that also go
+    stale with the clock (e.g. "today" counts).
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                generations = current_generations(tables)
+            except Exception as e:
+                # Without generations we cannot tell what is fresh; skip the cache
+                print(f"Warning: response cache bypassed: {str(e)}")
+                db.session.rollback()
+                return view(*args, **kwargs)
+
+            fmt = preferred_format()
+            key = (
+                request.endpoint,
+                tuple(sorted(kwargs.items())),
+                tuple(sorted(request.args.items(multi=True))),
+                fmt,
+            )
+            mimetype = MSGPACK_MIMETYPE if fmt == 'msgpack' else 'application/json'
+            body = response_cache.get(key, generations)
+            if body is not None:
+                response = Response(body, status=200, mimetype=mimetype)
+                response.vary.add('Accept')
+                return response
+
+            rv = view(*args, **kwargs)
+            response = rv[0] if isinstance(rv, tuple) else rv
+            status = rv[1] if isinstance(rv, tuple) and len(rv) > 1 else getattr(response, 'status_code', 200)
+            if status == 200 and isinstance(response, Response) and response.mimetype == mimetype:
+                now = datetime.utcnow()
+                response_cache.put(key, generations, response.get_data(), expires(now) if expires else None)
+            return rv
+        return wrapper
+    return decorator
+
+
+def conditional_response(*tables):
+    """Strong ETag / If-None-Match for a GET endpoint built from `tables`.
+
+    The tag is derived from the table generations and the request URL, not
+    from the body, so a matching If-None-Match is answered with 304 after
+    one probe query and before the view runs.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                generations = current_generations(tables)
+            except Exception as e:
+                print(f"Warning: ETag skipped: {str(e)}")
+                db.session.rollback()
+                return view(*args, **kwargs)
+
+            state = repr((ETAG_VERSION, request.endpoint, sorted(kwargs.items()),
+                          sorted(request.args.items(multi=True)), preferred_format(), generations))
+            etag = hashlib.sha1(state.encode()).hexdigest()
+            # Compressed bodies carry a suffixed tag (see app/compression.py)
+            matched = next((tag for tag in request.if_none_match.as_set()
+                            if strip_etag_suffix(tag) == etag), None)
+            if matched:
+                response = Response(status=304)
+                response.set_etag(matched)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                # Let browsers keep the body but revalidate on every use
+                response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
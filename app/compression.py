@@ -0,0 +1,121 @@
+import os
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/msgpack',
+    'application/x-ndjson',
+    'text/csv',
+    'text/html',
+    'text/plain',
+}
+# Bodies below this size are sent as is; compressing them costs more than it saves
+MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+
+# A compressed body is a different representation, so it gets its own strong ETag
+ETAG_SUFFIXES = {'gzip': '-gzip', 'br': '-br'}
+
+
+def no_compression(view):
+    """Opt a route out of response compression (e.g. event streams)."""
+    view.no_compression = True
+    return view
+
+
+def _choose_encoding():
+    # The client's q-values decide; brotli wins a tie
+    accept = request.accept_encodings
+    br = accept['br'] if brotli is not None else 0
+    if br and br >= accept['gzip']:
+        return 'br'
+    if accept['gzip']:
+        return 'gzip'
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._obj = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            # wbits 16 + 15: zlib stream with a gzip header and trailer
+            self._obj = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data):
+        # Flush per chunk so streamed rows reach the client without waiting for more
+        if self.encoding == 'br':
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._obj.finish()
+        return self._obj.flush()
+
+    def whole(self, data):
+        if self.encoding == 'br':
+            return self._obj.process(data) + self._obj.finish()
+        return self._obj.compress(data) + self._obj.flush()
+
+
+def _stream(iterable, compressor):
+    try:
+        for data in iterable:
+            if isinstance(data, str):
+                data = data.encode()
+            if data:
+                yield compressor.chunk(data)
+        yield compressor.finish()
+    finally:
+        close = getattr(iterable, 'close', None)
+        if close is not None:
+            close()
+
+
+def compress_response(response):
+    """after_request hook: gzip/brotli by Accept-Encoding, streamed bodies chunk by chunk."""
+    view = current_app.view_functions.get(request.endpoint)
+    if getattr(view, 'no_compression', False):
+        return response
+    if (response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or request.method == 'HEAD'):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _stream(response.response, _Compressor(encoding))
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+        if len(body) < MIN_SIZE:
+            return response
+        response.set_data(_Compressor(encoding).whole(body))
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + ETAG_SUFFIXES[encoding], weak=weak)
+    return response
+
+
+def strip_etag_suffix(etag):
+    for suffix in ETAG_SUFFIXES.values():
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)]
+    return etag
@@ -0,0 +1,54 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+# 0 runs every section on the request's own session, one after the other.
+# Above 0, independent sections fan out to a pool of that many threads.
+WORKERS = int(os.getenv('DASHBOARD_WORKERS', 0))
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard')
+            _pool_workers = workers
+        return _pool
+
+
+def _timed(section):
+    start = time.perf_counter()
+    result = section()
+    return result, round((time.perf_counter() - start) * 1000, 2)
+
+
+def _timed_in_app_context(app, section):
+    # A Session is not thread safe: each pool thread gets its own app context,
+    # and so its own scoped session, which is removed again on teardown
+    with app.app_context():
+        return _timed(section)
+
+
+def run_sections(sections, workers=None):
+    """Run {name: callable} sections; returns ({name: result}, {name: elapsed ms}).
+
+    The callables must only read shared state (e.g. preloaded reference data).
+    """
+    workers = WORKERS if workers is None else workers
+    if workers > 0 and len(sections) > 1:
+        app = current_app._get_current_object()
+        pool = _get_pool(workers)
+        futures = {name: pool.submit(_timed_in_app_context, app, section) for name, section in sections.items()}
+        outcomes = {name: future.result() for name, future in futures.items()}
+    else:
+        outcomes = {name: _timed(section) for name, section in sections.items()}
+    results = {name: result for name, (result, _) in outcomes.items()}
+    timings = {name: ms for name, (_, ms) in outcomes.items()}
+    return results, timings
@@ -0,0 +1,223 @@
+import json
+import os
+import queue
+import select
+import threading
+import time
+from datetime import timedelta
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import func, text
+
+from app.database import db
+from app.models import RequestEvent
+
+NOTIFY_CHANNEL = 'request_events'
+NOTIFY_SQL = text("SELECT pg_notify('request_events', :payload)")
+# Held from publish() until commit, so event ids are handed out in commit order
+PUBLISH_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('request_events'))")
+
+HEARTBEAT = float(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+# Each open stream holds a worker thread, so keep some threads for normal requests
+MAX_CONNECTIONS = int(os.getenv('SSE_MAX_CONNECTIONS', 16))
+# A client this far behind is told to reload instead of being replayed
+RESUME_LIMIT = 500
+QUEUE_SIZE = 256
+EVENT_RETENTION = timedelta(hours=int(os.getenv('EVENT_RETENTION_HOURS', 24)))
+
+
+def role_channel(role):
+    return f"role:{role}"
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+def event_message(event):
+    return {
+        "id": event.event_id,
+        "type": event.event_type,
+        "channels": event.channels,
+        "data": event.payload,
+    }
+
+
+def publish(event_type, req, channels, **data):
+    """Record a lifecycle event for `req` and notify every worker.
+
+    Runs in the caller's transaction; NOTIFY is delivered only if it commits.
+    Call it after the write, right before commit: publishers queue on a lock
+    until the previous one commits, so a later event id never becomes visible
+    before an earlier one (Last-Event-ID resume relies on that).
+    """
+    db.session.flush()
+    db.session.execute(PUBLISH_LOCK_SQL)
+    payload = {"request_id": req.pin_requests_id, "status": req.status, **data}
+    event = RequestEvent(event_type=event_type, channels=sorted(set(channels)), payload=payload)
+    db.session.add(event)
+    db.session.flush()
+    db.session.execute(NOTIFY_SQL, {"payload": json.dumps(event_message(event))})
+
+
+def backlog(channels, last_event_id):
+    """Events after `last_event_id` for `channels`, or None if the client should reload."""
+    oldest = db.session.query(func.min(RequestEvent.event_id)).scalar()
+    if oldest is not None and last_event_id < oldest - 1:
+        return None  # pruned past the client's position
+    events = RequestEvent.query.filter(
+        RequestEvent.event_id > last_event_id,
+        RequestEvent.channels.overlap(sorted(channels))
+    ).order_by(RequestEvent.event_id).limit(RESUME_LIMIT + 1).all()
+    if len(events) > RESUME_LIMIT:
+        return None
+    return [event_message(e) for e in events]
+
+
+def format_event(message):
+    return f"id: {message['id']}\nevent: {message['type']}\ndata: {json.dumps(message['data'])}\n\n"
+
+
+class Subscription:
+    def __init__(self, channels):
+        self.channels = frozenset(channels)
+        self.queue = queue.Queue(QUEUE_SIZE)
+        # Set when events were dropped; the stream ends and the client resumes from the table
+        self.lost = False
+
+
+class EventHub:
+    """Per-worker fan-out of request events to SSE streams.
+
+    One listener thread holds a dedicated connection on LISTEN request_events
+    and hands each notification to the subscriptions whose channels it is
+    addressed to. It is started by the first subscriber.
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self._lock = threading.Lock()
+        self._subscriptions = set()
+        self._engine = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    def init_app(self, app, engine):
+        self._engine = engine
+
+    def subscribe(self, channels):
+        """A new Subscription, or None when this worker is at its connection cap."""
+        with self._lock:
+            if len(self._subscriptions) >= self.max_connections:
+                return None
+            sub = Subscription(channels)
+            self._subscriptions.add(sub)
+            if self._thread is None and self._engine is not None:
+                self._thread = threading.Thread(target=self._run, name='event-listener', daemon=True)
+                self._thread.start()
+        # Anything committed from here on reaches the queue, so a backlog read now leaves no gap
+        if self._thread is not None:
+            self._ready.wait(5)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscriptions.discard(sub)
+
+    def connections(self):
+        with self._lock:
+            return len(self._subscriptions)
+
+    def dispatch(self, message):
+        channels = set(message["channels"])
+        with self._lock:
+            targets = [s for s in self._subscriptions if s.channels & channels]
+        for sub in targets:
+            try:
+                sub.queue.put_nowait(message)
+            except queue.Full:
+                sub.lost = True
+
+    def _drop_all(self):
+        with self._lock:
+            for sub in self._subscriptions:
+                sub.lost = True
+
+    def _run(self):
+        while True:
+            try:
+                raw = self._engine.raw_connection()
+                conn = raw.driver_connection
+                raw.detach()  # held for good, so keep it out of the pool
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self._ready.set()
+                while True:
+                    if select.select([conn], [], [], 5)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            self.dispatch(json.loads(conn.notifies.pop(0).payload))
+            except Exception as e:
+                print(f"Warning: Event listener lost its connection: {str(e)}")
+                self._ready.clear()
+                # Notifications sent while reconnecting are gone; streams resume from the table
+                self._drop_all()
+                time.sleep(1)
+
+
+RESET_EVENT = "event: reset\ndata: {}\n\n"
+
+
+def latest_event_id():
+    return db.session.query(func.max(RequestEvent.event_id)).scalar() or 0
+
+
+def stream(hub, sub, replay, start_id=None):
+    """SSE body: replayed events, then live ones, with heartbeat comments while idle.
+
+    `replay` None means the client is too far behind to catch up; it gets a
+    reset event and should reload its lists. `start_id` gives a new client a
+    Last-Event-ID to resume from even if no event arrives before it drops.
+    """
+    try:
+        yield "retry: 3000\n\n"
+        if start_id is not None:
+            yield f"id: {start_id}\n\n"
+        if replay is None:
+            yield RESET_EVENT
+            replay = []
+        sent = set()
+        for message in replay:
+            sent.add(message["id"])
+            yield format_event(message)
+        while not sub.lost:
+            try:
+                message = sub.queue.get(timeout=HEARTBEAT)
+            except queue.Empty:
+                yield ": heartbeat\n\n"
+                continue
+            if message["id"] not in sent:
+                yield format_event(message)
+        # Closing makes EventSource reconnect with Last-Event-ID, which replays what was dropped
+    finally:
+        hub.unsubscribe(sub)
+
+
+def prune_events(retention=EVENT_RETENTION):
+    cutoff = func.timezone('utc', func.now()) - retention
+    deleted = RequestEvent.query.filter(RequestEvent.created_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+@click.command('prune-events')
+@click.option('--hours', type=int, default=int(EVENT_RETENTION.total_seconds() // 3600), show_default=True,
+              help='Keep events this many hours.')
+@with_appcontext
+def prune_events_command(hours):
+    """Delete request events older than the resume window."""
+    click.echo(f"Pruned {prune_events(timedelta(hours=hours))} events")
+
+
+event_hub = EventHub()
@@ -0,0 +1,198 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from sqlalchemy import Boolean, Date, DateTime, func, select, true
+from sqlalchemy.orm import aliased
+
+from app.models import User, PinRequest, MatchHistory, Feedback, Category
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# Rows fetched from the server-side cursor (and written out) at a time
+BATCH_SIZE = 2000
+
+
+class ExportError(ValueError):
+    """Raised for a bad export dataset, format or filter; routes turn it into a 400."""
+
+
+def _requests_export():
+    requester, csr = aliased(User), aliased(User)
+    # Latest match and latest feedback per request, each one index probe
+    latest_match = select(MatchHistory.csr_id, MatchHistory.match_status, MatchHistory.matched_at).where(
+        MatchHistory.request_id == PinRequest.pin_requests_id
+    ).order_by(MatchHistory.matched_at.desc()).limit(1).lateral()
+    latest_feedback = select(Feedback.rating, Feedback.comment, Feedback.anonymous, Feedback.submitted_at).where(
+        Feedback.request_id == PinRequest.pin_requests_id
+    ).order_by(Feedback.submitted_at.desc()).limit(1).lateral()
+    statement = select(
+        PinRequest.pin_requests_id.label("id"),
+        PinRequest.title,
+        PinRequest.description,
+        func.coalesce(Category.name, "Uncategorized").label("category"),
+        PinRequest.status,
+        PinRequest.urgency,
+        PinRequest.location,
+        PinRequest.latitude,
+        PinRequest.longitude,
+        PinRequest.preferred_time,
+        PinRequest.special_requirements,
+        PinRequest.user_id.label("requester_id"),
+        requester.name.label("requester_name"),
+        latest_match.c.csr_id.label("assigned_csr_id"),
+        csr.name.label("assigned_csr_name"),
+        latest_match.c.match_status,
+        latest_match.c.matched_at,
+        PinRequest.created_at,
+        PinRequest.completed_at,
+        PinRequest.completion_note,
+        latest_feedback.c.rating.label("feedback_rating"),
+        latest_feedback.c.comment.label("feedback_comment"),
+        latest_feedback.c.anonymous.label("feedback_anonymous"),
+        latest_feedback.c.submitted_at.label("feedback_submitted_at"),
+    ).select_from(PinRequest).outerjoin(
+        Category, Category.categories_id == PinRequest.category_id
+    ).outerjoin(
+        requester, requester.users_id == PinRequest.user_id
+    ).outerjoin(latest_match, true()).outerjoin(
+        csr, csr.users_id == latest_match.c.csr_id
+    ).outerjoin(latest_feedback, true()).order_by(PinRequest.pin_requests_id)
+    return statement, PinRequest.created_at, PinRequest.status
+
+
+def _matches_export():
+    csr = aliased(User)
+    statement = select(
+        MatchHistory.match_history_id.label("id"),
+        MatchHistory.request_id,
+        PinRequest.title.label("request_title"),
+        func.coalesce(Category.name, "Uncategorized").label("category"),
+        PinRequest.status.label("request_status"),
+        MatchHistory.csr_id,
+        csr.name.label("csr_name"),
+        MatchHistory.match_status,
+        MatchHistory.matched_at,
+        PinRequest.completed_at,
+    ).select_from(MatchHistory).outerjoin(
+        PinRequest, PinRequest.pin_requests_id == MatchHistory.request_id
+    ).outerjoin(
+        Category, Category.categories_id == PinRequest.category_id
+    ).outerjoin(
+        csr, csr.users_id == MatchHistory.csr_id
+    ).order_by(MatchHistory.match_history_id)
+    return statement, MatchHistory.matched_at, MatchHistory.match_status
+
+
+def _feedback_export():
+    statement = select(
+        Feedback.feedback_id.label("id"),
+        Feedback.request_id,
+        PinRequest.title.label("request_title"),
+        func.coalesce(Category.name, "Uncategorized").label("category"),
+        Feedback.rating,
+        Feedback.comment,
+        Feedback.anonymous,
+        Feedback.submitted_at,
+    ).select_from(Feedback).outerjoin(
+        PinRequest, PinRequest.pin_requests_id == Feedback.request_id
+    ).outerjoin(
+        Category, Category.categories_id == PinRequest.category_id
+    ).order_by(Feedback.feedback_id)
+    return statement, Feedback.submitted_at, None
+
+
+# Dataset -> builder of (statement, ?from=/?to= column, ?status= column)
+DATASETS = {"requests": _requests_export, "matches": _matches_export, "feedback": _feedback_export}
+
+
+def export_statement(dataset, start=None, end=None, status=None):
+    """The SELECT behind one export, ordered by id; the window is [start, end)."""
+    if dataset not in DATASETS:
+        raise ExportError(f"dataset must be one of: {', '.join(DATASETS)}")
+    statement, time_column, status_column = DATASETS[dataset]()
+    if start is not None:
+        statement = statement.where(time_column >= start)
+    if end is not None:
+        statement = statement.where(time_column < end)
+    if status:
+        if status_column is None:
+            raise ExportError(f"status does not apply to the {dataset} export")
+        statement = statement.where(status_column == status)
+    return statement
+
+
+# CSV cells for the columns that need more than str(); everything else is written as is
+CSV_CONVERTERS = {DateTime: datetime.isoformat, Date: date.isoformat, Boolean: lambda value: 'true' if value else 'false'}
+
+
+def csv_converters(statement):
+    """(column position, converter) for the columns of `statement` that need one."""
+    converters = []
+    for position, column in enumerate(statement.selected_columns):
+        for type_, convert in CSV_CONVERTERS.items():
+            if isinstance(column.type, type_):
+                converters.append((position, convert))
+                break
+    return converters
+
+
+def _json_default(obj):
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def encode_rows(rows, columns, fmt, converters=(), header=False):
+    """One chunk of the export body: CSV lines (after the header when asked) or NDJSON lines."""
+    if fmt == 'csv':
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator='\n')
+        if header:
+            writer.writerow(columns)
+        if converters:
+            rows = [list(row) for row in rows]
+            for row in rows:
+                for position, convert in converters:
+                    if row[position] is not None:
+                        row[position] = convert(row[position])
+        writer.writerows(rows)
+        return out.getvalue().encode()
+    if orjson is not None:
+        return b''.join(orjson.dumps(dict(zip(columns, row)), option=orjson.OPT_APPEND_NEWLINE) for row in rows)
+    return ''.join(json.dumps(dict(zip(columns, row)), default=_json_default) + '\n' for row in rows).encode()
+
+
+def stream_export(engine, statement, fmt, batch_size=BATCH_SIZE):
+    """Yield the export body in chunks of `batch_size` rows.
+
+    Runs on a connection of its own, in a read-only REPEATABLE READ
+    transaction, so the whole file is one consistent snapshot however long
+    the download takes. Rows come from a server-side cursor, so memory does
+    not grow with the table. If the client goes away, the WSGI server closes
+    this generator: the cursor is closed and the transaction rolled back,
+    which stops the query on the server.
+    """
+    connection = engine.connect().execution_options(
+        isolation_level='REPEATABLE READ', postgresql_readonly=True, yield_per=batch_size,
+    )
+    try:
+        with connection.begin():
+            result = connection.execute(statement)
+            try:
+                columns = [str(key) for key in result.keys()]
+                converters = csv_converters(statement) if fmt == 'csv' else ()
+                if fmt == 'csv':
+                    yield encode_rows([], columns, fmt, header=True)
+                for rows in result.partitions():
+                    yield encode_rows(rows, columns, fmt, converters)
+            finally:
+                # Closes the server-side cursor while its transaction is still open
+                result.close()
+    finally:
+        connection.close()
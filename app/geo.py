@@ -0,0 +1,166 @@
+import csv
+import math
+import os
+import re
+
+import click
+from flask.cli import with_appcontext
+
+GAZETTEER_PATH = os.getenv('GAZETTEER_PATH') or os.path.join(os.path.dirname(__file__), 'data', 'gazetteer.csv')
+
+# Stored points are (longitude * LONGITUDE_SCALE, latitude): an equirectangular
+# projection around the gazetteer's latitude, so plain point distance in
+# Postgres is ground distance (to well under 1% across Singapore)
+REFERENCE_LATITUDE = 1.35
+LONGITUDE_SCALE = math.cos(math.radians(REFERENCE_LATITUDE))
+KM_PER_DEGREE = 111.195
+
+MAX_RADIUS_KM = 50
+DEFAULT_NEAREST = 50
+MAX_NEAREST = 500
+
+# A six-digit postcode; its first two digits are the postal sector
+POSTCODE = re.compile(r'(?<!\d)(\d{2})\d{4}(?!\d)')
+
+
+class GeoQueryError(ValueError):
+    """Raised for bad ?lat=&lon=&near=&radius_km=&nearest= arguments; routes turn it into a 400."""
+
+
+def normalize_place(text):
+    return ' '.join(re.findall(r'[a-z0-9]+', (text or '').lower()))
+
+
+class Gazetteer:
+    """Offline lookup of free-text locations to (latitude, longitude).
+
+    A postcode resolves to its postal sector's centroid. Otherwise the
+    longest place name found in the text wins, so 'Jurong West St 52'
+    resolves to Jurong West rather than Jurong.
+    """
+
+    def __init__(self, places, sectors):
+        self.places = sorted(places.items(), key=lambda item: len(item[0]), reverse=True)
+        self.sectors = sectors
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        places, sectors = {}, {}
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                coordinates = (float(row['latitude']), float(row['longitude']))
+                if row['kind'] == 'sector':
+                    sectors[row['name']] = coordinates
+                else:
+                    places[normalize_place(row['name'])] = coordinates
+        return cls(places, sectors)
+
+    def locate(self, text):
+        if not text:
+            return None
+        for match in POSTCODE.finditer(text):
+            if match.group(1) in self.sectors:
+                return self.sectors[match.group(1)]
+        padded = f" {normalize_place(text)} "
+        for name, coordinates in self.places:
+            if f" {name} " in padded:
+                return coordinates
+        return None
+
+
+gazetteer = Gazetteer.load()
+
+
+def locate(text):
+    return gazetteer.locate(text)
+
+
+def project(latitude, longitude):
+    """The stored point for a position; see REQUEST_GEO_POINT in app/models.py."""
+    return longitude * LONGITUDE_SCALE, latitude
+
+
+def _float_arg(args, name, low, high):
+    try:
+        value = float(args[name])
+    except ValueError:
+        raise GeoQueryError(f"{name} must be a number")
+    if not low <= value <= high:
+        raise GeoQueryError(f"{name} must be between {low} and {high}")
+    return value
+
+
+def parse_geo_args(args):
+    """The location query in ?lat=&lon= or ?near=, or None when there is none.
+
+    ?radius_km= keeps requests within that distance; ?nearest= keeps the
+    closest ones (default DEFAULT_NEAREST when no radius is given).
+    """
+    if 'near' in args:
+        coordinates = locate(args['near'])
+        if coordinates is None:
+            raise GeoQueryError(f"Unknown location '{args['near']}'")
+        latitude, longitude = coordinates
+    elif 'lat' in args or 'lon' in args:
+        if 'lat' not in args or 'lon' not in args:
+            raise GeoQueryError("lat and lon must be given together")
+        latitude = _float_arg(args, 'lat', -90, 90)
+        longitude = _float_arg(args, 'lon', -180, 180)
+    else:
+        if 'radius_km' in args or 'nearest' in args:
+            raise GeoQueryError("radius_km and nearest need lat and lon, or near")
+        return None
+
+    radius_km = _float_arg(args, 'radius_km', 0, MAX_RADIUS_KM) if 'radius_km' in args else None
+    nearest = None
+    if 'nearest' in args:
+        try:
+            nearest = int(args['nearest'])
+        except ValueError:
+            raise GeoQueryError("nearest must be an integer")
+        if nearest < 1:
+            raise GeoQueryError("nearest must be at least 1")
+        nearest = min(nearest, MAX_NEAREST)
+    elif radius_km is None:
+        nearest = DEFAULT_NEAREST
+    return {"latitude": latitude, "longitude": longitude, "radius_km": radius_km, "nearest": nearest}
+
+
+@click.command('geocode-requests')
+@click.option('--all', 'everything', is_flag=True, help='Re-geocode requests that already have coordinates.')
+@click.option('--batch-size', type=int, default=1000, show_default=True)
+@with_appcontext
+def geocode_requests_command(everything, batch_size):
+    """Fill request coordinates from their locations using the gazetteer."""
+    from sqlalchemy import update
+    from app.cache import bump_generations
+    from app.database import db
+    from app.models import PinRequest
+
+    query = db.session.query(PinRequest.pin_requests_id, PinRequest.location).filter(PinRequest.location.isnot(None))
+    if not everything:
+        query = query.filter(PinRequest.latitude.is_(None))
+    located = unmatched = 0
+    last_id = 0
+    while True:
+        rows = query.filter(PinRequest.pin_requests_id > last_id).order_by(PinRequest.pin_requests_id).limit(batch_size).all()
+        if not rows:
+            break
+        last_id = rows[-1].pin_requests_id
+        updates = []
+        for request_id, location in rows:
+            coordinates = locate(location)
+            if coordinates is None:
+                unmatched += 1
+                if not everything:
+                    continue
+                # The gazetteer no longer knows this place, so drop its old position
+                coordinates = (None, None)
+            else:
+                located += 1
+            updates.append({"pin_requests_id": request_id, "latitude": coordinates[0], "longitude": coordinates[1]})
+        if updates:
+            db.session.execute(update(PinRequest), updates)
+            bump_generations('pin_requests')
+            db.session.commit()
+    click.echo(f"Geocoded {located} requests; {unmatched} locations not in the gazetteer")
@@ -0,0 +1,82 @@
+import json
+from datetime import date, datetime
+
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: only JSON is offered
+    msgpack = None
+
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+
+def _encode_default(obj):
+    # Datetimes go out as ISO 8601 (what the dashboards parse), not Flask's HTTP date
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+def preferred_format():
+    """'msgpack' when the client explicitly prefers it over JSON, else 'json'."""
+    if msgpack is None or not has_request_context():
+        return 'json'
+    accept = request.accept_mimetypes
+    if accept[MSGPACK_MIMETYPE] and accept[MSGPACK_MIMETYPE] > accept['application/json']:
+        return 'msgpack'
+    return 'json'
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson when it is installed.
+
+    jsonify() also negotiates MessagePack: clients sending
+    `Accept: application/msgpack` get the same payload msgpack-encoded.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return self._orjson_dumps(obj).decode()
+        kwargs.setdefault('default', _encode_default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def _orjson_dumps(self, obj):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_encode_default, option=option)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if preferred_format() == 'msgpack':
+            body = msgpack.packb(obj, default=_encode_default, use_bin_type=True)
+            response = self._app.response_class(body, mimetype=MSGPACK_MIMETYPE)
+            response.vary.add('Accept')
+            return response
+        if orjson is not None and not self._app.debug:
+            body = self._orjson_dumps(obj) + b"\n"
+        else:
+            dump_args = {}
+            if (self.compact is None and self._app.debug) or self.compact is False:
+                dump_args.setdefault('indent', 2)
+            else:
+                dump_args.setdefault('separators', (',', ':'))
+            body = f"{self.dumps(obj, **dump_args)}\n"
+        response = self._app.response_class(body, mimetype=self.mimetype)
+        if msgpack is not None:
+            response.vary.add('Accept')
+        return response
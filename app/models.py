@@ -1,15 +1,57 @@
 from app.database import db
 from datetime import datetime
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.dialects.postgresql import base as postgresql_base
+from sqlalchemy.orm import validates
+from sqlalchemy.types import UserDefinedType
+from app.geo import REFERENCE_LATITUDE, locate
+
+# Database clock in UTC (naive, like the utcnow() defaults); delta sync cursors compare against it
+UTC_NOW = "(now() AT TIME ZONE 'utc')"
+
+
+def updated_at_column():
+    """updated_at maintained by the database on insert and by the ORM on every update."""
+    return db.Column(
+        db.DateTime, nullable=False, index=True,
+        server_default=db.text(UTC_NOW), onupdate=db.func.timezone('utc', db.func.now())
+    )
+
+
+# Canonical role values stored in users.role
+ROLES = ('pin', 'csr_rep', 'platform_manager', 'admin')
+
+# Legacy labels (seed data, admin UI) mapped to canonical roles, keyed by lower-case label
+ROLE_ALIASES = {
+    'pin': 'pin',
+    'csr_rep': 'csr_rep', 'csr rep': 'csr_rep', 'csr': 'csr_rep',
+    'platform_manager': 'platform_manager', 'platform manager': 'platform_manager', 'pm': 'platform_manager',
+    'admin': 'admin',
+}
+
+
+def normalize_role(value):
+    """Return the canonical role for a label, or None if it is not recognized."""
+    if not value:
+        return None
+    return ROLE_ALIASES.get(str(value).strip().lower())
+
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.CheckConstraint(
+            "role IN ('pin', 'csr_rep', 'platform_manager', 'admin')",
+            name='ck_users_role'
+        ),
+    )
     
     users_id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(50), unique=True, nullable=False)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False)
     password = db.Column(db.String(100), nullable=False)
-    role = db.Column(db.String(50), nullable=False)
+    role = db.Column(db.String(50), nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relationships
@@ -17,6 +59,13 @@ class User(db.Model):
     csr_matches = db.relationship('MatchHistory', backref='csr', lazy=True)
     reports = db.relationship('Report', backref='manager', lazy=True)
 
+    @validates('role')
+    def validate_role(self, key, value):
+        role = normalize_role(value)
+        if role is None:
+            raise ValueError(f"Unknown role '{value}'")
+        return role
+
     # Legacy property for backward compatibility
     @property
     def id(self):
@@ -32,8 +81,48 @@ class Category(db.Model):
     # Relationships
     pin_requests = db.relationship('PinRequest', backref='category', lazy=True)
 
+# Weighted full-text document for /api/requests/search: title > description > location
+REQUEST_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'C')"
+)
+
+# Projected position for GiST nearest-neighbour and radius queries (see app/geo.py)
+REQUEST_GEO_POINT = f"point(longitude * cos(radians({REFERENCE_LATITUDE})), latitude)"
+
+
+class Point(UserDefinedType):
+    """Postgres point; only used in SQL, never loaded."""
+    cache_ok = True
+
+    def get_col_spec(self, **kw):
+        return "POINT"
+
+
+# So reflection (app/schema.py) recognizes the column
+postgresql_base.ischema_names['point'] = Point
+
+
 class PinRequest(db.Model):
     __tablename__ = 'pin_requests'
+    __table_args__ = (
+        db.Index('ix_pin_requests_status_created_at', 'status', 'created_at'),
+        db.Index(
+            'ix_pin_requests_open_created_at', 'created_at',
+            postgresql_where=db.text("status = 'open'")
+        ),
+        db.Index('ix_pin_requests_user_id', 'user_id'),
+        db.Index('ix_pin_requests_category_id', 'category_id'),
+        db.Index('ix_pin_requests_completed_at', 'completed_at'),
+        # Keyset pages on (created_at, id) in either direction; also analytics windows
+        db.Index('ix_pin_requests_created_at_id', 'created_at', 'pin_requests_id'),
+        db.Index('ix_pin_requests_search_vector', 'search_vector', postgresql_using='gin'),
+        db.Index(
+            'ix_pin_requests_open_geo_point', 'geo_point', postgresql_using='gist',
+            postgresql_where=db.text("status = 'open'")
+        ),
+    )
     
     pin_requests_id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.users_id'), nullable=False)
@@ -44,50 +133,134 @@ class PinRequest(db.Model):
     status = db.Column(db.String(20))
     urgency = db.Column(db.String(20))
     completion_note = db.Column(db.Text)
+    preferred_time = db.Column(db.String(255))
+    special_requirements = db.Column(db.Text)
+    view_count = db.Column(db.Integer, default=0, server_default='0')  # legacy, see RequestViewCount
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime)
+    updated_at = updated_at_column()
+    # Maintained by Postgres; deferred so normal loads never fetch it
+    search_vector = db.deferred(db.Column(TSVECTOR, db.Computed(REQUEST_SEARCH_VECTOR, persisted=True)))
+    # Set from `location` by the gazetteer
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    geo_point = db.deferred(db.Column(Point, db.Computed(REQUEST_GEO_POINT, persisted=True)))
 
     # Relationships
     match_history = db.relationship('MatchHistory', backref='request', lazy=True)
     csr_shortlist = db.relationship('CsrShortlist', backref='request', lazy=True)
 
+    @validates('location')
+    def locate_request(self, key, value):
+        self.latitude, self.longitude = locate(value) or (None, None)
+        return value
+
     # Legacy property for backward compatibility
     @property
     def id(self):
         return self.pin_requests_id
 
+class RequestViewCount(db.Model):
+    """View counters kept out of pin_requests so card views never lock request rows."""
+    __tablename__ = 'request_view_counts'
+
+    request_id = db.Column(
+        db.Integer, db.ForeignKey('pin_requests.pin_requests_id', ondelete='CASCADE'), primary_key=True
+    )
+    view_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class CacheGeneration(db.Model):
+    """Per-table write counters; cached responses are tagged with them (see app/cache.py)."""
+    __tablename__ = 'cache_generations'
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    generation = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
+
 class MatchHistory(db.Model):
     __tablename__ = 'match_history'
+    __table_args__ = (
+        # One match per CSR and request (accept_request_action relies on this)
+        db.Index('uq_match_history_csr_request', 'csr_id', 'request_id', unique=True),
+        db.Index('ix_match_history_request_matched_at', 'request_id', db.text('matched_at DESC')),
+        # Time windows across all requests (analytics time series)
+        db.Index('ix_match_history_matched_at', 'matched_at'),
+    )
     
     match_history_id = db.Column(db.Integer, primary_key=True)
     csr_id = db.Column(db.Integer, db.ForeignKey('users.users_id'))
     request_id = db.Column(db.Integer, db.ForeignKey('pin_requests.pin_requests_id'))
     matched_at = db.Column(db.DateTime, default=datetime.utcnow)
     match_status = db.Column(db.String(20))
+    updated_at = updated_at_column()
 
 class CsrShortlist(db.Model):
     __tablename__ = 'csr_shortlist'
+    __table_args__ = (
+        db.Index('uq_csr_shortlist_csr_request', 'csr_id', 'request_id', unique=True),
+        db.Index('ix_csr_shortlist_request_id', 'request_id'),
+    )
     
     csr_shortlist_id = db.Column(db.Integer, primary_key=True)
     csr_id = db.Column(db.Integer, db.ForeignKey('users.users_id'))
     request_id = db.Column(db.Integer, db.ForeignKey('pin_requests.pin_requests_id'))
     shortlisted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = updated_at_column()
 
 class Feedback(db.Model):
     __tablename__ = 'feedback'
 
     feedback_id = db.Column(db.Integer, primary_key=True)
-    request_id = db.Column(db.Integer, db.ForeignKey('pin_requests.pin_requests_id'))
+    request_id = db.Column(db.Integer, db.ForeignKey('pin_requests.pin_requests_id'), index=True)
     rating = db.Column(db.Integer)
     comment = db.Column(db.Text)
     anonymous = db.Column(db.Boolean, default=False)
     submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = updated_at_column()
 
     # Legacy property for compatibility
     @property
     def id(self):
         return self.feedback_id
 
+class SyncTombstone(db.Model):
+    """Deleted rows, so ?since= delta syncs can tell clients what to drop (see app/sync.py)."""
+    __tablename__ = 'sync_tombstones'
+
+    tombstone_id = db.Column(db.BigInteger, primary_key=True)
+    table_name = db.Column(db.String(64), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    request_id = db.Column(db.Integer)
+    user_id = db.Column(db.Integer)
+    csr_id = db.Column(db.Integer)
+    deleted_at = db.Column(db.DateTime, nullable=False, index=True, server_default=db.text(UTC_NOW))
+
+class RequestEvent(db.Model):
+    """Request lifecycle events pushed to SSE clients; kept for Last-Event-ID resume (see app/events.py)."""
+    __tablename__ = 'request_events'
+
+    event_id = db.Column(db.BigInteger, primary_key=True)
+    event_type = db.Column(db.String(50), nullable=False)
+    # Addressed channels, e.g. 'role:csr_rep' or 'user:12'
+    channels = db.Column(ARRAY(db.String(64)), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, index=True, server_default=db.text(UTC_NOW))
+
+class DailyRequestStat(db.Model):
+    """Request counts per day, kept current by triggers on pin_requests (see app/analytics.py).
+
+    'created' counts requests by created_at day; 'completed' counts requests
+    whose status is completed, by completed_at day. A request without a
+    category or urgency is counted under 0 / ''.
+    """
+    __tablename__ = 'daily_request_stats'
+
+    day = db.Column(db.Date, primary_key=True)
+    transition = db.Column(db.String(20), primary_key=True)
+    category_id = db.Column(db.Integer, primary_key=True, autoincrement=False, default=0)
+    urgency = db.Column(db.String(20), primary_key=True, default='')
+    request_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
 # Provide backward-compatible alias: some modules import CSRShortlist (all-caps 'CSR')
 # while the class here is named `CsrShortlist`. Export the expected name.
 CSRShortlist = CsrShortlist
@@ -0,0 +1,158 @@
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import text, tuple_
+
+from app.database import db
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 500
+
+
+class PaginationError(ValueError):
+    """Raised for bad limit/sort/cursor arguments; routes turn it into a 400."""
+
+
+def wants_page(args):
+    """Pagination is opt-in so existing clients still get a plain JSON array."""
+    return any(k in args for k in ('limit', 'cursor', 'sort', 'order', 'total'))
+
+
+def encode_cursor(sort_key, order, value, pk):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort_key, order, value, pk], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort_key, order, value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return sort_key, order, value, pk
+    except Exception:
+        raise PaginationError("Invalid cursor")
+
+
+def nullable(column):
+    """False for NOT NULL mapped columns; expressions without the flag count as nullable."""
+    return getattr(getattr(column, 'expression', column), 'nullable', True)
+
+
+def parse_page_args(args, sort_keys, default_sort, default_order='desc'):
+    """Validate ?limit=&cursor=&sort=&order=&total= against a whitelist.
+
+    sort_keys maps the public sort name to a mapped column.
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_LIMIT))
+    except (TypeError, ValueError):
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be at least 1")
+    limit = min(limit, MAX_PAGE_LIMIT)
+
+    sort = args.get('sort', default_sort)
+    if sort not in sort_keys:
+        raise PaginationError(f"sort must be one of: {', '.join(sorted(sort_keys))}")
+    order = args.get('order', default_order).lower()
+    if order not in ('asc', 'desc'):
+        raise PaginationError("order must be 'asc' or 'desc'")
+
+    cursor = None
+    if args.get('cursor'):
+        c_sort, c_order, value, pk = decode_cursor(args['cursor'])
+        if c_sort != sort or c_order != order:
+            raise PaginationError("cursor does not match sort/order")
+        column = sort_keys[sort]
+        if value is None and not nullable(column):
+            raise PaginationError("Invalid cursor")
+        if value is not None and column.type.python_type is datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise PaginationError("Invalid cursor")
+        cursor = (value, pk)
+
+    return {
+        "limit": limit,
+        "sort": sort,
+        "order": order,
+        "column": sort_keys[sort],
+        "cursor": cursor,
+        "total": args.get('total') == 'approx',
+    }
+
+
+def keyset_page(query, page, pk_column):
+    """Apply ORDER BY (column, pk) and the cursor predicate, fetch limit + 1.
+
+    Returns (rows, next_cursor). Pages compare row values,
+    (column, pk) < (value, pk), which an index on (column, pk) serves in
+    either direction. Rows whose sort value is NULL come last in either
+    direction: they are paged separately, by pk, once the non-NULL rows run
+    out, so neither segment needs a NULLS LAST order or an IS NULL branch.
+    """
+    column = page["column"]
+    desc = page["order"] == 'desc'
+    limit = page["limit"] + 1
+    pk_order = pk_column.desc() if desc else pk_column.asc()
+    value, pk = page["cursor"] if page["cursor"] is not None else (None, None)
+
+    if column is pk_column:
+        if pk is not None:
+            query = query.filter(pk_column < pk if desc else pk_column > pk)
+        rows = query.order_by(pk_order).limit(limit).all()
+    else:
+        rows = []
+        has_nulls = nullable(column)
+        # A cursor with a NULL value is already in the NULL segment
+        if page["cursor"] is None or value is not None:
+            segment = query.filter(column.isnot(None)) if has_nulls else query
+            if page["cursor"] is not None:
+                key, after = tuple_(column, pk_column), tuple_(value, pk)
+                segment = segment.filter(key < after if desc else key > after)
+            rows = segment.order_by(column.desc() if desc else column.asc(), pk_order).limit(limit).all()
+        if has_nulls and len(rows) < limit:
+            segment = query.filter(column.is_(None))
+            if page["cursor"] is not None and value is None:
+                segment = segment.filter(pk_column < pk if desc else pk_column > pk)
+            rows += segment.order_by(pk_order).limit(limit - len(rows)).all()
+
+    next_cursor = None
+    if len(rows) > page["limit"]:
+        rows = rows[:page["limit"]]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            page["sort"], page["order"],
+            getattr(last, column.key), getattr(last, pk_column.key),
+        )
+    return rows, next_cursor
+
+
+def approximate_count(table_name):
+    """Row estimate from planner statistics (pg_class.reltuples), no table scan.
+
+    Returns None when the table has never been analyzed.
+    """
+    estimate = db.session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:t)"),
+        {"t": table_name},
+    ).scalar()
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def page_response(items, page, next_cursor, table_name):
+    body = {
+        "items": items,
+        "next_cursor": next_cursor,
+        "limit": page["limit"],
+        "sort": page["sort"],
+        "order": page["order"],
+    }
+    if page["total"]:
+        body["approx_total"] = approximate_count(table_name)
+    return body
@@ -0,0 +1,245 @@
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import func
+
+from app.cache import current_generations
+from app.database import db
+from app.models import PinRequest, MatchHistory, CsrShortlist
+from app.sync import NOW_SQL, OVERLAP, TOMBSTONE_RETENTION, deleted_since
+
+# Share of the score for each signal; every signal is scaled to 0..1
+WEIGHTS = {"category": 0.4, "location": 0.2, "urgency": 0.25, "age": 0.15}
+URGENCY_SCORES = {"high": 1.0, "medium": 0.6, "low": 0.3}
+DEFAULT_URGENCY = 0.5
+# Days of waiting at which the age signal reaches about two thirds
+AGE_SCALE_DAYS = 7.0
+# How much one history row says about a CSR's interests
+COMPLETED_MATCH_WEIGHT = 1.0
+MATCH_WEIGHT = 0.5
+SHORTLIST_WEIGHT = 0.5
+
+INDEX_COLUMNS = (
+    PinRequest.pin_requests_id, PinRequest.category_id, PinRequest.location, PinRequest.urgency,
+    func.extract('epoch', PinRequest.created_at), PinRequest.status,
+)
+
+
+def location_key(location):
+    return (location or '').strip().lower()
+
+
+class CsrProfile:
+    """What a CSR's matches and shortlist say about the requests they take on.
+
+    `categories` and `locations` map to an affinity in 0..1, relative to the
+    CSR's most frequent one. A category's affinity is scaled by how often the
+    CSR completes the matches they accept in it.
+    """
+
+    def __init__(self, categories=None, locations=None, exclude=()):
+        self.categories = categories or {}
+        self.locations = locations or {}
+        self.exclude = list(exclude)
+
+    @classmethod
+    def from_history(cls, matches, shortlist):
+        """`matches`: (category_id, location, match_status, count) rows; `shortlist`: (request_id, category_id, location)."""
+        category_weight, location_weight = defaultdict(float), defaultdict(float)
+        matched, completed = defaultdict(int), defaultdict(int)
+        for category_id, location, status, count in matches:
+            weight = (COMPLETED_MATCH_WEIGHT if status == 'completed' else MATCH_WEIGHT) * count
+            category_weight[category_id] += weight
+            location_weight[location_key(location)] += weight
+            matched[category_id] += count
+            if status == 'completed':
+                completed[category_id] += count
+        for _, category_id, location in shortlist:
+            category_weight[category_id] += SHORTLIST_WEIGHT
+            location_weight[location_key(location)] += SHORTLIST_WEIGHT
+        category_weight.pop(None, None)
+        location_weight.pop('', None)
+
+        categories = {}
+        if category_weight:
+            top = max(category_weight.values())
+            for category_id, weight in category_weight.items():
+                # Smoothed toward one half, so one match does not decide it
+                rate = (completed[category_id] + 1) / (matched[category_id] + 2)
+                categories[category_id] = weight / top * (0.5 + 0.5 * rate)
+        locations = {}
+        if location_weight:
+            top = max(location_weight.values())
+            locations = {key: weight / top for key, weight in location_weight.items()}
+        return cls(categories, locations, exclude=[row[0] for row in shortlist])
+
+
+def csr_profile(csr_id):
+    matches = db.session.query(
+        PinRequest.category_id, PinRequest.location, MatchHistory.match_status, func.count()
+    ).join(MatchHistory, MatchHistory.request_id == PinRequest.pin_requests_id).filter(
+        MatchHistory.csr_id == csr_id
+    ).group_by(PinRequest.category_id, PinRequest.location, MatchHistory.match_status).all()
+    shortlist = db.session.query(
+        CsrShortlist.request_id, PinRequest.category_id, PinRequest.location
+    ).join(PinRequest, CsrShortlist.request_id == PinRequest.pin_requests_id).filter(
+        CsrShortlist.csr_id == csr_id
+    ).all()
+    return CsrProfile.from_history(matches, shortlist)
+
+
+class OpenRequestIndex:
+    """Per-worker column arrays of the open help requests, scored with NumPy.
+
+    Loaded in full on first use. After that, whenever the pin_requests
+    generation moves, only rows updated since the last refresh (and deletion
+    tombstones) are read: requests that opened are appended, requests that
+    are no longer open are swap-removed, so the arrays stay dense. Location
+    codes no open request uses any more are dropped at the end of a refresh.
+    """
+
+    def __init__(self, capacity=1024):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._generation = None
+        self._synced_at = None
+        self._positions = {}  # request id -> row in the arrays
+        self._locations = {'': 0}  # location key -> code
+        self._size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        size = getattr(self, '_size', 0)
+        columns = {
+            "ids": np.zeros(capacity, np.int64),
+            "categories": np.zeros(capacity, np.int32),
+            "locations": np.zeros(capacity, np.int32),
+            "urgency": np.zeros(capacity, np.float32),
+            "created": np.zeros(capacity, np.float64),
+        }
+        for name, column in columns.items():
+            if hasattr(self, name):
+                column[:size] = getattr(self, name)[:size]
+            setattr(self, name, column)
+
+    def __len__(self):
+        return self._size
+
+    def apply(self, rows):
+        """Add or update open requests and drop the rest; rows are INDEX_COLUMNS tuples."""
+        with self._lock:
+            for request_id, category_id, location, urgency, created, status in rows:
+                if status != 'open':
+                    self._remove(request_id)
+                    continue
+                position = self._positions.get(request_id)
+                if position is None:
+                    if self._size == len(self.ids):
+                        self._allocate(len(self.ids) * 2)
+                    position = self._size
+                    self._positions[request_id] = position
+                    self._size += 1
+                key = location_key(location)
+                self.ids[position] = request_id
+                self.categories[position] = category_id or 0
+                self.locations[position] = self._locations.setdefault(key, len(self._locations))
+                self.urgency[position] = URGENCY_SCORES.get(urgency, DEFAULT_URGENCY)
+                self.created[position] = float(created) if created is not None else time.time()
+
+    def discard(self, request_ids):
+        with self._lock:
+            for request_id in request_ids:
+                self._remove(request_id)
+
+    def _remove(self, request_id):
+        position = self._positions.pop(request_id, None)
+        if position is None:
+            return
+        last = self._size - 1
+        if position != last:
+            for column in (self.ids, self.categories, self.locations, self.urgency, self.created):
+                column[position] = column[last]
+            self._positions[int(self.ids[position])] = position
+        self._size = last
+
+    def refresh(self):
+        """Bring the arrays up to date with pin_requests; a no-op while its generation is unchanged."""
+        generation = current_generations(('pin_requests',))[0]
+        if generation == self._generation:
+            return
+        # One thread reads the changes; the others wait for it rather than repeat the queries
+        with self._refresh_lock:
+            if generation == self._generation:
+                return
+            now = db.session.execute(NOW_SQL).scalar()
+            query = db.session.query(*INDEX_COLUMNS)
+            if self._synced_at is None or self._synced_at < now - TOMBSTONE_RETENTION:
+                self.clear()
+                self.apply(query.filter(PinRequest.status == 'open').all())
+            else:
+                since = self._synced_at - OVERLAP
+                self.apply(query.filter(PinRequest.updated_at > since).all())
+                self.discard(db.session.execute(deleted_since(since, ['pin_requests'])).scalars().all())
+            self._compact_locations()
+            self._synced_at, self._generation = now, generation
+
+    def _compact_locations(self):
+        # Renumber the location codes still in use, so free-text locations of
+        # closed requests do not pile up for the life of the worker
+        with self._lock:
+            used = np.bincount(self.locations[:self._size], minlength=len(self._locations)) > 0
+            used[0] = True
+            if used.all():
+                return
+            remap = np.cumsum(used, dtype=np.int32) - 1
+            self._locations = {key: int(remap[code]) for key, code in self._locations.items() if used[code]}
+            self.locations[:self._size] = remap[self.locations[:self._size]]
+
+    def clear(self):
+        with self._lock:
+            self._positions.clear()
+            self._locations = {'': 0}
+            self._size = 0
+
+    def top_k(self, profile, k, now=None):
+        """The `k` best open requests for `profile`, as (request ids, scores), best first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            size = self._size
+            if size == 0 or k <= 0:
+                return [], []
+            ids = self.ids[:size]
+            categories = self.categories[:size]
+            locations = self.locations[:size]
+
+            scores = WEIGHTS["urgency"] * self.urgency[:size]
+            waited_days = np.maximum(now - self.created[:size], 0) / 86400.0
+            scores += WEIGHTS["age"] * (1.0 - np.exp(-waited_days / AGE_SCALE_DAYS))
+            if profile.categories:
+                affinity = np.zeros(max(int(categories.max()), max(profile.categories)) + 1, np.float32)
+                for category_id, value in profile.categories.items():
+                    affinity[category_id] = value
+                scores += WEIGHTS["category"] * affinity[categories]
+            if profile.locations:
+                affinity = np.zeros(len(self._locations), np.float32)
+                for key, value in profile.locations.items():
+                    code = self._locations.get(key)
+                    if code is not None:
+                        affinity[code] = value
+                scores += WEIGHTS["location"] * affinity[locations]
+            if profile.exclude:
+                scores[np.isin(ids, profile.exclude)] = -np.inf
+
+            if k < size:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(size)
+            # Best score first, ties by newest request
+            top = top[np.lexsort((-ids[top], -scores[top]))]
+            top = top[np.isfinite(scores[top])]
+            return ids[top].tolist(), scores[top].astype(float).tolist()
+
+
+open_request_index = OpenRequestIndex()
@@ -1,15 +1,57 @@
-from flask import Blueprint, jsonify, request, session
+from flask import Blueprint, Response, jsonify, request, session
 from app.database import db
-from app.models import User, PinRequest, MatchHistory, CSRShortlist, Feedback, Category
+from app.models import User, PinRequest, MatchHistory, CSRShortlist, Feedback, Category, RequestViewCount, ROLES, normalize_role
 from flask_cors import cross_origin
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.exc import OperationalError, ProgrammingError
-from sqlalchemy import inspect, text, func, cast, Date
-from sqlalchemy.orm import joinedload
+from sqlalchemy import text, func, cast, Date, Float, or_, exists, select, true, null, union, tuple_
+from sqlalchemy.orm import joinedload, aliased
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from collections import defaultdict
+import html
+import re
+import time
+from app.schema import schema_registry
+from app.view_counter import view_buffer
+from app.serializers import RequestFields, FieldSelectionError
+from app.compression import compress_response, no_compression
+from app.events import event_hub, publish, role_channel, user_channel, backlog, latest_event_id, stream
+from app.dashboard import run_sections
+from app.recommendations import open_request_index, csr_profile
+from app.export import FORMATS as EXPORT_FORMATS, ExportError, export_statement, stream_export
+from app.geo import GeoQueryError, KM_PER_DEGREE, parse_geo_args, project
+from app.analytics import (BREAKDOWNS, BUCKETS, MAX_BUCKETS, TIMESERIES_GROUPS, bucket_count,
+                           daily_request_counts, request_breakdown, request_timeseries)
+from app.sync import SyncCursorError, issue_cursor, read_cursor, record_deletes, deleted_since
+from app.cache import cached_response, conditional_response, bump_generations, response_cache
+from app.pagination import PaginationError, wants_page, parse_page_args, keyset_page, page_response, encode_cursor
 
 main = Blueprint('main', __name__)
+# gzip/brotli for large list responses; opt out per route with @no_compression
+main.after_request(compress_response)
+
+# Whitelisted sort keys for paginated list endpoints
+REQUEST_SORT_KEYS = {
+    "created_at": PinRequest.created_at,
+    "completed_at": PinRequest.completed_at,
+    "id": PinRequest.pin_requests_id,
+    "title": PinRequest.title,
+    "status": PinRequest.status,
+    "urgency": PinRequest.urgency,
+}
+USER_SORT_KEYS = {
+    "users_id": User.users_id,
+    "name": User.name,
+    "email": User.email,
+    "role": User.role,
+    "created_at": User.created_at,
+}
+
+# Tables behind the request listings; their generations make up the listing ETags
+LISTING_TABLES = ('pin_requests', 'match_history', 'csr_shortlist', 'feedback', 'categories', 'users')
+PIN_LISTING_TABLES = LISTING_TABLES + ('request_view_counts',)
+OPEN_LISTING_TABLES = ('pin_requests', 'categories', 'users')
 
 # ---------------------------------
 # 🩺 Health Check
@@ -36,17 +78,11 @@ def login():
     if not user:
         return jsonify({"error": "Invalid credentials"}), 401
 
-    # ✅ Normalize role values from DB (handles different casing/labels from seed)
-    role_map = {
-        "pin": "pin", "PIN": "pin",
-        "csr_rep": "csr_rep", "CSR Rep": "csr_rep", "CSR": "csr_rep",
-        "platform_manager": "platform_manager", "Platform Manager": "platform_manager", "PM": "platform_manager",
-        "admin": "admin", "Admin": "admin"
-    }
-    normalized_role = role_map.get(user.role, None)
+    # ✅ Roles are stored canonically (users.role), so no per-login normalization
+    normalized_role = user.role
 
     # ✅ Allow PIN, Platform Manager, Admin, and CSR users
-    if normalized_role not in ["pin", "platform_manager", "admin", "csr_rep"]:
+    if normalized_role not in ROLES:
         return jsonify({"error": f"User role '{user.role}' is not recognized"}), 403
 
     # ✅ Store session data
@@ -84,16 +120,21 @@ def logout():
 @main.route('/requests', methods=['GET'])
 @cross_origin()
 def get_requests():
-    requests = PinRequest.query.all()
-    results = [
-        {
-            "id": req.pin_requests_id,
-            "title": req.title,
-            "description": req.description,
-            "status": req.status,
-        }
-        for req in requests
-    ]
+    page = None
+    try:
+        fields = RequestFields.from_args(request.args, ["id", "title", "description", "status"])
+        if wants_page(request.args):
+            page = parse_page_args(request.args, REQUEST_SORT_KEYS, "created_at")
+    except (PaginationError, FieldSelectionError) as e:
+        return jsonify({"error": str(e)}), 400
+    query = PinRequest.query.options(*fields.load_options(*([page["column"]] if page else [])))
+    if page:
+        requests, next_cursor = keyset_page(query, page, PinRequest.pin_requests_id)
+    else:
+        requests = query.all()
+    results = [fields.render(req) for req in requests]
+    if page:
+        return jsonify(page_response(results, page, next_cursor, 'pin_requests')), 200
     return jsonify(results), 200
 
 
@@ -104,24 +145,26 @@ def get_requests():
 @cross_origin()
 def admin_get_users():
     try:
-        users = User.query.all()
-        # Normalize role labels to canonical values for frontend
-        role_map = {
-            "pin": "pin", "PIN": "pin",
-            "csr_rep": "csr_rep", "CSR Rep": "csr_rep", "CSR": "csr_rep",
-            "platform_manager": "platform_manager", "Platform Manager": "platform_manager", "PM": "platform_manager",
-            "admin": "admin", "Admin": "admin"
-        }
+        page = None
+        if wants_page(request.args):
+            try:
+                page = parse_page_args(request.args, USER_SORT_KEYS, "users_id", default_order='asc')
+            except PaginationError as e:
+                return jsonify({"error": str(e)}), 400
+            users, next_cursor = keyset_page(User.query, page, User.users_id)
+        else:
+            users = User.query.all()
         results = []
         for u in users:
-            normalized_role = role_map.get(u.role, u.role)
             results.append({
                 "users_id": u.users_id,
                 "name": u.name,
-                "role": normalized_role,
+                "role": u.role,
                 "email": u.email,
                 "created_at": getattr(u, 'created_at', None)
             })
+        if page:
+            return jsonify(page_response(results, page, next_cursor, 'users')), 200
         return jsonify(results), 200
     except Exception as e:
         db.session.rollback()
@@ -132,13 +175,13 @@ def admin_get_users():
 @cross_origin()
 def admin_user_stats():
     try:
-        # Count by roles with normalization handled via SQL OR Python fallback
-        # Simple approach: fetch counts by raw values that might exist
-        total_all = User.query.count()
-        count_admin = User.query.filter(func.lower(User.role).in_(['admin'])).count()
-        count_pin = User.query.filter(func.lower(User.role).in_(['pin'])).count()
-        count_csr = User.query.filter(func.lower(User.role).in_(['csr_rep', 'csr', 'csr rep'])).count()
-        count_pm = User.query.filter(func.lower(User.role).in_(['platform_manager', 'platform manager', 'pm'])).count()
+        # One GROUP BY over the canonical, indexed role column
+        role_counts = dict(db.session.query(User.role, func.count()).group_by(User.role).all())
+        total_all = sum(role_counts.values())
+        count_admin = role_counts.get('admin', 0)
+        count_pin = role_counts.get('pin', 0)
+        count_csr = role_counts.get('csr_rep', 0)
+        count_pm = role_counts.get('platform_manager', 0)
 
         return jsonify({
             "total": total_all,
@@ -152,6 +195,13 @@ def admin_user_stats():
         db.session.rollback()
         return jsonify({"error": f"Failed to fetch user stats: {str(e)}"}), 500
 
+
+@main.route('/api/admin/cache-stats', methods=['GET'])
+@cross_origin()
+def admin_cache_stats():
+    # Counters are per worker process
+    return jsonify(response_cache.stats()), 200
+
 # ---------------------------------
 @main.route('/api/admin/users', methods=['POST'])
 @cross_origin(origins=["http://localhost:5173"], supports_credentials=True)
@@ -163,13 +213,9 @@ def admin_create_user():
             return jsonify({"error": "name, email, role, password are required"}), 400
 
         # Normalize role
-        role_map = {
-            "pin": "pin", "PIN": "pin",
-            "csr_rep": "csr_rep", "CSR Rep": "csr_rep", "CSR": "csr_rep",
-            "platform_manager": "platform_manager", "Platform Manager": "platform_manager", "PM": "platform_manager",
-            "admin": "admin", "Admin": "admin"
-        }
-        normalized_role = role_map.get(data.get('role'), data.get('role'))
+        normalized_role = normalize_role(data.get('role'))
+        if not normalized_role:
+            return jsonify({"error": f"Unknown role '{data.get('role')}'"}), 400
 
         # Check email unique
         exists = User.query.filter((User.email == data['email'])).first()
@@ -188,6 +234,7 @@ def admin_create_user():
             password=data['password']
         )
         db.session.add(user)
+        bump_generations('users')
         db.session.commit()
 
         return jsonify({
@@ -217,16 +264,14 @@ def admin_update_user(user_id):
         if 'email' in data and data['email']:
             user.email = data['email']
         if 'role' in data and data['role']:
-            role_map = {
-                "pin": "pin", "PIN": "pin",
-                "csr_rep": "csr_rep", "CSR Rep": "csr_rep", "CSR": "csr_rep",
-                "platform_manager": "platform_manager", "Platform Manager": "platform_manager", "PM": "platform_manager",
-                "admin": "admin", "Admin": "admin"
-            }
-            user.role = role_map.get(data['role'], data['role'])
+            normalized_role = normalize_role(data['role'])
+            if not normalized_role:
+                return jsonify({"error": f"Unknown role '{data['role']}'"}), 400
+            user.role = normalized_role
         if 'password' in data and data['password']:
             user.password = data['password']
 
+        bump_generations('users')
         db.session.commit()
         return jsonify({"message": "updated"}), 200
     except Exception as e:
@@ -246,8 +291,8 @@ def admin_delete_user(user_id):
             return jsonify({"error": "User not found"}), 404
 
         # Prevent deleting the last remaining admin
-        if (user.role or '').lower() == 'admin':
-            admin_count = User.query.filter(func.lower(User.role) == 'admin').count()
+        if user.role == 'admin':
+            admin_count = User.query.filter(User.role == 'admin').count()
             if admin_count <= 1:
                 return jsonify({"error": "Cannot delete the only remaining administrator account."}), 400
 
@@ -255,6 +300,10 @@ def admin_delete_user(user_id):
         # 1) Collect this user's request IDs
         req_ids = [rid for (rid,) in db.session.query(PinRequest.pin_requests_id).filter_by(user_id=user_id).all()]
         if req_ids:
+            # Tombstones first, so delta syncs can tell clients what disappeared
+            record_deletes(PinRequest, PinRequest.pin_requests_id.in_(req_ids))
+            record_deletes(MatchHistory, MatchHistory.request_id.in_(req_ids))
+            record_deletes(CSRShortlist, CSRShortlist.request_id.in_(req_ids))
             # 2) Delete dependencies that reference those requests
             MatchHistory.query.filter(MatchHistory.request_id.in_(req_ids)).delete(synchronize_session=False)
             CSRShortlist.query.filter(CSRShortlist.request_id.in_(req_ids)).delete(synchronize_session=False)
@@ -262,11 +311,14 @@ def admin_delete_user(user_id):
             # 3) Now delete the requests
             PinRequest.query.filter(PinRequest.pin_requests_id.in_(req_ids)).delete(synchronize_session=False)
         # 4) Also remove records where this user is the CSR (not the requester)
+        record_deletes(MatchHistory, MatchHistory.csr_id == user_id)
+        record_deletes(CSRShortlist, CSRShortlist.csr_id == user_id)
         MatchHistory.query.filter_by(csr_id=user_id).delete(synchronize_session=False)
         CSRShortlist.query.filter_by(csr_id=user_id).delete(synchronize_session=False)
         db.session.flush()
 
         db.session.delete(user)
+        bump_generations('users', 'pin_requests', 'match_history', 'csr_shortlist')
         db.session.commit()
         return jsonify({"message": "deleted"}), 200
     except IntegrityError as ie:
@@ -289,6 +341,7 @@ def admin_reset_password(user_id):
         if not user:
             return jsonify({"error": "User not found"}), 404
         user.password = new_password
+        bump_generations('users')
         db.session.commit()
         return jsonify({"message": "password reset"}), 200
     except Exception as e:
@@ -314,15 +367,16 @@ def admin_delete_user_alias(user_id):
 @cross_origin()
 def get_request_by_id(req_id):
     try:
-        req = PinRequest.query.get(req_id)
+        req = PinRequest.query.options(
+            joinedload(PinRequest.category), joinedload(PinRequest.user)
+        ).filter_by(pin_requests_id=req_id).first()
         if not req:
             return jsonify({"error": "Request not found"}), 404
 
         # Safely get feedback
         feedback_data = None
         try:
-            inspector = inspect(db.engine)
-            if 'feedback' in inspector.get_table_names():
+            if schema_registry.has_table('feedback'):
                 feedback = Feedback.query.filter_by(request_id=req_id).first()
                 if feedback:
                     feedback_data = {
@@ -334,23 +388,9 @@ def get_request_by_id(req_id):
         except Exception:
             db.session.rollback()
 
-        # Safely get preferred_time and special_requirements using raw SQL
-        preferred_time = None
-        special_requirements = None
-        try:
-            result = db.session.execute(
-                text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                {"id": req.pin_requests_id}
-            ).first()
-            if result:
-                preferred_time = result[0] if result[0] else None
-                special_requirements = result[1] if result[1] else None
-        except (OperationalError, ProgrammingError):
-            # Columns don't exist yet - this is OK
-            pass
-        except Exception:
-            pass
-        
+        preferred_time = req.preferred_time or None
+        special_requirements = req.special_requirements or None
+
         data = {
             "id": req.pin_requests_id,
             "title": req.title,
@@ -359,7 +399,7 @@ def get_request_by_id(req_id):
             "location": req.location,
             "urgency": req.urgency,
             "status": req.status,
-            "requester_name": req.pin_user.name if req.pin_user else None,
+            "requester_name": req.user.name if req.user else None,
             "user_id": req.user_id,
             "created_at": req.created_at.isoformat() if req.created_at else None,
             "completed_at": req.completed_at.isoformat() if req.completed_at else None,
@@ -383,13 +423,109 @@ def get_request_by_id(req_id):
         return jsonify({"error": f"Failed to fetch request: {str(e)}"}), 500
 
 # ---------------------------------
-# 👥 Get All Users
+# 🔍 Search Help Requests (full text)
 # ---------------------------------
-@main.route('/users', methods=['GET'])
+SEARCH_FIELDS = [
+    "id", "title", "description", "category", "requester_name", "location", "urgency",
+    "status", "created_at", "rank", "highlights",
+]
+SEARCH_MAX_TERMS = 8
+# Private-use characters mark the matches, so the text can be HTML-escaped before they become <mark> tags
+HIGHLIGHT_START, HIGHLIGHT_STOP = '\ue000', '\ue001'
+TITLE_HIGHLIGHT = f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", HighlightAll=true'
+SNIPPET_HIGHLIGHT = (f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_STOP}", '
+                     'MaxFragments=2, MaxWords=18, MinWords=6, FragmentDelimiter=" … "')
+
+
+def _search_tsquery(q):
+    """Every word must match, as a prefix: 'wheel chai' -> 'wheel:* & chai:*'."""
+    terms = re.findall(r'\w+', q.lower())[:SEARCH_MAX_TERMS]
+    return ' & '.join(f"{term}:*" for term in terms)
+
+
+def _highlight(text):
+    return html.escape(text or '').replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_STOP, '</mark>')
+
+
+@main.route('/api/requests/search', methods=['GET'])
 @cross_origin()
-def get_users():
-    users = User.query.all()
-    results = [
+@conditional_response(*OPEN_LISTING_TABLES)
+def search_help_requests():
+    """Ranked full-text search over title, description and location.
+
+    ?q= words are prefix-matched and must all match; ?status=, ?urgency= and
+    ?category= (id or name) filter. Results come by rank, best first, one
+    keyset page at a time (?limit=, ?cursor=), with <mark>-highlighted
+    title and description snippets.
+    """
+    try:
+        tsquery_text = _search_tsquery(request.args.get('q', ''))
+        if not tsquery_text:
+            return jsonify({"error": "q is required"}), 400
+        tsquery = func.to_tsquery('english', tsquery_text)
+        # float8, so the rank in a cursor compares exactly on the next page
+        rank = cast(func.ts_rank(PinRequest.search_vector, tsquery), Float)
+        try:
+            fields = RequestFields.from_args(request.args, SEARCH_FIELDS)
+            page = parse_page_args(request.args, {"rank": rank}, "rank")
+        except (PaginationError, FieldSelectionError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        columns = [PinRequest, rank.label('rank')]
+        if fields.wants("highlights"):
+            columns += [
+                func.ts_headline('english', func.coalesce(PinRequest.title, ''), tsquery, TITLE_HIGHLIGHT).label('title_highlight'),
+                func.ts_headline('english', func.coalesce(PinRequest.description, ''), tsquery, SNIPPET_HIGHLIGHT).label('description_highlight'),
+            ]
+        query = db.session.query(*columns).options(*fields.load_options()).filter(
+            PinRequest.search_vector.op('@@')(tsquery)
+        )
+        if request.args.get('status'):
+            query = query.filter(PinRequest.status == request.args['status'])
+        if request.args.get('urgency'):
+            query = query.filter(PinRequest.urgency == request.args['urgency'])
+        category = request.args.get('category')
+        if category:
+            if category.isdigit():
+                query = query.filter(PinRequest.category_id == int(category))
+            else:
+                query = query.filter(PinRequest.category.has(func.lower(Category.name) == category.lower()))
+
+        desc = page["order"] == 'desc'
+        if page["cursor"] is not None:
+            key, after = tuple_(rank, PinRequest.pin_requests_id), tuple_(*page["cursor"])
+            query = query.filter(key < after if desc else key > after)
+        order_by = [rank.desc(), PinRequest.pin_requests_id.desc()] if desc else [rank.asc(), PinRequest.pin_requests_id.asc()]
+        rows = query.order_by(*order_by).limit(page["limit"] + 1).all()
+
+        next_cursor = None
+        if len(rows) > page["limit"]:
+            rows = rows[:page["limit"]]
+            next_cursor = encode_cursor(page["sort"], page["order"], rows[-1].rank, rows[-1].PinRequest.pin_requests_id)
+
+        items = []
+        for row in rows:
+            highlights = None
+            if fields.wants("highlights"):
+                highlights = {
+                    "title": _highlight(row.title_highlight),
+                    "description": _highlight(row.description_highlight),
+                }
+            items.append(fields.render(row.PinRequest, rank=round(row.rank, 6), highlights=highlights))
+
+        # A table-wide row estimate says nothing about the number of matches
+        page["total"] = False
+        return jsonify(page_response(items, page, next_cursor, 'pin_requests')), 200
+    except Exception as e:
+        print(f"Error in search_help_requests: {str(e)}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to search requests: {str(e)}"}), 500
+
+
+def _user_rows(users):
+    return [
         {
             "users_id": u.users_id,
             "name": u.name,
@@ -398,6 +534,26 @@ def get_users():
         }
         for u in users
     ]
+
+
+# ---------------------------------
+# 👥 Get All Users
+# ---------------------------------
+@main.route('/users', methods=['GET'])
+@cross_origin()
+def get_users():
+    page = None
+    if wants_page(request.args):
+        try:
+            page = parse_page_args(request.args, USER_SORT_KEYS, "users_id", default_order='asc')
+        except PaginationError as e:
+            return jsonify({"error": str(e)}), 400
+        users, next_cursor = keyset_page(User.query, page, User.users_id)
+    else:
+        users = User.query.all()
+    results = _user_rows(users)
+    if page:
+        return jsonify(page_response(results, page, next_cursor, 'users')), 200
     return jsonify(results), 200
 
 
@@ -419,45 +575,17 @@ def create_help_request():
         category_id=data.get('category_id'),
         urgency=data.get('urgency', 'medium'),      # Urgency is set to "medium", but there will be a dropdown box for PIN to choose other
         location=data.get('location'),
+        preferred_time=data.get('preferred_time') or data.get('preferredTime'),
+        special_requirements=data.get('special_requirements') or data.get('specialRequirements'),
         status='open'
     )
 
     db.session.add(new_request)
+    bump_generations('pin_requests')
+    publish('request.created', new_request, [
+        role_channel('csr_rep'), role_channel('platform_manager'), user_channel(new_request.user_id),
+    ])
     db.session.commit()
-    
-    # Update preferred_time and special_requirements using raw SQL (will fail gracefully if columns don't exist)
-    pref_time = data.get('preferred_time') or data.get('preferredTime')
-    spec_req = data.get('special_requirements') or data.get('specialRequirements')
-    
-    if pref_time:
-        try:
-            db.session.execute(
-                text("UPDATE pin_requests SET preferred_time = :val WHERE pin_requests_id = :id"),
-                {"val": pref_time, "id": new_request.pin_requests_id}
-            )
-            db.session.commit()
-        except (OperationalError, ProgrammingError):
-            db.session.rollback()
-            # Columns don't exist yet, skip
-            pass
-        except Exception as e:
-            db.session.rollback()
-            print(f"Note: Could not set preferred_time: {str(e)}")
-    
-    if spec_req:
-        try:
-            db.session.execute(
-                text("UPDATE pin_requests SET special_requirements = :val WHERE pin_requests_id = :id"),
-                {"val": spec_req, "id": new_request.pin_requests_id}
-            )
-            db.session.commit()
-        except (OperationalError, ProgrammingError):
-            db.session.rollback()
-            # Columns don't exist yet, skip
-            pass
-        except Exception as e:
-            db.session.rollback()
-            print(f"Note: Could not set special_requirements: {str(e)}")
 
     return jsonify({
         "message": "Help request created successfully",
@@ -503,7 +631,12 @@ def update_help_request(request_id):
             req.category_id = data['category_id'] if data['category_id'] else None
         if 'status' in data:
             req.status = data['status']
+        if 'preferred_time' in data or 'preferredTime' in data:
+            req.preferred_time = data.get('preferred_time', data.get('preferredTime')) or None
+        if 'special_requirements' in data or 'specialRequirements' in data:
+            req.special_requirements = data.get('special_requirements', data.get('specialRequirements')) or None
         
+        bump_generations('pin_requests')
         db.session.commit()
         
         return jsonify({
@@ -538,7 +671,11 @@ def delete_help_request(request_id):
         if not req:
             return jsonify({"error": f"Request not found with id: {request_id}"}), 404
         
+        record_deletes(PinRequest, PinRequest.pin_requests_id == request_id)
+        record_deletes(MatchHistory, MatchHistory.request_id == request_id)
+        record_deletes(CSRShortlist, CSRShortlist.request_id == request_id)
         db.session.delete(req)
+        bump_generations('pin_requests')
         db.session.commit()
         
         return jsonify({"message": "Request deleted successfully"}), 200
@@ -573,11 +710,10 @@ def submit_feedback(request_id):
         
         # Ensure feedback table exists
         try:
-            inspector = inspect(db.engine)
-            if 'feedback' not in inspector.get_table_names():
-                from app.models import Feedback
+            if not schema_registry.has_table('feedback'):
                 Feedback.__table__.create(db.engine, checkfirst=True)
                 db.session.commit()
+                schema_registry.refresh()
         except Exception as e:
             # If table creation fails, try to continue anyway
             print(f"Warning: Could not verify/create feedback table: {str(e)}")
@@ -591,9 +727,9 @@ def submit_feedback(request_id):
             print(f"Warning: Feedback query failed, creating table: {str(e)}")
             db.session.rollback()
             try:
-                from app.models import Feedback
                 Feedback.__table__.create(db.engine, checkfirst=True)
                 db.session.commit()
+                schema_registry.refresh()
                 existing_feedback = Feedback.query.filter_by(request_id=request_id).first()
             except Exception as e2:
                 db.session.rollback()
@@ -615,6 +751,7 @@ def submit_feedback(request_id):
             )
             db.session.add(new_feedback)
         
+        bump_generations('feedback')
         db.session.commit()
         
         return jsonify({
@@ -634,138 +771,150 @@ def submit_feedback(request_id):
         return jsonify({"error": f"Failed to submit feedback: {str(e)}"}), 500
 
 
+PIN_REQUEST_FIELDS = [
+    "id", "title", "description", "category", "location", "status", "urgency", "completion_note",
+    "preferred_time", "special_requirements", "assigned_to", "csr_email", "csr_username",
+    "shortlist_count", "view_count", "created_at", "completed_at",
+    "feedback_rating", "feedback_comment", "feedback_anonymous", "feedback_submitted_at",
+]
+# The PIN dashboard also reads these as camelCase
+PIN_REQUEST_ALIASES = ("completion_note", "preferred_time", "special_requirements", "shortlist_count", "view_count")
+
+
+def _completion_note(req):
+    # Always a string for the PIN dashboard
+    return "" if req.completion_note is None else str(req.completion_note).strip()
+
+
+def _pin_requests_projection(user_id):
+    """One statement for a PIN's requests with category, current CSR, shortlist count and feedback.
+
+    Lateral joins pick the first non-completed match (and its CSR) and the
+    first feedback row per request; a grouped subquery gives shortlist counts
+    and request_view_counts gives the flushed view count.
+    """
+    open_match = select(MatchHistory.csr_id).where(
+        MatchHistory.request_id == PinRequest.pin_requests_id,
+        MatchHistory.match_status != 'completed'
+    ).order_by(MatchHistory.match_history_id).limit(1).lateral('open_match')
+    csr = aliased(User, name='assigned_csr')
+
+    shortlist_counts = select(
+        CSRShortlist.request_id, func.count().label('shortlist_count')
+    ).join(
+        PinRequest, PinRequest.pin_requests_id == CSRShortlist.request_id
+    ).where(PinRequest.user_id == user_id).group_by(CSRShortlist.request_id).subquery('shortlist_counts')
+
+    columns = [
+        PinRequest,
+        Category.name.label('category_name'),
+        csr.name.label('csr_name'),
+        csr.username.label('csr_username'),
+        csr.email.label('csr_email'),
+        func.coalesce(shortlist_counts.c.shortlist_count, 0).label('shortlist_count'),
+        func.coalesce(RequestViewCount.view_count, 0).label('view_count'),
+    ]
+    if schema_registry.has_table('feedback'):
+        feedback = select(
+            Feedback.feedback_id, Feedback.rating, Feedback.comment, Feedback.anonymous, Feedback.submitted_at
+        ).where(
+            Feedback.request_id == PinRequest.pin_requests_id
+        ).order_by(Feedback.feedback_id).limit(1).lateral('request_feedback')
+        columns += [
+            feedback.c.feedback_id.label('feedback_id'),
+            feedback.c.rating.label('feedback_rating'),
+            feedback.c.comment.label('feedback_comment'),
+            feedback.c.anonymous.label('feedback_anonymous'),
+            feedback.c.submitted_at.label('feedback_submitted_at'),
+        ]
+    else:
+        columns += [
+            null().label('feedback_id'),
+            null().label('feedback_rating'),
+            null().label('feedback_comment'),
+            null().label('feedback_anonymous'),
+            null().label('feedback_submitted_at'),
+        ]
+
+    query = db.session.query(*columns).select_from(PinRequest).outerjoin(
+        Category, Category.categories_id == PinRequest.category_id
+    ).outerjoin(open_match, true()).outerjoin(
+        csr, csr.users_id == open_match.c.csr_id
+    ).outerjoin(
+        shortlist_counts, shortlist_counts.c.request_id == PinRequest.pin_requests_id
+    ).outerjoin(
+        RequestViewCount, RequestViewCount.request_id == PinRequest.pin_requests_id
+    )
+    if schema_registry.has_table('feedback'):
+        query = query.outerjoin(feedback, true())
+    return query.filter(PinRequest.user_id == user_id)
+
+
+def _pin_request_rows(rows, fields):
+    data = []
+    for row in rows:
+        has_feedback = row.feedback_id is not None
+        data.append(fields.render(
+            row.PinRequest,
+            category=row.category_name,
+            # Assigned CSR (match not completed)
+            assigned_to=(row.csr_name or row.csr_username) if row.csr_username is not None else None,
+            csr_email=row.csr_email,
+            csr_username=row.csr_username,
+            shortlist_count=row.shortlist_count,
+            view_count=row.view_count,
+            feedback_rating=row.feedback_rating if has_feedback else None,
+            feedback_comment=row.feedback_comment if has_feedback else None,
+            feedback_anonymous=row.feedback_anonymous if has_feedback else None,
+            feedback_submitted_at=row.feedback_submitted_at.isoformat() if has_feedback and row.feedback_submitted_at else None,
+        ))
+    return data
+
+
+def _pin_changed_since(since):
+    """Ids of requests whose row, or a row the PIN listing reads for them, changed after `since`."""
+    sources = [
+        select(PinRequest.pin_requests_id).where(PinRequest.updated_at > since),
+        select(MatchHistory.request_id).where(MatchHistory.updated_at > since),
+        select(CSRShortlist.request_id).where(CSRShortlist.updated_at > since),
+        select(RequestViewCount.request_id).where(RequestViewCount.updated_at > since),
+        deleted_since(since, ['match_history', 'csr_shortlist']),
+    ]
+    if schema_registry.has_table('feedback'):
+        sources.append(select(Feedback.request_id).where(Feedback.updated_at > since))
+    return union(*sources)
+
+
 # ---------------------------------
 # 📦 Get Help Requests by PIN ID to see "status"
 # ---------------------------------
 @main.route('/api/help_requests/<int:user_id>', methods=['GET'])
 @cross_origin()
+@conditional_response(*PIN_LISTING_TABLES)
 def get_help_requests_by_user(user_id):
     try:
-        # Check if feedback table exists
-        inspector = inspect(db.engine)
-        feedback_table_exists = 'feedback' in inspector.get_table_names()
-        
-        help_requests = PinRequest.query.filter_by(user_id=user_id).all()
-
-        data = []
-        for req in help_requests:
-            # Safely access category
-            category_name = None
-            try:
-                category_name = req.category.name if req.category else None
-            except Exception:
-                db.session.rollback()
-                category_name = None
-            
-            # Safely access feedback only if table exists
-            feedback_data = None
-            if feedback_table_exists:
-                try:
-                    feedback = Feedback.query.filter_by(request_id=req.pin_requests_id).first()
-                    if feedback:
-                        feedback_data = {
-                            "rating": feedback.rating,
-                            "comment": feedback.comment,
-                            "anonymous": feedback.anonymous,
-                            "submitted_at": feedback.submitted_at.isoformat() if feedback.submitted_at else None
-                        }
-                except Exception as e:
-                    db.session.rollback()
-                    print(f"Warning: Could not access feedback for request {req.pin_requests_id}: {str(e)}")
-                    feedback_data = None
-
-            # Safely get preferred_time and special_requirements using raw SQL query
-            # These columns are not in the model definition to avoid SQLAlchemy query errors
-            preferred_time = None
-            special_requirements = None
-            try:
-                # Try to query the columns directly - if they don't exist, exception will be caught
-                result = db.session.execute(
-                    text("SELECT preferred_time, special_requirements, view_count FROM pin_requests WHERE pin_requests_id = :id"),
-                    {"id": req.pin_requests_id}
-                ).first()
-                if result:
-                    preferred_time = result[0] if result[0] else None
-                    special_requirements = result[1] if result[1] else None
-                    view_count = result[2] if result[2] is not None else 0
-            except (OperationalError, ProgrammingError) as e:
-                # Columns don't exist yet - this is OK
-                preferred_time = None
-                special_requirements = None
-                view_count = 0
-            except Exception:
-                # Other errors - just use None/defaults
-                preferred_time = None
-                special_requirements = None
-                view_count = 0
-
-            # Find assigned CSR (match not completed)
-            assigned_to = None
-            csr_email = None
-            csr_username = None
-            try:
-                match = MatchHistory.query.filter(
-                    MatchHistory.request_id == req.pin_requests_id,
-                    MatchHistory.match_status != 'completed'
-                ).first()
-                if match:
-                    csr_user = User.query.get(match.csr_id)
-                    if csr_user:
-                        assigned_to = csr_user.name or csr_user.username
-                        csr_email = csr_user.email
-                        csr_username = csr_user.username
-            except Exception:
-                db.session.rollback()
-                assigned_to = None
-
-            # Calculate shortlist count dynamically
-            shortlist_count = 0
-            try:
-                shortlist_count = CSRShortlist.query.filter_by(request_id=req.pin_requests_id).count()
-            except Exception:
-                db.session.rollback()
-                shortlist_count = 0
-
-            # Get completion note - ensure it's a string
-            completion_note_value = req.completion_note
-            if completion_note_value is None:
-                completion_note_value = ""
-            else:
-                completion_note_value = str(completion_note_value).strip()
-            
-            # Debug: Log completion note for completed requests
-            if req.status == 'completed':
-                print(f"DEBUG get_help_requests_by_user: Request {req.pin_requests_id} (status: {req.status}) - completion_note: '{completion_note_value}' (type: {type(req.completion_note)})")
-            
-            data.append({
-                "id": req.pin_requests_id,
-                "title": req.title,
-                "description": req.description,
-                "category": category_name,
-                "location": req.location,
-                "status": req.status,
-                "urgency": req.urgency,
-                "completion_note": completion_note_value,
-                "completionNote": completion_note_value,  # Also provide camelCase for frontend
-                "preferred_time": preferred_time,
-                "preferredTime": preferred_time,  # Also provide camelCase for frontend
-                "special_requirements": special_requirements,
-                "specialRequirements": special_requirements,  # Also provide camelCase for frontend
-                "assigned_to": assigned_to,
-                "csr_email": csr_email,
-                "csr_username": csr_username,
-                "shortlist_count": shortlist_count,
-                "shortlistCount": shortlist_count,  # Also provide camelCase for frontend
-                "view_count": view_count,
-                "viewCount": view_count,
-                "created_at": req.created_at.isoformat() if req.created_at else None,
-                "completed_at": req.completed_at.isoformat() if req.completed_at else None,
-                "feedback_rating": feedback_data["rating"] if feedback_data else None,
-                "feedback_comment": feedback_data["comment"] if feedback_data else None,
-                "feedback_anonymous": feedback_data["anonymous"] if feedback_data else None,
-                "feedback_submitted_at": feedback_data["submitted_at"] if feedback_data else None
-            })
-        return jsonify(data), 200
+        try:
+            fields = RequestFields.from_args(request.args, PIN_REQUEST_FIELDS, aliases=PIN_REQUEST_ALIASES,
+                                             getters={"completion_note": _completion_note})
+            since = read_cursor(request.args['since'], PIN_LISTING_TABLES) if 'since' in request.args else None
+        except (FieldSelectionError, SyncCursorError) as e:
+            return jsonify({"error": str(e)}), 400
+        query = _pin_requests_projection(user_id).options(*fields.load_options(relationships=False))
+
+        if 'since' in request.args:
+            # Delta sync: only the requests that changed, plus the ids of deleted ones
+            deleted = []
+            if since is not None:
+                query = query.filter(PinRequest.pin_requests_id.in_(_pin_changed_since(since)))
+                deleted = db.session.execute(deleted_since(since, ['pin_requests'], user_id=user_id)).scalars().all()
+            return jsonify({
+                "changed": _pin_request_rows(query.all(), fields),
+                "deleted": deleted,
+                "full": since is None,
+                "cursor": issue_cursor(PIN_LISTING_TABLES),
+            }), 200
+
+        return jsonify(_pin_request_rows(query.all(), fields)), 200
     except Exception as e:
         print(f"Error in get_help_requests_by_user: {str(e)}")
         db.session.rollback()
@@ -774,79 +923,117 @@ def get_help_requests_by_user(user_id):
         return jsonify({"error": f"Failed to fetch requests: {str(e)}"}), 500
 
 
+OPEN_REQUEST_FIELDS = [
+    "id", "title", "description", "category", "requester_name", "location", "urgency",
+    "status", "preferred_time", "special_requirements", "created_at",
+]
+
+
+def _request_names(req, fields, refs):
+    # Category and requester names from preloaded reference data instead of per-query joins
+    if refs is None:
+        return {}
+    values = {}
+    if fields.wants("category"):
+        values["category"] = refs["categories"].get(req.category_id)
+    if fields.wants("requester_name"):
+        values["requester_name"] = refs["users"].get(req.user_id)
+    return values
+
+
+def _with_requester_names(refs, requests, fields):
+    # Without preloaded users, one query for the names of just these requesters
+    if refs is None or refs["users"] is not None or not fields.wants("requester_name"):
+        return refs
+    user_ids = list({req.user_id for req in requests if req.user_id is not None})
+    names = dict(db.session.query(User.users_id, User.name).filter(User.users_id.in_(user_ids)).all()) if user_ids else {}
+    return {**refs, "users": names}
+
+
+def _open_request_rows(fields, refs=None):
+    # Only the selected columns, eager loading category and requester when asked for
+    open_requests = PinRequest.query.options(
+        *fields.load_options(relationships=refs is None)
+    ).filter_by(status='open').all()
+    refs = _with_requester_names(refs, open_requests, fields)
+    return [fields.render(req, **_request_names(req, fields, refs)) for req in open_requests]
+
+
+NEARBY_REQUEST_FIELDS = OPEN_REQUEST_FIELDS + ["latitude", "longitude", "distance_km"]
+
+
+def _nearby_open_rows(fields, geo):
+    # Ids nearest first straight from the GiST index (KNN), optionally cut at a
+    # radius; the selected columns and names are then loaded for just those ids
+    origin = func.point(*project(geo["latitude"], geo["longitude"]))
+    distance = PinRequest.geo_point.op('<->')(origin)
+    query = db.session.query(PinRequest.pin_requests_id, distance).filter(
+        PinRequest.status == 'open', PinRequest.geo_point.isnot(None)
+    )
+    if geo["radius_km"] is not None:
+        query = query.filter(PinRequest.geo_point.op('<@')(func.circle(origin, geo["radius_km"] / KM_PER_DEGREE)))
+    query = query.order_by(distance, PinRequest.pin_requests_id)
+    if geo["nearest"] is not None:
+        query = query.limit(geo["nearest"])
+    nearest = query.all()
+
+    loaded = _load_requests_by_id([request_id for request_id, _ in nearest], fields)
+    return [
+        fields.render(loaded[request_id], distance_km=round(distance * KM_PER_DEGREE, 3))
+        for request_id, distance in nearest if request_id in loaded
+    ]
+
+
+def _open_request_delta(fields, since):
+    if since is None:
+        return _open_request_rows(fields), []
+    requests = PinRequest.query.options(*fields.load_options(PinRequest.status)).filter(
+        PinRequest.updated_at > since
+    ).all()
+    changed = [fields.render(req) for req in requests if req.status == 'open']
+    deleted = [req.pin_requests_id for req in requests if req.status != 'open']
+    deleted += db.session.execute(deleted_since(since, ['pin_requests'])).scalars().all()
+    return changed, deleted
+
+
 # ---------------------------------
 # 📦 Get All Open Help Requests (For CSR)
 # ---------------------------------
 @main.route('/api/help_requests/open', methods=['GET'])
 @cross_origin()
+@conditional_response(*OPEN_LISTING_TABLES)
+@cached_response(*OPEN_LISTING_TABLES)
 def get_open_help_requests():
-    try:
-        # Query all open help requests with eager loading of category
-        open_requests = PinRequest.query.options(joinedload(PinRequest.category_rel)).filter_by(status='open').all()
-
-        data = []
-        for req in open_requests:
-            # Safely get preferred_time and special_requirements using raw SQL
-            preferred_time = None
-            special_requirements = None
-            try:
-                result = db.session.execute(
-                    text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                    {"id": req.pin_requests_id}
-                ).first()
-                if result:
-                    preferred_time = result[0] if result[0] else None
-                    special_requirements = result[1] if result[1] else None
-            except (OperationalError, ProgrammingError):
-                # Columns don't exist yet - this is OK
-                pass
-            except Exception:
-                pass
-            
-            # Safely access category
-            category_name = None
-            try:
-                category_name = req.category.name if req.category else None
-            except Exception:
-                db.session.rollback()
-                category_name = None
-            
-            # Safely access requester name
-            requester_name = None
-            try:
-                # Access via backref - this should work with the relationship
-                if req.pin_user:
-                    requester_name = req.pin_user.name
-                else:
-                    # Fallback: query User directly by user_id
-                    user = db.session.get(User, req.user_id)
-                    requester_name = user.name if user else None
-            except Exception:
-                db.session.rollback()
-                # Fallback: query User directly
-                try:
-                    user = db.session.get(User, req.user_id)
-                    requester_name = user.name if user else None
-                except Exception:
-                    requester_name = None
-            
-            data.append({
-                "id": req.pin_requests_id,
-                "title": req.title,
-                "description": req.description,
-                "category": category_name,
-                "requester_name": requester_name,
-                "location": req.location,
-                "urgency": req.urgency,
-                "status": req.status,
-                "preferred_time": preferred_time,
-                "preferredTime": preferred_time,
-                "special_requirements": special_requirements,
-                "specialRequirements": special_requirements,
-                "created_at": req.created_at.isoformat() if req.created_at else None
-            })
+    """Open requests; ?since= for delta sync, or a location query for the nearest ones.
 
-        return jsonify(data), 200
+    ?lat=&lon= (or ?near=<place or postcode>) with ?radius_km= and/or
+    ?nearest= returns the open requests with known coordinates, closest
+    first, each with distance_km.
+    """
+    try:
+        try:
+            geo = parse_geo_args(request.args)
+            if geo is not None and 'since' in request.args:
+                return jsonify({"error": "since cannot be combined with a location query"}), 400
+            fields = RequestFields.from_args(request.args, NEARBY_REQUEST_FIELDS if geo else OPEN_REQUEST_FIELDS)
+            since = read_cursor(request.args['since'], OPEN_LISTING_TABLES) if 'since' in request.args else None
+        except (FieldSelectionError, SyncCursorError, GeoQueryError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        if geo is not None:
+            return jsonify(_nearby_open_rows(fields, geo)), 200
+
+        if 'since' in request.args:
+            # Delta sync: changed open requests; ids that were deleted or are no longer open
+            changed, deleted = _open_request_delta(fields, since)
+            return jsonify({
+                "changed": changed,
+                "deleted": deleted,
+                "full": since is None,
+                "cursor": issue_cursor(OPEN_LISTING_TABLES),
+            }), 200
+
+        return jsonify(_open_request_rows(fields)), 200
     except Exception as e:
         print(f"Error in get_open_help_requests: {str(e)}")
         db.session.rollback()
@@ -859,89 +1046,14 @@ def get_open_help_requests():
 # ---------------------------------
 @main.route('/api/csr/accepted/<int:csr_id>', methods=['GET'])
 @cross_origin()
+@conditional_response(*LISTING_TABLES)
 def get_accepted_requests(csr_id):
     try:
-        matches = MatchHistory.query.filter_by(csr_id=csr_id).filter(
-            MatchHistory.match_status != 'completed'
-        ).all()
-
-        data = []
-        request_ids = [m.request_id for m in matches]
-        
-        # Pre-load all requests and users to avoid transaction issues
-        requests = {}
-        if request_ids:
-            pin_requests = PinRequest.query.filter(PinRequest.pin_requests_id.in_(request_ids)).all()
-            for req in pin_requests:
-                requests[req.pin_requests_id] = req
-        
-        # Pre-load all users
-        user_ids = list(set([req.user_id for req in requests.values() if req.user_id]))
-        users = {}
-        if user_ids:
-            user_list = User.query.filter(User.users_id.in_(user_ids)).all()
-            for user in user_list:
-                users[user.users_id] = user
-        
-        for m in matches:
-            req = requests.get(m.request_id)
-            if req:
-                # Safely get preferred_time and special_requirements using raw SQL
-                preferred_time = None
-                special_requirements = None
-                try:
-                    result = db.session.execute(
-                        text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                        {"id": req.pin_requests_id}
-                    ).first()
-                    if result:
-                        preferred_time = result[0] if result[0] else None
-                        special_requirements = result[1] if result[1] else None
-                except (OperationalError, ProgrammingError):
-                    # Columns don't exist yet - this is OK
-                    pass
-                except Exception:
-                    pass
-                
-                # Safely access category
-                category_name = None
-                try:
-                    category_name = req.category.name if req.category else None
-                except Exception as cat_err:
-                    # Don't rollback here - it will abort the transaction
-                    print(f"DEBUG: Error accessing category for request {m.request_id}: {str(cat_err)}")
-                    category_name = None
-                
-                # Safely access requester name from pre-loaded users
-                requester_name = None
-                try:
-                    user = users.get(req.user_id)
-                    if user:
-                        requester_name = user.name
-                    else:
-                        print(f"DEBUG: User {req.user_id} not found in pre-loaded users for request {m.request_id}")
-                except Exception as user_err:
-                    print(f"DEBUG: Error accessing user for request {m.request_id}: {str(user_err)}")
-                    requester_name = None
-                
-                data.append({
-                    "match_id": m.match_history_id,
-                    "request_id": m.request_id,
-                    "title": req.title,
-                    "description": req.description,
-                    "status": req.status,
-                    "urgency": req.urgency,
-                    "location": req.location,
-                    "category": category_name,
-                    "requester_name": requester_name,
-                    "preferred_time": preferred_time,
-                    "preferredTime": preferred_time,
-                    "special_requirements": special_requirements,
-                    "specialRequirements": special_requirements,
-                    "matched_at": m.matched_at.isoformat() if m.matched_at else None
-                })
-
-        return jsonify(data), 200
+        try:
+            fields = RequestFields.from_args(request.args, ACCEPTED_FIELDS)
+        except FieldSelectionError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(_accepted_rows(csr_id, fields)), 200
     except Exception as e:
         print(f"Error in get_accepted_requests: {str(e)}")
         db.session.rollback()
@@ -949,220 +1061,158 @@ def get_accepted_requests(csr_id):
         traceback.print_exc()
         return jsonify({"error": f"Failed to fetch accepted requests: {str(e)}"}), 500
 
+# Default payloads of the CSR listings (see RequestFields for ?fields= / ?style=)
+ACCEPTED_FIELDS = [
+    "match_id", "request_id", "title", "description", "status", "urgency", "location", "category",
+    "requester_name", "preferred_time", "special_requirements", "matched_at",
+]
+COMPLETED_FIELDS = [
+    "match_id", "request_id", "title", "description", "status", "urgency", "location", "category",
+    "requester_name", "preferred_time", "special_requirements", "completed_at",
+    "feedback_rating", "feedback_comment", "feedback_anonymous", "feedback_submitted_at",
+]
+SHORTLIST_FIELDS = [
+    "shortlist_id", "id", "title", "description", "status", "urgency", "location", "category",
+    "requester_name", "preferred_time", "special_requirements", "shortlisted_at",
+]
+FEEDBACK_FIELDS = ("feedback_rating", "feedback_comment", "feedback_anonymous", "feedback_submitted_at")
+
+
+def _csr_completed_projection(csr_id):
+    """Completed requests for one CSR, joined with category, requester and feedback.
+
+    match_history is grouped per request for this CSR (first match id and
+    whether any match is completed); the completion criteria are one WHERE clause.
+    """
+    csr_matches = select(
+        MatchHistory.request_id,
+        func.min(MatchHistory.match_history_id).label('match_id'),
+        func.bool_or(MatchHistory.match_status == 'completed').label('has_completed_match')
+    ).where(MatchHistory.csr_id == csr_id).group_by(MatchHistory.request_id).subquery('csr_matches')
+    requester = aliased(User, name='requester')
+
+    completed = [
+        csr_matches.c.has_completed_match,
+        PinRequest.status == 'completed',
+        PinRequest.completed_at.isnot(None),
+    ]
+    columns = [
+        PinRequest,
+        csr_matches.c.match_id,
+        Category.name.label('category_name'),
+        requester.name.label('requester_name'),
+    ]
+    has_feedback_table = schema_registry.has_table('feedback')
+    if has_feedback_table:
+        feedback = select(
+            Feedback.feedback_id, Feedback.rating, Feedback.comment, Feedback.anonymous, Feedback.submitted_at
+        ).where(
+            Feedback.request_id == PinRequest.pin_requests_id
+        ).order_by(Feedback.feedback_id).limit(1).lateral('request_feedback')
+        completed.append(feedback.c.feedback_id.isnot(None))
+        columns += [
+            feedback.c.feedback_id.label('feedback_id'),
+            feedback.c.rating.label('feedback_rating'),
+            feedback.c.comment.label('feedback_comment'),
+            feedback.c.anonymous.label('feedback_anonymous'),
+            feedback.c.submitted_at.label('feedback_submitted_at'),
+        ]
+    else:
+        columns += [
+            null().label('feedback_id'),
+            null().label('feedback_rating'),
+            null().label('feedback_comment'),
+            null().label('feedback_anonymous'),
+            null().label('feedback_submitted_at'),
+        ]
+
+    query = db.session.query(*columns).select_from(PinRequest).join(
+        csr_matches, csr_matches.c.request_id == PinRequest.pin_requests_id
+    ).outerjoin(
+        Category, Category.categories_id == PinRequest.category_id
+    ).outerjoin(
+        requester, requester.users_id == PinRequest.user_id
+    )
+    if has_feedback_table:
+        query = query.outerjoin(feedback, true())
+    return query.filter(or_(*completed)).order_by(PinRequest.pin_requests_id)
+
+
+def _accepted_rows(csr_id, fields, refs=None):
+    matches = MatchHistory.query.filter_by(csr_id=csr_id).filter(
+        MatchHistory.match_status != 'completed'
+    ).all()
+    requests = _load_requests_by_id([m.request_id for m in matches], fields, refs)
+    refs = _with_requester_names(refs, requests.values(), fields)
+
+    data = []
+    for m in matches:
+        req = requests.get(m.request_id)
+        if req:
+            data.append(fields.render(
+                req,
+                match_id=m.match_history_id,
+                matched_at=m.matched_at.isoformat() if m.matched_at else None,
+                **_request_names(req, fields, refs),
+            ))
+    return data
+
+
+def _completed_rows(csr_id, fields):
+    # One statement: requests this CSR has a match on, completed by any criterion
+    # (completed match, status, completed_at or existing feedback)
+    rows = _csr_completed_projection(csr_id).options(*fields.load_options(relationships=False)).all()
+
+    data = []
+    for row in rows:
+        has_feedback = row.feedback_id is not None
+        data.append(fields.render(
+            row.PinRequest,
+            match_id=row.match_id,
+            category=row.category_name,
+            requester_name=row.requester_name,
+            feedback_rating=row.feedback_rating if has_feedback else None,
+            feedback_comment=row.feedback_comment if has_feedback else None,
+            feedback_anonymous=row.feedback_anonymous if has_feedback else None,
+            feedback_submitted_at=row.feedback_submitted_at.isoformat() if has_feedback and row.feedback_submitted_at else None,
+        ))
+    return data
+
+
+def _shortlist_rows(csr_id, fields, refs=None):
+    shortlist_items = CSRShortlist.query.filter_by(csr_id=csr_id).all()
+    requests = _load_requests_by_id([s.request_id for s in shortlist_items if s.request_id], fields, refs)
+    refs = _with_requester_names(refs, requests.values(), fields)
+
+    data = []
+    for s in shortlist_items:
+        req = requests.get(s.request_id)
+        if req:
+            data.append(fields.render(
+                req,
+                shortlist_id=s.csr_shortlist_id,
+                shortlisted_at=s.shortlisted_at.isoformat() if s.shortlisted_at else None,
+                **_request_names(req, fields, refs),
+            ))
+    return data
+
+
 # ---------------------------------
 # 📦Completed requests (For CSR)
 # ---------------------------------
 @main.route('/api/csr/completed/<int:csr_id>', methods=['GET'])
 @cross_origin()
+@conditional_response(*LISTING_TABLES)
 def get_completed_requests(csr_id):
     try:
-        # Strategy: Get all completed requests (by any criteria) and filter to only those
-        # where this CSR has a MatchHistory entry (indicating they were involved)
-        
-        # First, get all MatchHistory entries for this CSR to find all requests they were involved with
-        matches = MatchHistory.query.filter_by(csr_id=csr_id).all()
-        print(f"DEBUG get_completed_requests: Found {len(matches)} MatchHistory entries for CSR {csr_id}")
-
-        # Get all unique request IDs this CSR was involved with (regardless of match_status)
-        request_ids_with_match = set([m.request_id for m in matches])
-        print(f"DEBUG get_completed_requests: Found {len(request_ids_with_match)} unique request IDs with MatchHistory for CSR {csr_id}")
-        
-        # Now get all completed requests where this CSR was involved
-        # Strategy: For each request this CSR was involved with, check if it's completed by any criteria
-        
-        # Get all PinRequests for requests this CSR was involved with
-        all_completed_request_ids = set()
-        
-        if request_ids_with_match:
-            # Get all PinRequests for these request IDs
-            candidate_requests = PinRequest.query.options(joinedload(PinRequest.category_rel)).filter(
-                PinRequest.pin_requests_id.in_(list(request_ids_with_match))
-            ).all()
-            
-            # Check each request to see if it's completed by any criteria
-            for req in candidate_requests:
-                # Check if any MatchHistory entry for this CSR has match_status='completed'
-                has_completed_match = any(m.match_status == 'completed' for m in matches if m.request_id == req.pin_requests_id)
-                
-                # Check if request itself is completed
-                is_completed_by_status = (req.status == 'completed' or req.completed_at is not None)
-                
-                # Check if request has feedback (indicates completion)
-                has_feedback = False
-                try:
-                    inspector = inspect(db.engine)
-                    if 'feedback' in inspector.get_table_names():
-                        feedback = Feedback.query.filter_by(request_id=req.pin_requests_id).first()
-                        if feedback:
-                            has_feedback = True
-                except Exception:
-                    pass
-                
-                # If completed by any criteria, include it
-                if has_completed_match or is_completed_by_status or has_feedback:
-                    all_completed_request_ids.add(req.pin_requests_id)
-                    print(f"DEBUG: Request {req.pin_requests_id} is completed: has_completed_match={has_completed_match}, is_completed_by_status={is_completed_by_status}, has_feedback={has_feedback}")
-        
-        print(f"DEBUG get_completed_requests: Found {len(all_completed_request_ids)} completed request IDs for CSR {csr_id}")
-        
-        data = []
-        
-        if not all_completed_request_ids:
-            print(f"DEBUG get_completed_requests: Returning 0 completed requests for CSR {csr_id}")
-            return jsonify(data), 200
-        
-        # Query all PinRequests at once to avoid transaction issues
-        requests = {}
-        pin_requests = PinRequest.query.options(joinedload(PinRequest.category_rel)).filter(
-            PinRequest.pin_requests_id.in_(list(all_completed_request_ids))
-        ).all()
-        for req in pin_requests:
-            requests[req.pin_requests_id] = req
-        print(f"DEBUG get_completed_requests: Loaded {len(requests)} PinRequests")
-        
-        # Pre-load all users to avoid transaction issues
-        user_ids = list(set([req.user_id for req in requests.values() if req.user_id]))
-        users = {}
-        if user_ids:
-            user_list = User.query.filter(User.users_id.in_(user_ids)).all()
-            for user in user_list:
-                users[user.users_id] = user
-        
-        # Pre-load all feedback records for all completed requests to avoid transaction issues
-        feedback_map = {}
         try:
-            inspector = inspect(db.engine)
-            if 'feedback' in inspector.get_table_names():
-                # Query all feedback records for all completed requests in one query
-                feedback_list = Feedback.query.filter(
-                    Feedback.request_id.in_(list(all_completed_request_ids))
-                ).all()
-                for feedback in feedback_list:
-                    feedback_map[feedback.request_id] = {
-                        "rating": feedback.rating,
-                        "comment": feedback.comment,
-                        "anonymous": feedback.anonymous,
-                        "submitted_at": feedback.submitted_at.isoformat() if feedback.submitted_at else None
-                    }
-                print(f"DEBUG get_completed_requests: Pre-loaded {len(feedback_map)} feedback records")
-        except Exception as feedback_load_err:
-            print(f"DEBUG: Error pre-loading feedback: {str(feedback_load_err)}")
-            import traceback
-            traceback.print_exc()
-        
-        # Create a map of request_id to MatchHistory entries for this CSR
-        match_map = {}
-        for m in matches:
-            if m.request_id not in match_map:
-                match_map[m.request_id] = []
-            match_map[m.request_id].append(m)
-        
-        # Process all completed requests for this CSR
-        for req_id, req in requests.items():
-            # Get MatchHistory entries for this request and CSR
-            req_matches = match_map.get(req_id, [])
-            
-            # Check if any MatchHistory entry for this CSR has match_status='completed'
-            has_completed_match = any(m.match_status == 'completed' for m in req_matches)
-            
-            # Get feedback from pre-loaded dictionary
-            feedback_data = feedback_map.get(req_id)
-            has_feedback = feedback_data is not None
-            
-            # Include if request exists and is completed (check multiple criteria including feedback)
-            # IMPORTANT: Include if request is completed by ANY criteria, not just match_status
-            try:
-                is_completed = (has_completed_match or req.status == 'completed' or req.completed_at is not None or has_feedback)
-                print(f"DEBUG: Request {req_id}: has_completed_match={has_completed_match}, req.status={req.status}, completed_at={req.completed_at}, has_feedback={has_feedback}, is_completed={is_completed}")
-            except Exception as check_err:
-                print(f"DEBUG: Error checking completion status for request {req_id}: {str(check_err)}")
-                is_completed = False
-            
-            if is_completed:
-                try:
-                    # Safely get preferred_time and special_requirements using raw SQL
-                    preferred_time = None
-                    special_requirements = None
-                    try:
-                        result = db.session.execute(
-                            text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                            {"id": req.pin_requests_id}
-                        ).first()
-                        if result:
-                            preferred_time = result[0] if result[0] else None
-                            special_requirements = result[1] if result[1] else None
-                    except (OperationalError, ProgrammingError):
-                        # Columns don't exist yet - this is OK
-                        pass
-                    except Exception:
-                        pass
-                    
-                    # Safely access category
-                    category_name = None
-                    try:
-                        category_name = req.category.name if req.category else None
-                    except Exception as cat_err:
-                        # Don't rollback here - it will abort the transaction
-                        print(f"DEBUG: Error accessing category for request {req_id}: {str(cat_err)}")
-                        category_name = None
-                    
-                    # Safely access requester name from pre-loaded users
-                    requester_name = None
-                    try:
-                        print(f"DEBUG: Looking up user_id={req.user_id} for request {req_id} (title: {req.title})")
-                        user = users.get(req.user_id)
-                        if user:
-                            requester_name = user.name
-                            print(f"DEBUG: Found requester_name={requester_name} for request {req_id}")
-                        else:
-                            print(f"DEBUG: User {req.user_id} not found in pre-loaded users for request {req_id}. Available user_ids: {list(users.keys())}")
-                    except Exception as user_err:
-                        print(f"DEBUG: Error accessing user for request {req_id}: {str(user_err)}")
-                        requester_name = None
-                    
-                    # Safely format completed_at
-                    completed_at_str = None
-                    try:
-                        if req.completed_at and hasattr(req.completed_at, 'isoformat'):
-                            completed_at_str = req.completed_at.isoformat()
-                    except Exception:
-                        completed_at_str = None
-                    
-                    # Use the first MatchHistory entry for this request and CSR
-                    match_entry = req_matches[0] if req_matches else None
-                    
-                    data.append({
-                        "match_id": match_entry.match_history_id if match_entry else None,
-                        "request_id": req_id,
-                        "title": req.title,
-                        "description": req.description,
-                        "status": req.status,
-                        "urgency": req.urgency,
-                        "location": req.location,
-                        "category": category_name,
-                        "requester_name": requester_name,
-                        "preferred_time": preferred_time,
-                        "preferredTime": preferred_time,
-                        "special_requirements": special_requirements,
-                        "specialRequirements": special_requirements,
-                        "completed_at": completed_at_str,
-                        "feedback_rating": feedback_data.get("rating") if feedback_data else None,
-                        "feedback_comment": feedback_data.get("comment") if feedback_data else None,
-                        "feedback_anonymous": feedback_data.get("anonymous") if feedback_data else None,
-                        "feedback_submitted_at": feedback_data.get("submitted_at") if feedback_data else None
-                    })
-                    print(f"DEBUG: Added request {req_id} to completed list")
-                except Exception as append_err:
-                    print(f"DEBUG: Error adding request {req_id} to completed list: {str(append_err)}")
-                    import traceback
-                    traceback.print_exc()
-            else:
-                print(f"DEBUG: Request {req_id} not included - not completed")
-
-        print(f"DEBUG get_completed_requests: Returning {len(data)} completed requests for CSR {csr_id}")
-        return jsonify(data), 200
+            fields = RequestFields.from_args(request.args, COMPLETED_FIELDS)
+        except FieldSelectionError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(_completed_rows(csr_id, fields)), 200
     except Exception as e:
         print(f"Error in get_completed_requests: {str(e)}")
+        db.session.rollback()
         import traceback
         traceback.print_exc()
         return jsonify({"error": f"Failed to fetch completed requests: {str(e)}"}), 500
@@ -1173,159 +1223,247 @@ def get_completed_requests(csr_id):
 # ---------------------------------
 @main.route('/api/csr/shortlist/<int:csr_id>', methods=['GET'])
 @cross_origin()
+@conditional_response(*LISTING_TABLES)
 def get_shortlisted_requests(csr_id):
     try:
-        shortlist_items = CSRShortlist.query.filter_by(csr_id=csr_id).all()
+        try:
+            fields = RequestFields.from_args(request.args, SHORTLIST_FIELDS)
+        except FieldSelectionError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(_shortlist_rows(csr_id, fields)), 200
+    except Exception as e:
+        print(f"Error in get_shortlisted_requests: {str(e)}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to fetch shortlisted requests: {str(e)}"}), 500
 
-        data = []
-        for s in shortlist_items:
-            req = PinRequest.query.get(s.request_id)
-            if req:
-                # Safely get preferred_time and special_requirements using raw SQL
-                preferred_time = None
-                special_requirements = None
-                try:
-                    result = db.session.execute(
-                        text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                        {"id": req.pin_requests_id}
-                    ).first()
-                    if result:
-                        preferred_time = result[0] if result[0] else None
-                        special_requirements = result[1] if result[1] else None
-                except (OperationalError, ProgrammingError):
-                    # Columns don't exist yet - this is OK
-                    pass
-                except Exception:
-                    pass
-                
-                # Safely access category
-                category_name = None
-                try:
-                    category_name = req.category.name if req.category else None
-                except Exception:
-                    db.session.rollback()
-                    category_name = None
-                
-                # Safely access requester name
-                requester_name = None
-                try:
-                    requester_name = req.pin_user.name if req.pin_user else None
-                except Exception:
-                    db.session.rollback()
-                    requester_name = None
-                
-                data.append({
-                    "shortlist_id": s.csr_shortlist_id,
-                    "id": req.pin_requests_id,
-                    "title": req.title,
-                    "description": req.description,
-                    "status": req.status,
-                    "urgency": req.urgency,
-                    "location": req.location,
-                    "category": category_name,
-                    "requester_name": requester_name,
-                    "preferred_time": preferred_time,
-                    "preferredTime": preferred_time,
-                    "special_requirements": special_requirements,
-                    "specialRequirements": special_requirements,
-                    "shortlisted_at": s.shortlisted_at.isoformat() if s.shortlisted_at else None
-                })
 
+# ---------------------------------
+# 🧭 CSR dashboard (all sections in one call)
+# ---------------------------------
+DASHBOARD_SECTIONS = ("open_requests", "users", "accepted", "completed", "shortlist", "categories")
+
+
+@main.route('/api/csr/dashboard/<int:csr_id>', methods=['GET'])
+@cross_origin()
+@conditional_response(*LISTING_TABLES)
+def get_csr_dashboard(csr_id):
+    """Everything CSRDashboard loads, in the same shapes as the single endpoints.
+
+    ?sections= limits the response to some of DASHBOARD_SECTIONS. Categories,
+    and users when the users section is wanted, are loaded once and reused for
+    the category/requester names (otherwise each section looks up its own
+    requesters), then the request sections run (on a thread pool when
+    DASHBOARD_WORKERS > 0).
+    meta.sections has the row count and elapsed milliseconds of each section.
+    """
+    try:
+        wanted = DASHBOARD_SECTIONS
+        if request.args.get('sections'):
+            wanted = [name.strip() for name in request.args['sections'].split(',') if name.strip()]
+            unknown = set(wanted) - set(DASHBOARD_SECTIONS)
+            if unknown:
+                return jsonify({
+                    "error": f"Unknown sections: {', '.join(sorted(unknown))}. Available: {', '.join(DASHBOARD_SECTIONS)}"
+                }), 400
+        started = time.perf_counter()
+
+        # Every user only for the users section, and then only its columns; without
+        # it, each section looks up the names of just its own requesters
+        reference, timings = run_sections({
+            "users": lambda: db.session.query(User.users_id, User.name, User.role, User.email).all() if "users" in wanted else None,
+            "categories": lambda: Category.query.all(),
+        }, workers=0)
+        refs = {
+            "users": {u.users_id: u.name for u in reference["users"]} if reference["users"] is not None else None,
+            "categories": {c.categories_id: c.name for c in reference["categories"]},
+        }
+
+        builders = {
+            "open_requests": lambda: _open_request_rows(RequestFields(OPEN_REQUEST_FIELDS), refs),
+            "accepted": lambda: _accepted_rows(csr_id, RequestFields(ACCEPTED_FIELDS), refs),
+            "completed": lambda: _completed_rows(csr_id, RequestFields(COMPLETED_FIELDS)),
+            "shortlist": lambda: _shortlist_rows(csr_id, RequestFields(SHORTLIST_FIELDS), refs),
+        }
+        sections, section_timings = run_sections({name: build for name, build in builders.items() if name in wanted})
+        if "users" in wanted:
+            sections["users"] = _user_rows(reference["users"])
+        sections["categories"] = _category_rows(reference["categories"])
+        timings.update(section_timings)
+
+        data = {name: sections[name] for name in DASHBOARD_SECTIONS if name in wanted}
+        data["meta"] = {
+            "csr_id": csr_id,
+            "sections": {name: {"count": len(rows), "ms": timings[name]} for name, rows in data.items()},
+            "total_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
         return jsonify(data), 200
     except Exception as e:
-        print(f"Error in get_shortlisted_requests: {str(e)}")
+        print(f"Error in get_csr_dashboard: {str(e)}")
         db.session.rollback()
         import traceback
         traceback.print_exc()
-        return jsonify({"error": f"Failed to fetch shortlisted requests: {str(e)}"}), 500
+        return jsonify({"error": f"Failed to fetch CSR dashboard: {str(e)}"}), 500
+
+
+# ---------------------------------
+# 🎯 Recommended open requests (For CSR)
+# ---------------------------------
+RECOMMENDATION_FIELDS = OPEN_REQUEST_FIELDS + ["score"]
+DEFAULT_RECOMMENDATIONS = 20
+MAX_RECOMMENDATIONS = 100
+
+
+@main.route('/api/csr/recommendations/<int:csr_id>', methods=['GET'])
+@cross_origin()
+def get_csr_recommendations(csr_id):
+    """Open requests ranked for one CSR, best first (?limit=, default 20, max 100).
+
+    The score mixes the CSR's categories and locations from their matches and
+    shortlist (categories weighted by how often they complete), urgency and
+    time waited; see app/recommendations.py. Requests the CSR has already
+    shortlisted are left out. There is no ETag: the time waited moves the
+    ranking even while no table changes.
+    """
+    try:
+        try:
+            fields = RequestFields.from_args(request.args, RECOMMENDATION_FIELDS)
+            limit = int(request.args.get('limit', DEFAULT_RECOMMENDATIONS))
+        except FieldSelectionError as e:
+            return jsonify({"error": str(e)}), 400
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        if limit < 1:
+            return jsonify({"error": "limit must be at least 1"}), 400
+        limit = min(limit, MAX_RECOMMENDATIONS)
+
+        open_request_index.refresh()
+        profile = csr_profile(csr_id)
+        started = time.perf_counter()
+        request_ids, scores = open_request_index.top_k(profile, limit)
+        scoring_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        loaded = _load_requests_by_id(request_ids, fields)
+        items = [
+            fields.render(loaded[request_id], score=round(score, 4))
+            for request_id, score in zip(request_ids, scores) if request_id in loaded
+        ]
+        return jsonify({
+            "items": items,
+            "meta": {"csr_id": csr_id, "open_requests": len(open_request_index), "scoring_ms": scoring_ms},
+        }), 200
+    except Exception as e:
+        print(f"Error in get_csr_recommendations: {str(e)}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to fetch recommendations: {str(e)}"}), 500
 
 
 # ---------------------------------
 # 📦Accepted requests (Global fallback)
 # ---------------------------------
+MATCH_SORT_KEYS = {
+    "id": MatchHistory.match_history_id,
+    "matched_at": MatchHistory.matched_at,
+}
+SHORTLIST_SORT_KEYS = {
+    "id": CSRShortlist.csr_shortlist_id,
+    "shortlisted_at": CSRShortlist.shortlisted_at,
+}
+
+
+def _naive_utc(value):
+    # Columns hold naive UTC; an offset in ?from=/?to= is converted, not dropped
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parse_date_arg(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return _naive_utc(datetime.fromisoformat(value))
+    except ValueError:
+        raise PaginationError(f"{name} must be an ISO date or datetime")
+
+
+def _apply_global_filters(query, args, csr_column, time_column):
+    """?csr_id= and a ?from=/?to= window (inclusive start, exclusive end)."""
+    if args.get('csr_id'):
+        try:
+            query = query.filter(csr_column == int(args['csr_id']))
+        except ValueError:
+            raise PaginationError("csr_id must be an integer")
+    start = _parse_date_arg(args, 'from')
+    end = _parse_date_arg(args, 'to')
+    if start:
+        query = query.filter(time_column >= start)
+    if end:
+        query = query.filter(time_column < end)
+    return query
+
+
+def _load_requests_by_id(request_ids, fields, refs=None):
+    # Batch-load the requests behind one page of matches/shortlist items,
+    # fetching only the columns and relationships the response needs
+    if not request_ids:
+        return {}
+    pin_requests = PinRequest.query.options(*fields.load_options(relationships=refs is None)).filter(
+        PinRequest.pin_requests_id.in_(list(set(request_ids)))
+    ).all()
+    return {req.pin_requests_id: req for req in pin_requests}
+
+
+def _load_feedback_by_request(request_ids):
+    feedback_map = {}
+    if not request_ids or not schema_registry.has_table('feedback'):
+        return feedback_map
+    feedback_list = Feedback.query.filter(
+        Feedback.request_id.in_(list(set(request_ids)))
+    ).order_by(Feedback.feedback_id).all()
+    for feedback in feedback_list:
+        feedback_map.setdefault(feedback.request_id, {
+            "rating": feedback.rating,
+            "comment": feedback.comment,
+            "anonymous": feedback.anonymous,
+            "submitted_at": feedback.submitted_at.isoformat() if feedback.submitted_at else None
+        })
+    return feedback_map
+
+
 @main.route('/api/csr/accepted', methods=['GET'])
 @cross_origin()
+@conditional_response(*LISTING_TABLES)
 def get_accepted_requests_global():
     try:
-        matches = MatchHistory.query.filter(MatchHistory.match_status != 'completed').all()
+        try:
+            fields = RequestFields.from_args(request.args, ACCEPTED_FIELDS)
+            page = parse_page_args(request.args, MATCH_SORT_KEYS, "id")
+            query = MatchHistory.query.filter(MatchHistory.match_status != 'completed')
+            if request.args.get('status'):
+                query = query.filter(MatchHistory.match_status == request.args['status'])
+            query = _apply_global_filters(query, request.args, MatchHistory.csr_id, MatchHistory.matched_at)
+        except (PaginationError, FieldSelectionError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        matches, next_cursor = keyset_page(query, page, MatchHistory.match_history_id)
+        requests = _load_requests_by_id([m.request_id for m in matches], fields)
 
         data = []
-        request_ids = [m.request_id for m in matches]
-        
-        # Pre-load all requests and users to avoid transaction issues
-        requests = {}
-        if request_ids:
-            pin_requests = PinRequest.query.filter(PinRequest.pin_requests_id.in_(request_ids)).all()
-            for req in pin_requests:
-                requests[req.pin_requests_id] = req
-        
-        # Pre-load all users
-        user_ids = list(set([req.user_id for req in requests.values() if req.user_id]))
-        users = {}
-        if user_ids:
-            user_list = User.query.filter(User.users_id.in_(user_ids)).all()
-            for user in user_list:
-                users[user.users_id] = user
-        
         for m in matches:
             req = requests.get(m.request_id)
             if req:
-                # Safely get preferred_time and special_requirements using raw SQL
-                preferred_time = None
-                special_requirements = None
-                try:
-                    result = db.session.execute(
-                        text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                        {"id": req.pin_requests_id}
-                    ).first()
-                    if result:
-                        preferred_time = result[0] if result[0] else None
-                        special_requirements = result[1] if result[1] else None
-                except (OperationalError, ProgrammingError):
-                    # Columns don't exist yet - this is OK
-                    pass
-                except Exception:
-                    pass
-                
-                # Safely access category
-                category_name = None
-                try:
-                    category_name = req.category.name if req.category else None
-                except Exception as cat_err:
-                    # Don't rollback here - it will abort the transaction
-                    print(f"DEBUG: Error accessing category for request {m.request_id}: {str(cat_err)}")
-                    category_name = None
-                
-                # Safely access requester name from pre-loaded users
-                requester_name = None
-                try:
-                    user = users.get(req.user_id)
-                    if user:
-                        requester_name = user.name
-                    else:
-                        print(f"DEBUG: User {req.user_id} not found in pre-loaded users for request {m.request_id}")
-                except Exception as user_err:
-                    print(f"DEBUG: Error accessing user for request {m.request_id}: {str(user_err)}")
-                    requester_name = None
-                
-                data.append({
-                    "match_id": m.match_history_id,
-                    "request_id": m.request_id,
-                    "title": req.title,
-                    "description": req.description,
-                    "status": req.status,
-                    "urgency": req.urgency,
-                    "location": req.location,
-                    "category": category_name,
-                    "requester_name": requester_name,
-                    "preferred_time": preferred_time,
-                    "preferredTime": preferred_time,
-                    "special_requirements": special_requirements,
-                    "specialRequirements": special_requirements,
-                    "matched_at": m.matched_at.isoformat() if m.matched_at else None
-                })
+                data.append(fields.render(
+                    req,
+                    match_id=m.match_history_id,
+                    matched_at=m.matched_at.isoformat() if m.matched_at else None,
+                ))
 
-        return jsonify(data), 200
+        return jsonify(page_response(data, page, next_cursor, 'match_history')), 200
     except Exception as e:
         print(f"Error in get_accepted_requests_global: {str(e)}")
         db.session.rollback()
@@ -1339,138 +1477,60 @@ def get_accepted_requests_global():
 # ---------------------------------
 @main.route('/api/csr/completed', methods=['GET'])
 @cross_origin()
+@conditional_response(*LISTING_TABLES)
 def get_completed_requests_global():
     try:
-        # Get all MatchHistory entries, then filter by completion criteria
-        # Include requests where either:
+        # Include matches where either:
         # 1. MatchHistory match_status is "completed", OR
         # 2. PinRequest status is "completed", OR
         # 3. PinRequest has completed_at timestamp (indicating completion), OR
         # 4. Request has feedback (strong indicator of completion)
-        matches = MatchHistory.query.all()
-        print(f"DEBUG get_completed_requests_global: Found {len(matches)} MatchHistory entries")
+        completed = [
+            MatchHistory.match_status == 'completed',
+            PinRequest.status == 'completed',
+            PinRequest.completed_at.isnot(None),
+        ]
+        if schema_registry.has_table('feedback'):
+            completed.append(exists().where(Feedback.request_id == MatchHistory.request_id))
 
-        data = []
+        try:
+            fields = RequestFields.from_args(request.args, COMPLETED_FIELDS)
+            page = parse_page_args(request.args, MATCH_SORT_KEYS, "id")
+            query = MatchHistory.query.join(
+                PinRequest, PinRequest.pin_requests_id == MatchHistory.request_id
+            ).filter(or_(*completed))
+            if request.args.get('status'):
+                query = query.filter(PinRequest.status == request.args['status'])
+            query = _apply_global_filters(query, request.args, MatchHistory.csr_id, MatchHistory.matched_at)
+        except (PaginationError, FieldSelectionError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        matches, next_cursor = keyset_page(query, page, MatchHistory.match_history_id)
         request_ids = [m.request_id for m in matches]
-        
-        # Query all PinRequests at once to avoid transaction issues
-        requests = {}
-        if request_ids:
-            pin_requests = PinRequest.query.options(joinedload(PinRequest.category_rel)).filter(PinRequest.pin_requests_id.in_(request_ids)).all()
-            for req in pin_requests:
-                requests[req.pin_requests_id] = req
-        
-        # Pre-load all users to avoid transaction issues
-        user_ids = list(set([req.user_id for req in requests.values() if req.user_id]))
-        users = {}
-        if user_ids:
-            user_list = User.query.filter(User.users_id.in_(user_ids)).all()
-            for user in user_list:
-                users[user.users_id] = user
-        
-        # Pre-load all feedback records for all requests to avoid transaction issues
+        requests = _load_requests_by_id(request_ids, fields)
         feedback_map = {}
-        try:
-            inspector = inspect(db.engine)
-            if 'feedback' in inspector.get_table_names() and request_ids:
-                # Query all feedback records for all requests in one query
-                feedback_list = Feedback.query.filter(
-                    Feedback.request_id.in_(request_ids)
-                ).all()
-                for feedback in feedback_list:
-                    feedback_map[feedback.request_id] = {
-                        "rating": feedback.rating,
-                        "comment": feedback.comment,
-                        "anonymous": feedback.anonymous,
-                        "submitted_at": feedback.submitted_at.isoformat() if feedback.submitted_at else None
-                    }
-                print(f"DEBUG get_completed_requests_global: Pre-loaded {len(feedback_map)} feedback records")
-        except Exception as feedback_load_err:
-            print(f"DEBUG: Error pre-loading feedback: {str(feedback_load_err)}")
-            import traceback
-            traceback.print_exc()
-        
+        if any(fields.wants(name) for name in FEEDBACK_FIELDS):
+            feedback_map = _load_feedback_by_request(request_ids)
+
+        data = []
         for m in matches:
-            # Get request from pre-loaded dictionary
             req = requests.get(m.request_id)
             if not req:
-                print(f"DEBUG: Request {m.request_id} not found in pre-loaded requests")
                 continue
-            
-            # Get feedback from pre-loaded dictionary
-            feedback_data = feedback_map.get(m.request_id)
-            has_feedback = feedback_data is not None
-            
-            # Include if request exists and is completed (check multiple criteria including feedback)
-            is_completed = (m.match_status == 'completed' or req.status == 'completed' or req.completed_at is not None or has_feedback)
-            print(f"DEBUG: Request {m.request_id}: match_status={m.match_status}, req.status={req.status}, completed_at={req.completed_at}, has_feedback={has_feedback}, is_completed={is_completed}")
-            if is_completed:
-                # Safely get preferred_time and special_requirements using raw SQL
-                preferred_time = None
-                special_requirements = None
-                try:
-                    result = db.session.execute(
-                        text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                        {"id": req.pin_requests_id}
-                    ).first()
-                    if result:
-                        preferred_time = result[0] if result[0] else None
-                        special_requirements = result[1] if result[1] else None
-                except (OperationalError, ProgrammingError):
-                    # Columns don't exist yet - this is OK
-                    pass
-                except Exception:
-                    pass
-                
-                # Safely access category
-                category_name = None
-                try:
-                    category_name = req.category.name if req.category else None
-                except Exception as cat_err:
-                    # Don't rollback here - it will abort the transaction
-                    print(f"DEBUG: Error accessing category for request {m.request_id}: {str(cat_err)}")
-                    category_name = None
-                
-                # Safely access requester name from pre-loaded users
-                requester_name = None
-                try:
-                    user = users.get(req.user_id)
-                    if user:
-                        requester_name = user.name
-                    else:
-                        print(f"DEBUG: User {req.user_id} not found in pre-loaded users for request {m.request_id}")
-                except Exception as user_err:
-                    print(f"DEBUG: Error accessing user for request {m.request_id}: {str(user_err)}")
-                    requester_name = None
-                
-                data.append({
-                    "match_id": m.match_history_id,
-                    "request_id": m.request_id,
-                    "title": req.title,
-                    "description": req.description,
-                    "status": req.status,
-                    "urgency": req.urgency,
-                    "location": req.location,
-                    "category": category_name,
-                    "requester_name": requester_name,
-                    "preferred_time": preferred_time,
-                    "preferredTime": preferred_time,
-                    "special_requirements": special_requirements,
-                    "specialRequirements": special_requirements,
-                    "completed_at": req.completed_at.isoformat() if (req.completed_at and hasattr(req.completed_at, 'isoformat')) else None,
-                    "feedback_rating": feedback_data.get("rating") if feedback_data else None,
-                    "feedback_comment": feedback_data.get("comment") if feedback_data else None,
-                    "feedback_anonymous": feedback_data.get("anonymous") if feedback_data else None,
-                    "feedback_submitted_at": feedback_data.get("submitted_at") if feedback_data else None
-                })
-                print(f"DEBUG: Added request {m.request_id} to completed list")
-            else:
-                print(f"DEBUG: Request {m.request_id} not included - not completed")
-
-        print(f"DEBUG get_completed_requests_global: Returning {len(data)} completed requests")
-        return jsonify(data), 200
+            feedback_data = feedback_map.get(m.request_id) or {}
+            data.append(fields.render(
+                req,
+                match_id=m.match_history_id,
+                feedback_rating=feedback_data.get("rating"),
+                feedback_comment=feedback_data.get("comment"),
+                feedback_anonymous=feedback_data.get("anonymous"),
+                feedback_submitted_at=feedback_data.get("submitted_at"),
+            ))
+
+        return jsonify(page_response(data, page, next_cursor, 'match_history')), 200
     except Exception as e:
         print(f"Error in get_completed_requests_global: {str(e)}")
+        db.session.rollback()
         import traceback
         traceback.print_exc()
         return jsonify({"error": f"Failed to fetch completed requests: {str(e)}"}), 500
@@ -1481,56 +1541,36 @@ def get_completed_requests_global():
 # ---------------------------------
 @main.route('/api/csr/shortlist', methods=['GET'])
 @cross_origin()
+@conditional_response(*LISTING_TABLES)
 def get_shortlisted_requests_global():
     try:
-        shortlist_items = CSRShortlist.query.all()
+        try:
+            # The global listing has never included the requester
+            fields = RequestFields.from_args(request.args, [f for f in SHORTLIST_FIELDS if f != "requester_name"])
+            page = parse_page_args(request.args, SHORTLIST_SORT_KEYS, "id")
+            query = CSRShortlist.query
+            if request.args.get('status'):
+                query = query.join(
+                    PinRequest, PinRequest.pin_requests_id == CSRShortlist.request_id
+                ).filter(PinRequest.status == request.args['status'])
+            query = _apply_global_filters(query, request.args, CSRShortlist.csr_id, CSRShortlist.shortlisted_at)
+        except (PaginationError, FieldSelectionError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        shortlist_items, next_cursor = keyset_page(query, page, CSRShortlist.csr_shortlist_id)
+        requests = _load_requests_by_id([s.request_id for s in shortlist_items], fields)
 
         data = []
         for s in shortlist_items:
-            req = PinRequest.query.get(s.request_id)
+            req = requests.get(s.request_id)
             if req:
-                # Safely get preferred_time and special_requirements using raw SQL
-                preferred_time = None
-                special_requirements = None
-                try:
-                    result = db.session.execute(
-                        text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                        {"id": req.pin_requests_id}
-                    ).first()
-                    if result:
-                        preferred_time = result[0] if result[0] else None
-                        special_requirements = result[1] if result[1] else None
-                except (OperationalError, ProgrammingError):
-                    # Columns don't exist yet - this is OK
-                    pass
-                except Exception:
-                    pass
-                
-                # Safely access category
-                category_name = None
-                try:
-                    category_name = req.category.name if req.category else None
-                except Exception:
-                    db.session.rollback()
-                    category_name = None
-                
-                data.append({
-                    "shortlist_id": s.csr_shortlist_id,
-                    "id": req.pin_requests_id,
-                    "title": req.title,
-                    "description": req.description,
-                    "status": req.status,
-                    "urgency": req.urgency,
-                    "location": req.location,
-                    "category": category_name,
-                    "preferred_time": preferred_time,
-                    "preferredTime": preferred_time,
-                    "special_requirements": special_requirements,
-                    "specialRequirements": special_requirements,
-                    "shortlisted_at": s.shortlisted_at.isoformat() if s.shortlisted_at else None
-                })
+                data.append(fields.render(
+                    req,
+                    shortlist_id=s.csr_shortlist_id,
+                    shortlisted_at=s.shortlisted_at.isoformat() if s.shortlisted_at else None,
+                ))
 
-        return jsonify(data), 200
+        return jsonify(page_response(data, page, next_cursor, 'csr_shortlist')), 200
     except Exception as e:
         print(f"Error in get_shortlisted_requests_global: {str(e)}")
         db.session.rollback()
@@ -1554,16 +1594,21 @@ def accept_request_action(req_id):
     if not req:
         return jsonify({"error": "Request not found"}), 404
 
-    # Create or update match
-    existing = MatchHistory.query.filter_by(csr_id=csr_id, request_id=req_id).first()
-    if not existing:
-        existing = MatchHistory(csr_id=csr_id, request_id=req_id, match_status='pending')
-        db.session.add(existing)
+    # Create the match unless this CSR has one; a concurrent double click
+    # waits on the other insert and then inserts nothing
+    db.session.execute(pg_insert(MatchHistory).values(
+        csr_id=csr_id, request_id=req_id, match_status='pending'
+    ).on_conflict_do_nothing(index_elements=['csr_id', 'request_id']))
+    match_id = db.session.query(MatchHistory.match_history_id).filter_by(csr_id=csr_id, request_id=req_id).scalar()
 
     req.status = 'matched'
+    bump_generations('pin_requests', 'match_history')
+    publish('request.accepted', req, [
+        role_channel('csr_rep'), role_channel('platform_manager'), user_channel(req.user_id), user_channel(csr_id),
+    ], csr_id=int(csr_id))
     db.session.commit()
 
-    return jsonify({"message": "accepted", "match_id": existing.match_history_id}), 200
+    return jsonify({"message": "accepted", "match_id": match_id}), 200
 
 
 @main.route('/api/requests/<int:req_id>/shortlist', methods=['POST'])
@@ -1578,13 +1623,16 @@ def shortlist_request_action(req_id):
     if not req:
         return jsonify({"error": "Request not found"}), 404
 
-    exists = CSRShortlist.query.filter_by(csr_id=csr_id, request_id=req_id).first()
-    if not exists:
-        exists = CSRShortlist(csr_id=csr_id, request_id=req_id)
-        db.session.add(exists)
-        db.session.commit()
+    # As in accept_request_action: a double click finds the first click's row
+    inserted = db.session.execute(pg_insert(CSRShortlist).values(
+        csr_id=csr_id, request_id=req_id
+    ).on_conflict_do_nothing(index_elements=['csr_id', 'request_id'])).rowcount
+    shortlist_id = db.session.query(CSRShortlist.csr_shortlist_id).filter_by(csr_id=csr_id, request_id=req_id).scalar()
+    if inserted:
+        bump_generations('csr_shortlist')
+    db.session.commit()
 
-    return jsonify({"message": "shortlisted", "shortlist_id": exists.csr_shortlist_id}), 200
+    return jsonify({"message": "shortlisted", "shortlist_id": shortlist_id}), 200
 
 
 @main.route('/api/requests/<int:req_id>/shortlist', methods=['DELETE'])
@@ -1597,7 +1645,9 @@ def remove_shortlist_request_action(req_id):
 
     item = CSRShortlist.query.filter_by(csr_id=csr_id, request_id=req_id).first()
     if item:
+        record_deletes(CSRShortlist, CSRShortlist.csr_shortlist_id == item.csr_shortlist_id)
         db.session.delete(item)
+        bump_generations('csr_shortlist')
         db.session.commit()
 
     return jsonify({"message": "removed"}), 200
@@ -1630,6 +1680,11 @@ def update_accepted_status(req_id):
     else:
         match.match_status = status
 
+    bump_generations('pin_requests', 'match_history')
+    if match.request:
+        publish('match.status', match.request, [
+            role_channel('platform_manager'), user_channel(match.request.user_id), user_channel(csr_id),
+        ], csr_id=int(csr_id), match_status=status)
     db.session.commit()
 
     return jsonify({"message": "updated"}), 200
@@ -1645,7 +1700,9 @@ def remove_self_from_request(req_id):
 
     match = MatchHistory.query.filter_by(csr_id=csr_id, request_id=req_id).first()
     if match:
+        record_deletes(MatchHistory, MatchHistory.match_history_id == match.match_history_id)
         db.session.delete(match)
+        bump_generations('match_history')
         db.session.commit()
 
     return jsonify({"message": "removed"}), 200
@@ -1674,6 +1731,10 @@ def complete_request_action(req_id):
         # Always set completion_note, even if empty (to clear previous notes if needed)
         req.completion_note = note if note else None
         
+        bump_generations('pin_requests', 'match_history')
+        publish('request.completed', req, [
+            role_channel('platform_manager'), user_channel(req.user_id), user_channel(csr_id),
+        ], csr_id=int(csr_id))
         db.session.commit()
         
         # Debug: Log completion note save
@@ -1691,23 +1752,26 @@ def complete_request_action(req_id):
         traceback.print_exc()
         return jsonify({"error": f"Failed to complete request: {str(e)}"}), 500
 
+def _category_rows(categories):
+    return [
+        {
+            "id": c.categories_id,
+            "name": c.name,
+            "description": c.description
+        }
+        for c in categories
+    ]
+
+
 # ---------------------------------
 # Get Categories
 # ---------------------------------
 @main.route('/api/categories', methods=['GET'])
 @cross_origin()
+@cached_response('categories')
 def get_categories():
     try:
-        categories = Category.query.all()
-        result = [
-            {
-                "id": c.categories_id,
-                "name": c.name,
-                "description": c.description
-            }
-            for c in categories
-        ]
-        return jsonify(result), 200
+        return jsonify(_category_rows(Category.query.all())), 200
     except Exception as e:
         return jsonify({"error": f"Failed to fetch categories: {str(e)}"}), 500
 
@@ -1715,16 +1779,21 @@ def get_categories():
 # 🛠️ Platform Manager Endpoints
 # ---------------------------------
 
+def _category_usage_query():
+    # Every category with its request count in one LEFT JOIN ... GROUP BY
+    return db.session.query(Category, func.count(PinRequest.pin_requests_id)).outerjoin(
+        PinRequest, PinRequest.category_id == Category.categories_id
+    ).group_by(Category.categories_id)
+
+
 # Get all categories for PM dashboard
 @main.route('/api/pm/categories', methods=['GET'])
 @cross_origin()
+@cached_response('categories', 'pin_requests')
 def get_pm_categories():
     try:
-        categories = Category.query.all()
         result = []
-        for cat in categories:
-            # Count usage (how many requests use this category)
-            usage_count = PinRequest.query.filter_by(category_id=cat.categories_id).count()
+        for cat, usage_count in _category_usage_query().order_by(Category.categories_id).all():
             result.append({
                 "id": cat.categories_id,
                 "name": cat.name,
@@ -1755,6 +1824,7 @@ def create_pm_category():
             description=data.get('description', '')
         )
         db.session.add(new_category)
+        bump_generations('categories')
         db.session.commit()
         
         return jsonify({
@@ -1787,9 +1857,10 @@ def update_pm_category(cat_id):
         if 'description' in data:
             category.description = data['description']
         
+        bump_generations('categories')
         db.session.commit()
         
-        usage_count = PinRequest.query.filter_by(category_id=category.categories_id).count()
+        _, usage_count = _category_usage_query().filter(Category.categories_id == cat_id).one()
         return jsonify({
             "id": category.categories_id,
             "name": category.name,
@@ -1814,15 +1885,20 @@ def delete_pm_category(cat_id):
         if not category:
             return jsonify({"error": "Category not found"}), 404
         
-        # Check if category is in use
-        usage_count = PinRequest.query.filter_by(category_id=cat_id).count()
-        if usage_count > 0:
-            return jsonify({"error": f"Cannot delete category: it is used by {usage_count} request(s)"}), 400
+        # Check if category is in use (EXISTS stops at the first matching request)
+        in_use = db.session.query(exists().where(PinRequest.category_id == cat_id)).scalar()
+        if in_use:
+            return jsonify({"error": "Cannot delete category: it is used by existing requests"}), 400
         
         db.session.delete(category)
+        bump_generations('categories')
         db.session.commit()
         
         return jsonify({"message": "Category deleted successfully"}), 200
+    except IntegrityError:
+        # A request was assigned this category concurrently; the FK rejects the delete
+        db.session.rollback()
+        return jsonify({"error": "Cannot delete category: it is used by existing requests"}), 400
     except Exception as e:
         db.session.rollback()
         print(f"Error in delete_pm_category: {str(e)}")
@@ -1831,75 +1907,55 @@ def delete_pm_category(cat_id):
         return jsonify({"error": f"Failed to delete category: {str(e)}"}), 500
 
 
+# PM payload keys are camelCase by default
+PM_REQUEST_FIELDS = [
+    "id", "title", "description", "category", "status", "urgency", "urgent", "assigned_to",
+    "requester_name", "location", "preferred_time", "special_requirements", "created_at", "completed_at",
+]
+
+
 # Get all requests for PM dashboard
 @main.route('/api/pm/requests', methods=['GET'])
 @cross_origin()
+@conditional_response(*LISTING_TABLES)
 def get_pm_requests():
     try:
-        # Get all requests including completed ones
-        requests = PinRequest.query.all()
-        result = []
-        for req in requests:
-            # Safely get preferred_time and special_requirements
-            preferred_time = None
-            special_requirements = None
-            try:
-                sql_result = db.session.execute(
-                    text("SELECT preferred_time, special_requirements FROM pin_requests WHERE pin_requests_id = :id"),
-                    {"id": req.pin_requests_id}
-                ).first()
-                if sql_result:
-                    preferred_time = sql_result[0] if sql_result[0] else None
-                    special_requirements = sql_result[1] if sql_result[1] else None
-            except (OperationalError, ProgrammingError):
-                pass
-            except Exception:
-                pass
-            
-            # Get category name
-            category_name = None
-            try:
-                category_name = req.category.name if req.category else None
-            except Exception:
-                db.session.rollback()
-                category_name = None
-            
-            # Get requester name
-            requester_name = None
-            try:
-                requester_name = req.pin_user.name if req.pin_user else None
-            except Exception:
-                db.session.rollback()
-                requester_name = None
-            
-            # Get assigned CSR (from match_history - look for any match status, prioritize completed/pending)
-            assigned_to = None
+        try:
+            fields = RequestFields.from_args(request.args, PM_REQUEST_FIELDS, default_style='camel', aliases=(),
+                                             getters={"category": lambda req: req.category.name if req.category else "Uncategorized"})
+            page = parse_page_args(request.args, REQUEST_SORT_KEYS, "created_at") if wants_page(request.args) else None
+        except (PaginationError, FieldSelectionError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Get all requests including completed ones (one keyset page when ?limit/?cursor is given)
+        if page:
+            query = PinRequest.query.options(*fields.load_options(page["column"]))
+            requests, next_cursor = keyset_page(query, page, PinRequest.pin_requests_id)
+        else:
+            requests = PinRequest.query.options(*fields.load_options()).all()
+
+        # Most recent match (any status) per request, with its CSR, in one query
+        latest_matches = {}
+        request_ids = [req.pin_requests_id for req in requests]
+        if request_ids and fields.wants("assigned_to"):
             try:
-                # First try to find a match (any status), order by matched_at desc to get most recent
-                match = MatchHistory.query.filter_by(request_id=req.pin_requests_id).order_by(MatchHistory.matched_at.desc()).first()
-                if match and match.csr_match:
-                    assigned_to = match.csr_match.name
+                matches = MatchHistory.query.options(joinedload(MatchHistory.csr)).filter(
+                    MatchHistory.request_id.in_(request_ids)
+                ).distinct(MatchHistory.request_id).order_by(
+                    MatchHistory.request_id, MatchHistory.matched_at.desc()
+                ).all()
+                for m in matches:
+                    latest_matches[m.request_id] = m
             except Exception:
                 db.session.rollback()
-                assigned_to = None
-            
-            result.append({
-                "id": req.pin_requests_id,
-                "title": req.title,
-                "description": req.description,
-                "category": category_name or "Uncategorized",
-                "status": req.status,
-                "urgency": req.urgency,
-                "urgent": req.urgency == 'high',
-                "assignedTo": assigned_to,
-                "requesterName": requester_name,
-                "location": req.location,
-                "preferredTime": preferred_time,
-                "specialRequirements": special_requirements,
-                "createdAt": req.created_at.isoformat() if req.created_at else None,
-                "completedAt": req.completed_at.isoformat() if req.completed_at else None
-            })
+
+        result = []
+        for req in requests:
+            match = latest_matches.get(req.pin_requests_id)
+            result.append(fields.render(req, assigned_to=match.csr.name if match and match.csr else None))
         
+        if page:
+            return jsonify(page_response(result, page, next_cursor, 'pin_requests')), 200
         return jsonify(result), 200
     except Exception as e:
         print(f"Error in get_pm_requests: {str(e)}")
@@ -1909,6 +1965,42 @@ def get_pm_requests():
         return jsonify({"error": f"Failed to fetch requests: {str(e)}"}), 500
 
 
+# Bulk download for PMs, streamed rather than built in memory
+@main.route('/api/pm/export/<dataset>', methods=['GET'])
+@cross_origin()
+def export_pm_dataset(dataset):
+    """Stream requests (with category, requester, assigned CSR and latest feedback), matches or feedback.
+
+    ?format=csv|ndjson (default csv); ?from= (inclusive) and ?to= (exclusive)
+    filter on created_at, matched_at or submitted_at; ?status= on the request
+    or match status.
+    """
+    try:
+        fmt = request.args.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        try:
+            start = _parse_date_arg(request.args, 'from')
+            end = _parse_date_arg(request.args, 'to')
+            statement = export_statement(dataset, start, end, request.args.get('status'))
+        except (PaginationError, ExportError) as e:
+            return jsonify({"error": str(e)}), 400
+        engine = db.engine
+    except Exception as e:
+        print(f"Error in export_pm_dataset: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to start export: {str(e)}"}), 500
+
+    # The export reads on a connection of its own; give the session's back now
+    db.session.close()
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    response = Response(stream_export(engine, statement, fmt), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
 # Update request status (for PM)
 @main.route('/api/pm/requests/<int:req_id>/status', methods=['POST'])
 @cross_origin()
@@ -1928,6 +2020,11 @@ def update_pm_request_status(req_id):
         if status == 'completed' and not req.completed_at:
             req.completed_at = datetime.utcnow()
         
+        bump_generations('pin_requests')
+        # CSRs too: the request may have moved into or out of the open list
+        publish('request.status', req, [
+            role_channel('csr_rep'), role_channel('platform_manager'), user_channel(req.user_id),
+        ])
         db.session.commit()
         
         return jsonify({"message": f"Request status updated to {status}"}), 200
@@ -1939,16 +2036,20 @@ def update_pm_request_status(req_id):
         return jsonify({"error": f"Failed to update request status: {str(e)}"}), 500
 
 
+def _analytics_cache_expiry(now):
+    # Writes bump the pin_requests generation; the date buckets roll over at UTC midnight
+    return datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+
+
 # Get analytics data for PM dashboard
 @main.route('/api/pm/analytics', methods=['GET'])
 @cross_origin()
+@cached_response('pin_requests', 'daily_request_stats', expires=_analytics_cache_expiry)
 def get_pm_analytics():
     try:
         # Get date ranges
         now = datetime.utcnow()
         today = now.date()
-        today_start = datetime.combine(today, datetime.min.time())
-        today_end = datetime.combine(today, datetime.max.time())
         
         # Calculate week start (this calendar week - last 7 days, but ensure it's within current month)
         # We'll use the start of current month as the minimum to ensure monthly >= weekly
@@ -1956,52 +2057,23 @@ def get_pm_analytics():
         month_start = today.replace(day=1)
         # Use the later of (week_start_raw) or (month_start) to ensure weekly is within current month
         week_start = max(week_start_raw, month_start)
-        week_start_dt = datetime.combine(week_start, datetime.min.time())
         
-        # Calculate month start (first day of current month)
-        month_start_dt = datetime.combine(month_start, datetime.min.time())
-        
-        # Daily analytics (today only)
-        daily_created = PinRequest.query.filter(
-            PinRequest.created_at >= today_start,
-            PinRequest.created_at <= today_end
-        ).count()
-        daily_closed = PinRequest.query.filter(
-            PinRequest.completed_at >= today_start,
-            PinRequest.completed_at <= today_end,
-            PinRequest.status == 'completed'
-        ).count()
-        
-        # Weekly analytics (last 7 days, but only within current month to ensure monthly >= weekly)
-        # Use today_end to ensure we capture all requests created today (consistent with daily)
-        weekly_created = PinRequest.query.filter(
-            PinRequest.created_at >= week_start_dt,
-            PinRequest.created_at <= today_end
-        ).count()
-        weekly_closed = PinRequest.query.filter(
-            PinRequest.completed_at >= week_start_dt,
-            PinRequest.completed_at <= today_end,
-            PinRequest.status == 'completed'
-        ).count()
-        
-        # Monthly analytics (this month from first day to today)
-        # Use today_end to ensure we capture all requests created today (consistent with daily)
-        monthly_created = PinRequest.query.filter(
-            PinRequest.created_at >= month_start_dt,
-            PinRequest.created_at <= today_end
-        ).count()
-        monthly_closed = PinRequest.query.filter(
-            PinRequest.completed_at >= month_start_dt,
-            PinRequest.completed_at <= today_end,
-            PinRequest.status == 'completed'
-        ).count()
+        # Read from the daily rollup, so the cost follows the days in the month, not the requests
+        counts = defaultdict(int)
+        for day, transition, total in daily_request_counts(month_start, today):
+            for window, start in (("daily", today), ("weekly", week_start), ("monthly", month_start)):
+                if day >= start:
+                    counts[window, transition] += total
+        daily_created, daily_closed = counts["daily", "created"], counts["daily", "completed"]
+        weekly_created, weekly_closed = counts["weekly", "created"], counts["weekly", "completed"]
+        monthly_created, monthly_closed = counts["monthly", "created"], counts["monthly", "completed"]
         
         # Format date ranges for display
         daily_range = f"{today.strftime('%b %d')}"
         weekly_range = f"{week_start.strftime('%b %d')} - {today.strftime('%b %d')}"
         monthly_range = f"{month_start.strftime('%b %d')} - {today.strftime('%b %d')}"
         
-        return jsonify({
+        payload = {
             "daily": {
                 "created": daily_created,
                 "closed": daily_closed,
@@ -2017,7 +2089,8 @@ def get_pm_analytics():
                 "closed": monthly_closed,
                 "dateRange": monthly_range
             }
-        }), 200
+        }
+        return jsonify(payload), 200
     except Exception as e:
         print(f"Error in get_pm_analytics: {str(e)}")
         db.session.rollback()
@@ -2026,6 +2099,10 @@ def get_pm_analytics():
         return jsonify({"error": f"Failed to fetch analytics: {str(e)}"}), 500
 
 
+# Analytics type -> daily_request_stats transition
+ANALYTICS_TRANSITIONS = {"created": "created", "closed": "completed"}
+
+
 # Get detailed analytics requests for tooltips
 @main.route('/api/pm/analytics/<period>/<type>', methods=['GET'])
 @cross_origin()
@@ -2033,7 +2110,8 @@ def get_analytics_requests(period, type):
     """
     period: 'daily', 'weekly', 'monthly'
     type: 'created' or 'closed'
-    Returns list of requests for hover tooltip
+    Returns list of requests for hover tooltip, or with ?group_by=day|category|urgency
+    their counts from the daily rollup
     """
     try:
         now = datetime.utcnow()
@@ -2060,15 +2138,43 @@ def get_analytics_requests(period, type):
             end_date = today_end
         else:
             return jsonify({"error": "Invalid period"}), 400
+        if type not in ANALYTICS_TRANSITIONS:
+            return jsonify({"error": "Invalid type"}), 400
+
+        group_by = request.args.get('group_by')
+        if group_by:
+            if group_by not in BREAKDOWNS:
+                return jsonify({"error": f"group_by must be one of: {', '.join(BREAKDOWNS)}"}), 400
+            counts = request_breakdown(start_date.date(), end_date.date(), ANALYTICS_TRANSITIONS[type], group_by)
+            if group_by == 'category':
+                names = dict(db.session.query(Category.categories_id, Category.name).all())
+                return jsonify([
+                    {"category": names.get(category_id, "Uncategorized"), "count": count}
+                    for category_id, count in counts.items()
+                ]), 200
+            return jsonify([{group_by: key or None, "count": count} for key, count in counts.items()]), 200
         
+        try:
+            fields = RequestFields.from_args(request.args, [
+                "id", "title", "description", "category", "status", "urgency", "requester",
+                "created_at", "completed_at",
+            ], aliases=(), getters={
+                "description": lambda req: req.description or "",
+                "category": lambda req: req.category.name if req.category else "Uncategorized",
+                "requester": lambda req: req.user.name if req.user else "Unknown",
+            })
+        except FieldSelectionError as e:
+            return jsonify({"error": str(e)}), 400
+
         # Query requests based on type
+        base_query = PinRequest.query.options(*fields.load_options())
         if type == 'created':
-            requests = PinRequest.query.filter(
+            requests = base_query.filter(
                 PinRequest.created_at >= start_date,
                 PinRequest.created_at <= end_date
             ).all()
         elif type == 'closed':
-            requests = PinRequest.query.filter(
+            requests = base_query.filter(
                 PinRequest.completed_at >= start_date,
                 PinRequest.completed_at <= end_date,
                 PinRequest.status == 'completed'
@@ -2077,35 +2183,7 @@ def get_analytics_requests(period, type):
             return jsonify({"error": "Invalid type"}), 400
         
         # Format response
-        result = []
-        for req in requests:
-            # Safely get category name
-            category_name = None
-            try:
-                category_name = req.category.name if req.category else None
-            except Exception:
-                db.session.rollback()
-                category_name = None
-            
-            # Safely get requester name
-            requester_name = None
-            try:
-                requester_name = req.pin_user.name if req.pin_user else None
-            except Exception:
-                db.session.rollback()
-                requester_name = None
-            
-            result.append({
-                "id": req.pin_requests_id,
-                "title": req.title,
-                "description": req.description or "",
-                "category": category_name or "Uncategorized",
-                "status": req.status,
-                "urgency": req.urgency,
-                "requester": requester_name or "Unknown",
-                "created_at": req.created_at.isoformat() if req.created_at else None,
-                "completed_at": req.completed_at.isoformat() if req.completed_at else None
-            })
+        result = [fields.render(req) for req in requests]
         
         return jsonify(result), 200
     except Exception as e:
@@ -2115,21 +2193,126 @@ def get_analytics_requests(period, type):
         traceback.print_exc()
         return jsonify({"error": f"Failed to fetch analytics requests: {str(e)}"}), 500
 
+TIMESERIES_DEFAULT_DAYS = 30
+
+
+# Trend lines for the PM dashboard
+@main.route('/api/pm/analytics/timeseries', methods=['GET'])
+@cross_origin()
+@cached_response('pin_requests', 'match_history', expires=_analytics_cache_expiry)
+def get_analytics_timeseries():
+    """Created, matched and completed counts per bucket over any window, in one query.
+
+    ?from= (inclusive) and ?to= (exclusive) are ISO dates or datetimes, UTC
+    unless they carry an offset; by default the 30 days up to the end of
+    today. ?bucket=hour|day|week|month (default day). ?group_by=category|urgency
+    splits every bucket by group. Buckets without events are included.
+    """
+    try:
+        bucket = request.args.get('bucket', 'day')
+        group_by = request.args.get('group_by') or None
+        if bucket not in BUCKETS:
+            return jsonify({"error": f"bucket must be one of: {', '.join(BUCKETS)}"}), 400
+        if group_by and group_by not in TIMESERIES_GROUPS:
+            return jsonify({"error": f"group_by must be one of: {', '.join(TIMESERIES_GROUPS)}"}), 400
+        try:
+            end = _parse_date_arg(request.args, 'to')
+            start = _parse_date_arg(request.args, 'from')
+        except PaginationError as e:
+            return jsonify({"error": str(e)}), 400
+        end = end or datetime.combine(datetime.utcnow().date() + timedelta(days=1), datetime.min.time())
+        start = start or end - timedelta(days=TIMESERIES_DEFAULT_DAYS)
+        if start >= end:
+            return jsonify({"error": "from must be before to"}), 400
+        if bucket_count(start, end, bucket) > MAX_BUCKETS:
+            return jsonify({"error": f"More than {MAX_BUCKETS} buckets; use a larger bucket or a shorter range"}), 400
+
+        names = {}
+        if group_by == 'category':
+            names = dict(db.session.query(Category.categories_id, Category.name).all())
+        series = []
+        for bucket_start, key, created, matched, completed in request_timeseries(start, end, bucket, group_by):
+            if not series or series[-1]["start"] != bucket_start:
+                series.append({"start": bucket_start, "created": 0, "matched": 0, "completed": 0})
+                if group_by:
+                    series[-1]["groups"] = []
+            point = series[-1]
+            point["created"] += created
+            point["matched"] += matched
+            point["completed"] += completed
+            if group_by and key is not None:
+                label = names.get(key, "Uncategorized") if group_by == 'category' else (key or None)
+                point["groups"].append({group_by: label, "created": created, "matched": matched, "completed": completed})
+
+        return jsonify({"from": start, "to": end, "bucket": bucket, "group_by": group_by, "series": series}), 200
+    except Exception as e:
+        print(f"Error in get_analytics_timeseries: {str(e)}")
+        db.session.rollback()
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to fetch analytics time series: {str(e)}"}), 500
+
+
 @main.route('/api/requests/<int:req_id>/view', methods=['POST'])
 @cross_origin()
 def increment_request_view(req_id):
+    # Buffered in-process and flushed in batches to request_view_counts;
+    # no database round trip (or pin_requests row lock) per card view
+    view_buffer.record(req_id)
+    return jsonify({"message": "view recorded"}), 200
+
+
+# ---------------------------------
+# 📡 Request lifecycle events (Server-Sent Events)
+# ---------------------------------
+@main.route('/api/events', methods=['GET'])
+@cross_origin()
+@no_compression
+def stream_request_events():
+    """Push channel for the caller's role and user.
+
+    Channels come from the session, or from ?role= / ?user_id= like the other
+    dashboard endpoints. Reconnects replay what was missed after
+    Last-Event-ID (or ?last_event_id=, which EventSource URLs can carry).
+    """
+    user = session.get('user') or {}
+    role = normalize_role(user.get('role') or request.args.get('role'))
+    user_id = user.get('users_id') or request.args.get('user_id', type=int)
+    if not role and not user_id:
+        return jsonify({"error": "role or user_id is required"}), 400
+    channels = []
+    if role:
+        channels.append(role_channel(role))
+    if user_id:
+        channels.append(user_channel(user_id))
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
     try:
-        # Use raw SQL to avoid ORM cache staleness
-        # Check if view_count column exists first
-        inspector = inspect(db.engine)
-        columns = [col['name'] for col in inspector.get_columns('pin_requests')]
-        
-        if 'view_count' in columns:
-            with db.engine.begin() as conn:
-                conn.execute(text("UPDATE pin_requests SET view_count = COALESCE(view_count,0) + 1 WHERE pin_requests_id = :id"), {"id": req_id})
-        # If column doesn't exist, just return success (view count is optional)
-        return jsonify({"message": "view recorded"}), 200
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID must be an integer"}), 400
+
+    sub = event_hub.subscribe(channels)
+    if sub is None:
+        response = jsonify({"error": "Too many event streams on this worker, retry shortly"})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    try:
+        if last_event_id is None:
+            replay, start_id = [], latest_event_id()
+        else:
+            replay, start_id = backlog(channels, last_event_id), None
     except Exception as e:
-        # Don't fail the request if view count update fails - it's not critical
-        print(f"Warning: Could not increment view count for request {req_id}: {str(e)}")
-        return jsonify({"message": "view recorded"}), 200
+        event_hub.unsubscribe(sub)
+        db.session.rollback()
+        print(f"Error in stream_request_events: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to open event stream: {str(e)}"}), 500
+
+    # The stream itself never touches the database; give the connection back now
+    db.session.close()
+    response = Response(stream(event_hub, sub, replay, start_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,47 @@
+import threading
+
+from sqlalchemy import inspect
+
+
+class SchemaRegistry:
+    """Process-wide snapshot of which tables and columns exist.
+
+    Built once per worker (create_app) and refreshed explicitly after
+    migrations or runtime DDL, so request handlers can ask "is the feedback
+    table there?" without running catalog queries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns = None  # {table_name: frozenset(column names)}
+
+    @property
+    def loaded(self):
+        return self._columns is not None
+
+    def refresh(self, bind=None):
+        if bind is None:
+            from app.database import db
+            bind = db.engine
+        inspector = inspect(bind)
+        columns = {
+            table: frozenset(col['name'] for col in inspector.get_columns(table))
+            for table in inspector.get_table_names()
+        }
+        with self._lock:
+            self._columns = columns
+
+    def _snapshot(self):
+        if self._columns is None:
+            # Startup could not reach the database; build lazily on first use
+            self.refresh()
+        return self._columns
+
+    def has_table(self, table):
+        return table in self._snapshot()
+
+    def has_column(self, table, column):
+        return column in self._snapshot().get(table, ())
+
+
+schema_registry = SchemaRegistry()
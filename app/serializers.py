@@ -0,0 +1,118 @@
+import re
+
+from sqlalchemy.orm import joinedload, load_only
+
+from app.models import PinRequest
+
+STYLES = ('camel', 'snake')
+
+# Keys the dashboards historically received twice, as snake_case and camelCase
+LEGACY_ALIASES = ('preferred_time', 'special_requirements')
+
+
+class FieldSelectionError(ValueError):
+    """Raised for bad ?fields= / ?style= arguments; routes turn it into a 400."""
+
+
+def camelize(name):
+    head, *rest = name.split('_')
+    return head + ''.join(part.title() for part in rest)
+
+
+def snakeify(name):
+    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+
+
+# Public field name -> (getter, pin_requests columns it needs)
+REQUEST_FIELDS = {
+    "id": (lambda req: req.pin_requests_id, ()),
+    "request_id": (lambda req: req.pin_requests_id, ()),
+    "title": (lambda req: req.title, (PinRequest.title,)),
+    "description": (lambda req: req.description, (PinRequest.description,)),
+    "status": (lambda req: req.status, (PinRequest.status,)),
+    "urgency": (lambda req: req.urgency, (PinRequest.urgency,)),
+    "urgent": (lambda req: req.urgency == 'high', (PinRequest.urgency,)),
+    "location": (lambda req: req.location, (PinRequest.location,)),
+    "latitude": (lambda req: req.latitude, (PinRequest.latitude,)),
+    "longitude": (lambda req: req.longitude, (PinRequest.longitude,)),
+    "user_id": (lambda req: req.user_id, (PinRequest.user_id,)),
+    "category": (lambda req: req.category.name if req.category else None, (PinRequest.category_id,)),
+    "requester_name": (lambda req: req.user.name if req.user else None, (PinRequest.user_id,)),
+    "preferred_time": (lambda req: req.preferred_time or None, (PinRequest.preferred_time,)),
+    "special_requirements": (lambda req: req.special_requirements or None, (PinRequest.special_requirements,)),
+    "completion_note": (lambda req: req.completion_note, (PinRequest.completion_note,)),
+    # Datetimes are left to the JSON provider, which writes ISO 8601 natively
+    "created_at": (lambda req: req.created_at, (PinRequest.created_at,)),
+    "completed_at": (lambda req: req.completed_at, (PinRequest.completed_at,)),
+}
+
+# Fields that come from the category / requester relationships (backref names)
+RELATIONSHIP_FIELDS = {
+    "category": "category",
+    "requester_name": "user",
+    "requester": "user",
+}
+
+
+class RequestFields:
+    """One serializer for the request listings, driven by ?fields= and ?style=.
+
+    `fields` is the endpoint's full field list (its default payload). Fields
+    in REQUEST_FIELDS are read from the PinRequest; anything else (match ids,
+    feedback, counts) is passed per row to render(). Without ?style= the
+    endpoint's legacy key layout is kept: `default_style`, plus camelCase
+    copies of `aliases` when that is None.
+    """
+
+    def __init__(self, fields, selected=None, style=None, default_style=None,
+                 aliases=LEGACY_ALIASES, getters=None):
+        self.fields = list(fields)
+        self.selected = [f for f in self.fields if f in selected] if selected else self.fields
+        self.style = style or default_style
+        self.aliases = aliases if style is None else ()
+        self.getters = {name: getter for name, (getter, _) in REQUEST_FIELDS.items()}
+        self.getters.update(getters or {})
+
+    @classmethod
+    def from_args(cls, args, fields, **kwargs):
+        style = args.get('style')
+        if style is not None and style not in STYLES:
+            raise FieldSelectionError("style must be 'camel' or 'snake'")
+        selected = None
+        if args.get('fields'):
+            selected = {snakeify(name.strip()) for name in args['fields'].split(',') if name.strip()}
+            unknown = selected - set(fields)
+            if unknown:
+                raise FieldSelectionError(
+                    f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(fields)}"
+                )
+        return cls(fields, selected, style, **kwargs)
+
+    def wants(self, name):
+        return name in self.selected
+
+    def load_options(self, *columns, relationships=True):
+        """Loader options so only the selected pin_requests columns are fetched.
+
+        Extra `columns` (e.g. the keyset sort column) are loaded as well.
+        """
+        needed = {column for name in self.selected if name in REQUEST_FIELDS
+                  for column in REQUEST_FIELDS[name][1]}
+        needed.update(c for c in columns if c.class_ is PinRequest)
+        options = [load_only(PinRequest.pin_requests_id, *needed)]
+        if relationships:
+            options += [joinedload(getattr(PinRequest, rel)) for name, rel in RELATIONSHIP_FIELDS.items()
+                        if self.wants(name)]
+        return options
+
+    def render(self, req=None, **values):
+        out = {}
+        for name in self.selected:
+            value = values[name] if name in values else self.getters[name](req)
+            if self.style == 'camel':
+                out[camelize(name)] = value
+            else:
+                out[name] = value
+                if name in self.aliases:
+                    out[camelize(name)] = value
+        return out
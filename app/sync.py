@@ -0,0 +1,116 @@
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+
+import click
+from flask import request
+from flask.cli import with_appcontext
+from sqlalchemy import func, insert, literal, null, select, text
+
+from app.cache import current_generations
+from app.database import db
+from app.models import SyncTombstone, PinRequest, MatchHistory, CsrShortlist
+
+# A write whose transaction was still open when a cursor was issued carries an
+# updated_at just before it; every delta re-reads this window to pick it up
+OVERLAP = timedelta(seconds=float(os.getenv('SYNC_OVERLAP_SECONDS', 5)))
+# Tombstones are kept this long; clients with older cursors get a full listing
+TOMBSTONE_RETENTION = timedelta(days=int(os.getenv('SYNC_TOMBSTONE_DAYS', 30)))
+
+# Tables whose values are copied into listing rows (category and user names).
+# They have no updated_at, so a cursor remembers their generations instead.
+REFERENCE_TABLES = ('categories', 'users')
+
+NOW_SQL = text("SELECT now() AT TIME ZONE 'utc'")
+
+# Tombstone columns per table: row id, request id, owning PIN, CSR
+TOMBSTONE_COLUMNS = {
+    'pin_requests': (PinRequest.pin_requests_id, PinRequest.pin_requests_id, PinRequest.user_id, null()),
+    'match_history': (MatchHistory.match_history_id, MatchHistory.request_id, null(), MatchHistory.csr_id),
+    'csr_shortlist': (CsrShortlist.csr_shortlist_id, CsrShortlist.request_id, null(), CsrShortlist.csr_id),
+}
+
+
+class SyncCursorError(ValueError):
+    """Raised for a malformed ?since= cursor; routes turn it into a 400."""
+
+
+def _db_now():
+    # Transaction start on the database clock, shared by everything in this request
+    if 'app.sync_now' not in request.environ:
+        request.environ['app.sync_now'] = db.session.execute(NOW_SQL).scalar()
+    return request.environ['app.sync_now']
+
+
+def _reference_generations(tables):
+    # Read through the listing's own generation probe, so no extra query
+    generations = dict(zip(tables, current_generations(tables)))
+    return [generations.get(name, 0) for name in REFERENCE_TABLES]
+
+
+def issue_cursor(tables):
+    """Cursor for a listing over `tables` that was read in this request."""
+    since = _db_now() - OVERLAP
+    raw = json.dumps([since.isoformat(), _reference_generations(tables)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def read_cursor(token, tables):
+    """The time to sync from, or None when the client needs the full listing.
+
+    '0' asks for everything. So does a cursor older than the tombstone
+    retention, or one issued before a reference table changed.
+    """
+    if token == '0':
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        since, generations = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        since = datetime.fromisoformat(since)
+    except Exception:
+        raise SyncCursorError("Invalid sync cursor")
+    if since < _db_now() - TOMBSTONE_RETENTION:
+        return None
+    if generations != _reference_generations(tables):
+        return None
+    return since
+
+
+def record_deletes(model, *criteria):
+    """Tombstone the rows of `model` matching `criteria`.
+
+    Call it before deleting them, in the same transaction.
+    """
+    table_name = model.__tablename__
+    row_id, request_id, user_id, csr_id = TOMBSTONE_COLUMNS[table_name]
+    rows = select(literal(table_name), row_id, request_id, user_id, csr_id).where(*criteria)
+    db.session.execute(insert(SyncTombstone).from_select(
+        ['table_name', 'row_id', 'request_id', 'user_id', 'csr_id'], rows
+    ))
+
+
+def deleted_since(since, tables, **filters):
+    """Select the request ids of rows deleted from `tables` after `since`."""
+    query = select(SyncTombstone.request_id).where(
+        SyncTombstone.deleted_at > since, SyncTombstone.table_name.in_(tables)
+    )
+    for name, value in filters.items():
+        query = query.where(getattr(SyncTombstone, name) == value)
+    return query
+
+
+def prune_tombstones(retention=TOMBSTONE_RETENTION):
+    cutoff = func.timezone('utc', func.now()) - retention
+    deleted = SyncTombstone.query.filter(SyncTombstone.deleted_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+@click.command('prune-tombstones')
+@click.option('--days', type=int, default=TOMBSTONE_RETENTION.days, show_default=True,
+              help='Keep tombstones this many days.')
+@with_appcontext
+def prune_tombstones_command(days):
+    """Delete sync tombstones older than the retention window."""
+    click.echo(f"Pruned {prune_tombstones(timedelta(days=days))} tombstones")
@@ -0,0 +1,99 @@
+import atexit
+import os
+import threading
+from collections import Counter
+
+from sqlalchemy import text
+
+from app.cache import BUMP_SQL
+
+# Upsert the drained deltas in one statement. Joining pin_requests drops ids
+# that were deleted (or never existed) instead of failing the whole batch.
+FLUSH_SQL = """
+    INSERT INTO request_view_counts (request_id, view_count, updated_at)
+    SELECT v.request_id, v.views, now() AT TIME ZONE 'utc'
+    FROM (VALUES {values}) AS v(request_id, views)
+    JOIN pin_requests p ON p.pin_requests_id = v.request_id
+    ON CONFLICT (request_id) DO UPDATE
+    SET view_count = request_view_counts.view_count + EXCLUDED.view_count,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+class ViewCountBuffer:
+    """Write-behind buffer for request view counts.
+
+    record() only bumps an in-process counter; a background thread drains it
+    every `interval` seconds (or sooner once `max_pending` requests are
+    waiting) into request_view_counts, so pin_requests rows are never locked
+    by a card view. Whatever is still buffered is flushed at worker exit.
+    """
+
+    def __init__(self, interval=5.0, max_pending=1000):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._wake = threading.Event()
+        self._engine = None
+        self._thread = None
+
+    def init_app(self, app, engine):
+        self.interval = float(os.getenv('VIEW_FLUSH_INTERVAL', self.interval))
+        self._engine = engine
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='view-count-flush', daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def record(self, request_id, count=1):
+        with self._lock:
+            self._pending[request_id] += count
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def _drain(self):
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+        return batch
+
+    def _restore(self, batch):
+        with self._lock:
+            self._pending.update(batch)
+
+    def flush(self, engine=None):
+        """Write buffered counts with one statement; returns the number of requests flushed."""
+        engine = engine or self._engine
+        if engine is None:
+            return 0
+        batch = self._drain()
+        if not batch:
+            return 0
+
+        items = sorted(batch.items())
+        params = {}
+        values = []
+        for i, (request_id, views) in enumerate(items):
+            params[f"id{i}"] = request_id
+            params[f"n{i}"] = views
+            values.append(f"(CAST(:id{i} AS INTEGER), CAST(:n{i} AS INTEGER))")
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(FLUSH_SQL.format(values=", ".join(values))), params)
+                conn.execute(BUMP_SQL, {"names": ['request_view_counts']})
+        except Exception as e:
+            # Keep the counts for the next attempt rather than losing them
+            self._restore(batch)
+            print(f"Warning: Could not flush {len(items)} view counts: {str(e)}")
+            return 0
+        return len(items)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+
+view_buffer = ViewCountBuffer()
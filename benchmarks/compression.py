@@ -0,0 +1,56 @@
+"""Measure response compression on the largest list endpoints.
+
+Fetches each endpoint uncompressed, then times gzip and brotli with the
+settings used by app/compression.py and reports the resulting sizes.
+
+    DB_HOST=localhost python benchmarks/compression.py [--repeat 5] [path ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app import create_app  # noqa: E402
+from app.compression import _Compressor, brotli  # noqa: E402
+
+DEFAULT_PATHS = [
+    '/api/pm/requests?limit=500',
+    '/api/csr/completed?limit=500',
+    '/api/admin/users',
+    '/api/pm/requests',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    encodings = ['gzip'] + (['br'] if brotli is not None else [])
+
+    print(f"{'endpoint':<34} {'raw':>10}  " + "  ".join(f"{e:>22}" for e in encodings))
+    for path in args.paths:
+        response = client.get(path)
+        if response.status_code != 200:
+            print(f"{path:<34} HTTP {response.status_code}")
+            continue
+        body = response.data
+        cells = []
+        for encoding in encodings:
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                out = _Compressor(encoding).whole(body)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            cells.append(f"{len(out) / 1024:8.1f} KB {best * 1000:8.2f} ms")
+        print(f"{path:<34} {len(body) / 1024:7.1f} KB  " + "  ".join(f"{c:>22}" for c in cells))
+
+
+if __name__ == '__main__':
+    main()
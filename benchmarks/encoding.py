@@ -0,0 +1,89 @@
+"""Compare response encoders on the largest list endpoints.
+
+Runs each endpoint once through the app to capture the payload object that
+would be handed to jsonify(), then times encoding it with Flask's default
+JSON provider, the orjson-backed FastJSONProvider and MessagePack.
+
+    DB_HOST=localhost python benchmarks/encoding.py [--repeat 20] [path ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.json_provider import FastJSONProvider, _encode_default, msgpack, orjson  # noqa: E402
+
+DEFAULT_PATHS = [
+    '/api/pm/requests',
+    '/api/pm/requests?limit=500',
+    '/api/csr/completed?limit=500',
+    '/api/csr/accepted?limit=500',
+    '/api/admin/users',
+]
+
+
+def capture_payload(app, client, path):
+    captured = {}
+    original = app.json.response
+
+    def response(*args, **kwargs):
+        captured['obj'] = app.json._prepare_response_obj(args, kwargs)
+        return original(*args, **kwargs)
+
+    app.json.response = response
+    try:
+        status = client.get(path).status_code
+    finally:
+        app.json.response = original
+    return status, captured.get('obj')
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app()
+    client = app.test_client()
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+
+    # Same compact separators Flask's own response() uses outside debug mode
+    encoders = [('flask json', lambda obj: stdlib.dumps(obj, separators=(',', ':')).encode())]
+    if orjson is not None:
+        encoders.append(('orjson', lambda obj: fast._orjson_dumps(obj)))
+    if msgpack is not None:
+        encoders.append(('msgpack', lambda obj: msgpack.packb(obj, default=_encode_default, use_bin_type=True)))
+
+    print(f"{'endpoint':<34} {'items':>6}  " + "  ".join(f"{name:>20}" for name, _ in encoders))
+    for path in args.paths:
+        status, obj = capture_payload(app, client, path)
+        if status != 200 or obj is None:
+            print(f"{path:<34} HTTP {status}")
+            continue
+        items = obj.get('items', obj) if isinstance(obj, dict) else obj
+        cells = []
+        for _, encode in encoders:
+            seconds, body = best_of(lambda: encode(obj), args.repeat)
+            cells.append(f"{seconds * 1000:8.2f} ms {len(body) / 1024:7.1f} KB")
+        print(f"{path:<34} {len(items):>6}  " + "  ".join(f"{c:>20}" for c in cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -26,12 +26,19 @@ if [ -f /app/seed_db.sql ]; then
     
     # Initialize Flask migrations after data is loaded
     flask db init 2>/dev/null || echo "Migration folder already exists"
-    flask db stamp head 2>/dev/null || echo "Could not stamp database"
+    # The SQL dump matches the schema at add_feedback_fields; baseline it once,
+    # then apply any newer revisions on the csr branch
+    VERSION_COUNT=$(PGPASSWORD=${DB_PASS:-csrpass} psql -h ${DB_HOST:-db} -p ${DB_PORT:-5432} -U ${DB_USER:-csruser} -d ${DB_NAME:-csrdb} -tAc "SELECT COUNT(*) FROM alembic_version;" 2>/dev/null || echo "0")
+    if [ "$VERSION_COUNT" = "0" ]; then
+        flask db stamp add_feedback_fields 2>/dev/null || echo "Could not stamp database"
+    fi
+    flask db upgrade csr@head || echo "⚠️ Could not apply migrations"
 else
     echo "⚠️ seed_db.sql not found, using Flask migrations and Python seed script"
-    flask db upgrade || (flask db init && flask db migrate -m "Initial migration" && flask db upgrade)
+    flask db upgrade csr@head || (flask db init && flask db migrate -m "Initial migration" && flask db upgrade)
     python -m app.seed_data
 fi
 
 echo "🚀 Starting Flask application..."
-exec gunicorn -b 0.0.0.0:5000 "app:create_app()" --workers 4 --timeout 120 --keep-alive 2 --max-requests 1000
+# gthread: /api/events streams hold a thread each (capped by SSE_MAX_CONNECTIONS per worker)
+exec gunicorn -b 0.0.0.0:5000 "app:create_app()" --workers 4 --worker-class gthread --threads ${GUNICORN_THREADS:-32} --timeout 120 --keep-alive 2 --max-requests 1000
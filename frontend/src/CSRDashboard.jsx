@@ -101,39 +101,17 @@ const CSRDashboard = () => {
       setCurrentUser(user);
 
       // Use absolute backend URLs to avoid dev-server proxy confusion
-      const [
-        reqRes,
-        usersRes,
-        acceptedRes,
-        completedRes,
-        shortlistRes,
-        categoriesRes,
-      ] = await Promise.all([
-        axios.get('http://localhost:5000/api/help_requests/open').catch((e) => {
-          console.error('Error fetching open requests:', e.response?.data || e.message);
-          return { data: [] };
-        }),
-        axios.get('http://localhost:5000/users').catch((e) => {
-          console.error('Error fetching users:', e.response?.data || e.message);
-          return { data: [] };
-        }),
-        (csrId ? axios.get(`http://localhost:5000/api/csr/accepted/${csrId}`) : Promise.resolve({ data: [] })).catch((e) => {
-          console.error('Error fetching accepted requests:', e.response?.data || e.message);
-          return { data: [] };
-        }),
-        (csrId ? axios.get(`http://localhost:5000/api/csr/completed/${csrId}`) : Promise.resolve({ data: [] })).catch((e) => {
-          console.error('Error fetching completed requests:', e.response?.data || e.message);
-          return { data: [] };
-        }),
-        (csrId ? axios.get(`http://localhost:5000/api/csr/shortlist/${csrId}`) : Promise.resolve({ data: [] })).catch((e) => {
-          console.error('Error fetching shortlist:', e.response?.data || e.message);
-          return { data: [] };
-        }),
-        axios.get('http://localhost:5000/api/categories').catch((e) => {
-          console.error('Error fetching categories:', e.response?.data || e.message);
-          return { data: [] };
-        }),
-      ]);
+      // One call returns every section the dashboard needs
+      const dashboard = await axios.get(`http://localhost:5000/api/csr/dashboard/${csrId || 0}`).catch((e) => {
+        console.error('Error fetching CSR dashboard:', e.response?.data || e.message);
+        return { data: {} };
+      });
+      const reqRes = { data: dashboard.data?.open_requests ?? [] };
+      const usersRes = { data: dashboard.data?.users ?? [] };
+      const acceptedRes = { data: csrId ? (dashboard.data?.accepted ?? []) : [] };
+      const completedRes = { data: csrId ? (dashboard.data?.completed ?? []) : [] };
+      const shortlistRes = { data: csrId ? (dashboard.data?.shortlist ?? []) : [] };
+      const categoriesRes = { data: dashboard.data?.categories ?? [] };
 
       const requestsData = toArray(reqRes?.data).map(r => ({
         id: r.id ?? r.request_id,
@@ -271,6 +249,24 @@ const CSRDashboard = () => {
 
   useEffect(() => {fetchAll(); }, []);
 
+  // Refresh when the server pushes a request lifecycle event instead of polling
+  useEffect(() => {
+    const user = JSON.parse(localStorage.getItem('csr_user') || localStorage.getItem('user') || 'null');
+    if (!user?.users_id || typeof EventSource === 'undefined') return undefined;
+    const source = new EventSource(`http://localhost:5000/api/events?role=csr_rep&user_id=${user.users_id}`);
+    let timer = null;
+    const refresh = () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => fetchAll(), 300);
+    };
+    ['request.created', 'request.accepted', 'request.status', 'request.completed', 'match.status', 'reset']
+      .forEach((type) => source.addEventListener(type, refresh));
+    return () => {
+      clearTimeout(timer);
+      source.close();
+    };
+  }, []);
+
   const handleRefresh = async () => {
     setRefreshing(true);
     await fetchAll();
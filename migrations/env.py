@@ -106,6 +106,10 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+    # Migrations change the schema; rebuild this process's capability snapshot
+    from app.schema import schema_registry
+    schema_registry.refresh(connectable)
+
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,48 @@
+"""store canonical role values on users and index them
+
+Revision ID: 40eb16579394
+Revises: 780d35b39a72
+Create Date: 2026-10-18 10:02:17.440913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '40eb16579394'
+down_revision = '780d35b39a72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Backfill legacy labels ('CSR Rep', 'PM', 'Admin', ...) to canonical roles
+    op.execute("""
+        UPDATE users SET role = CASE lower(trim(role))
+            WHEN 'pin' THEN 'pin'
+            WHEN 'csr_rep' THEN 'csr_rep'
+            WHEN 'csr rep' THEN 'csr_rep'
+            WHEN 'csr' THEN 'csr_rep'
+            WHEN 'platform_manager' THEN 'platform_manager'
+            WHEN 'platform manager' THEN 'platform_manager'
+            WHEN 'pm' THEN 'platform_manager'
+            WHEN 'admin' THEN 'admin'
+        END
+        WHERE role NOT IN ('pin', 'csr_rep', 'platform_manager', 'admin')
+          AND lower(trim(role)) IN ('pin', 'csr_rep', 'csr rep', 'csr', 'platform_manager',
+                                    'platform manager', 'pm', 'admin')
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_role ON users (role)")
+    # NOT VALID enforces the check on every new write without failing the
+    # upgrade if an unrecognized legacy label is still present
+    op.execute("ALTER TABLE users DROP CONSTRAINT IF EXISTS ck_users_role")
+    op.execute(
+        "ALTER TABLE users ADD CONSTRAINT ck_users_role "
+        "CHECK (role IN ('pin', 'csr_rep', 'platform_manager', 'admin')) NOT VALID"
+    )
+
+
+def downgrade():
+    op.drop_constraint('ck_users_role', 'users', type_='check')
+    op.drop_index('ix_users_role', table_name='users')
@@ -0,0 +1,33 @@
+"""add preferred_time, special_requirements and view_count to pin_requests
+
+Revision ID: 780d35b39a72
+Revises: add_feedback_fields
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '780d35b39a72'
+down_revision = 'add_feedback_fields'
+# Label the live schema branch so `flask db upgrade csr@head` works even though
+# the orphaned 76f6510e131a root still exists in this folder.
+branch_labels = ('csr',)
+depends_on = None
+
+
+def upgrade():
+    # These columns used to be added at runtime by create_app(), so existing
+    # databases may already have them.
+    op.execute("ALTER TABLE pin_requests ADD COLUMN IF NOT EXISTS preferred_time VARCHAR(255)")
+    op.execute("ALTER TABLE pin_requests ADD COLUMN IF NOT EXISTS special_requirements TEXT")
+    op.execute("ALTER TABLE pin_requests ADD COLUMN IF NOT EXISTS view_count INTEGER DEFAULT 0")
+    op.execute("UPDATE pin_requests SET view_count = 0 WHERE view_count IS NULL")
+
+
+def downgrade():
+    op.drop_column('pin_requests', 'view_count')
+    op.drop_column('pin_requests', 'special_requirements')
+    op.drop_column('pin_requests', 'preferred_time')
@@ -0,0 +1,98 @@
+"""add indexes for the hot predicates in app/routes.py
+
+Revision ID: 97122861a5c9
+Revises: 40eb16579394
+Create Date: 2026-10-18 11:20:05.532190
+
+See INDEX_PLANS.md for the query plans before and after this revision.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '97122861a5c9'
+down_revision = '40eb16579394'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_match_history_request_matched_at',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_history_request_matched_at "
+     "ON match_history (request_id, matched_at DESC)"),
+    ('ix_csr_shortlist_request_id',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_csr_shortlist_request_id "
+     "ON csr_shortlist (request_id)"),
+    ('ix_pin_requests_status_created_at',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_status_created_at "
+     "ON pin_requests (status, created_at)"),
+    ('ix_pin_requests_open_created_at',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_open_created_at "
+     "ON pin_requests (created_at) WHERE status = 'open'"),
+    ('ix_pin_requests_user_id',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_user_id "
+     "ON pin_requests (user_id)"),
+    ('ix_pin_requests_category_id',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_category_id "
+     "ON pin_requests (category_id)"),
+    ('ix_pin_requests_completed_at',
+     "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_completed_at "
+     "ON pin_requests (completed_at)"),
+    ('uq_match_history_csr_request',
+     "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_match_history_csr_request "
+     "ON match_history (csr_id, request_id)"),
+    ('uq_csr_shortlist_csr_request',
+     "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_csr_shortlist_csr_request "
+     "ON csr_shortlist (csr_id, request_id)"),
+]
+
+
+def upgrade():
+    # accept/shortlist actions already treat (csr_id, request_id) as unique;
+    # drop duplicates left over from double clicks before enforcing it.
+    # For matches keep the completed row if there is one, else the oldest.
+    op.execute("""
+        DELETE FROM match_history m
+        USING (
+            SELECT match_history_id,
+                   row_number() OVER (
+                       PARTITION BY csr_id, request_id
+                       ORDER BY coalesce(match_status = 'completed', false) DESC, match_history_id
+                   ) AS rn
+            FROM match_history
+        ) d
+        WHERE m.match_history_id = d.match_history_id AND d.rn > 1
+    """)
+    op.execute("""
+        DELETE FROM csr_shortlist s
+        USING (
+            SELECT csr_shortlist_id,
+                   row_number() OVER (PARTITION BY csr_id, request_id ORDER BY csr_shortlist_id) AS rn
+            FROM csr_shortlist
+        ) d
+        WHERE s.csr_shortlist_id = d.csr_shortlist_id AND d.rn > 1
+    """)
+
+    # CONCURRENTLY keeps the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for _, ddl in INDEXES:
+            op.execute(ddl)
+        # feedback is created by create_all() rather than a migration
+        if sa.inspect(op.get_bind()).has_table('feedback'):
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_feedback_request_id "
+                "ON feedback (request_id)"
+            )
+
+    op.execute("ANALYZE pin_requests")
+    op.execute("ANALYZE match_history")
+    op.execute("ANALYZE csr_shortlist")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_feedback_request_id")
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,36 @@
+"""add request_events for the SSE push channel
+
+Revision ID: a4b8e2d9c017
+Revises: f3c9a7d21b58
+Create Date: 2026-10-18 16:48:09.215733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4b8e2d9c017'
+down_revision = 'f3c9a7d21b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs create_all() before `flask db upgrade`, so the table may already exist
+    if not sa.inspect(op.get_bind()).has_table('request_events'):
+        op.create_table(
+            'request_events',
+            sa.Column('event_id', sa.BigInteger(), nullable=False),
+            sa.Column('event_type', sa.String(length=50), nullable=False),
+            sa.Column('channels', postgresql.ARRAY(sa.String(length=64)), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+            sa.PrimaryKeyConstraint('event_id')
+        )
+        op.create_index('ix_request_events_created_at', 'request_events', ['created_at'])
+
+
+def downgrade():
+    op.drop_table('request_events')
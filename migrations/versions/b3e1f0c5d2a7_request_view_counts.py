@@ -0,0 +1,46 @@
+"""move request view counts into request_view_counts
+
+Revision ID: b3e1f0c5d2a7
+Revises: 97122861a5c9
+Create Date: 2026-10-18 12:41:37.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e1f0c5d2a7'
+down_revision = '97122861a5c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs create_all() before `flask db upgrade`, so the table may already exist
+    if not sa.inspect(op.get_bind()).has_table('request_view_counts'):
+        op.create_table(
+            'request_view_counts',
+            sa.Column('request_id', sa.Integer(), nullable=False),
+            sa.Column('view_count', sa.Integer(), server_default='0', nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['request_id'], ['pin_requests.pin_requests_id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('request_id')
+        )
+    # Carry over the counts written to pin_requests.view_count so far
+    op.execute("""
+        INSERT INTO request_view_counts (request_id, view_count, updated_at)
+        SELECT pin_requests_id, view_count, now() AT TIME ZONE 'utc'
+        FROM pin_requests
+        WHERE view_count > 0
+        ON CONFLICT (request_id) DO NOTHING
+    """)
+
+
+def downgrade():
+    op.execute("""
+        UPDATE pin_requests p SET view_count = c.view_count
+        FROM request_view_counts c
+        WHERE c.request_id = p.pin_requests_id
+    """)
+    op.drop_table('request_view_counts')
@@ -0,0 +1,44 @@
+"""add a generated search_vector with a GIN index to pin_requests
+
+Revision ID: b7d3f1a8e925
+Revises: a4b8e2d9c017
+Create Date: 2026-10-18 17:55:31.440192
+
+Adding a stored generated column rewrites pin_requests under an exclusive
+lock (a few seconds for 200k rows); the GIN index is then built concurrently.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3f1a8e925'
+down_revision = 'a4b8e2d9c017'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'C')"
+)
+
+
+def upgrade():
+    op.execute(f"""
+        ALTER TABLE pin_requests ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED
+    """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_search_vector "
+            "ON pin_requests USING gin (search_vector)"
+        )
+    op.execute("ANALYZE pin_requests")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_pin_requests_search_vector")
+    op.execute("ALTER TABLE pin_requests DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,43 @@
+"""add gazetteer coordinates and a GiST point index to pin_requests
+
+Revision ID: c5e1a9d47f26
+Revises: b7d3f1a8e925
+Create Date: 2026-10-18 19:20:08.615302
+
+Existing requests get coordinates from `flask geocode-requests`; new and
+edited ones get them when their location is set.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e1a9d47f26'
+down_revision = 'b7d3f1a8e925'
+branch_labels = None
+depends_on = None
+
+
+GEO_POINT = "point(longitude * cos(radians(1.35)), latitude)"
+
+
+def upgrade():
+    op.execute("ALTER TABLE pin_requests ADD COLUMN IF NOT EXISTS latitude double precision")
+    op.execute("ALTER TABLE pin_requests ADD COLUMN IF NOT EXISTS longitude double precision")
+    op.execute(f"""
+        ALTER TABLE pin_requests ADD COLUMN IF NOT EXISTS geo_point point
+        GENERATED ALWAYS AS ({GEO_POINT}) STORED
+    """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_open_geo_point "
+            "ON pin_requests USING gist (geo_point) WHERE status = 'open'"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_pin_requests_open_geo_point")
+    op.execute("ALTER TABLE pin_requests DROP COLUMN IF EXISTS geo_point")
+    op.execute("ALTER TABLE pin_requests DROP COLUMN IF EXISTS longitude")
+    op.execute("ALTER TABLE pin_requests DROP COLUMN IF EXISTS latitude")
@@ -0,0 +1,31 @@
+"""add cache_generations for response cache invalidation
+
+Revision ID: d41c7a9e6b20
+Revises: b3e1f0c5d2a7
+Create Date: 2026-10-18 13:27:52.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41c7a9e6b20'
+down_revision = 'b3e1f0c5d2a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_app() runs create_all() before `flask db upgrade`, so the table may already exist
+    if not sa.inspect(op.get_bind()).has_table('cache_generations'):
+        op.create_table(
+            'cache_generations',
+            sa.Column('table_name', sa.String(length=64), nullable=False),
+            sa.Column('generation', sa.BigInteger(), server_default='0', nullable=False),
+            sa.PrimaryKeyConstraint('table_name')
+        )
+
+
+def downgrade():
+    op.drop_table('cache_generations')
@@ -0,0 +1,106 @@
+"""add the daily_request_stats rollup, its triggers and a backfill
+
+Revision ID: d9f4b2c6e813
+Revises: c5e1a9d47f26
+Create Date: 2026-10-18 20:05:44.380915
+
+Row triggers on pin_requests take back a request's old contribution and
+add its new one, so every write path (ORM, bulk and raw SQL) keeps the
+rollup exact. `flask backfill-daily-stats` recounts it from scratch.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9f4b2c6e813'
+down_revision = 'c5e1a9d47f26'
+branch_labels = None
+depends_on = None
+
+
+# The counting rules of app.analytics.REBUILD_SQL, applied to one row's old and new values
+ROLLUP_FUNCTION = """
+CREATE OR REPLACE FUNCTION pin_requests_daily_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO daily_request_stats AS s (day, transition, category_id, urgency, request_count)
+    SELECT day, transition, category_id, urgency, sum(delta)
+    FROM (
+        SELECT OLD.created_at::date AS day, 'created' AS transition,
+               coalesce(OLD.category_id, 0) AS category_id, coalesce(OLD.urgency, '') AS urgency, -1 AS delta
+        WHERE TG_OP <> 'INSERT' AND OLD.created_at IS NOT NULL
+        UNION ALL
+        SELECT OLD.completed_at::date, 'completed', coalesce(OLD.category_id, 0), coalesce(OLD.urgency, ''), -1
+        WHERE TG_OP <> 'INSERT' AND OLD.status = 'completed' AND OLD.completed_at IS NOT NULL
+        UNION ALL
+        SELECT NEW.created_at::date, 'created', coalesce(NEW.category_id, 0), coalesce(NEW.urgency, ''), 1
+        WHERE TG_OP <> 'DELETE' AND NEW.created_at IS NOT NULL
+        UNION ALL
+        SELECT NEW.completed_at::date, 'completed', coalesce(NEW.category_id, 0), coalesce(NEW.urgency, ''), 1
+        WHERE TG_OP <> 'DELETE' AND NEW.status = 'completed' AND NEW.completed_at IS NOT NULL
+    ) AS changes
+    GROUP BY day, transition, category_id, urgency
+    HAVING sum(delta) <> 0
+    ON CONFLICT (day, transition, category_id, urgency)
+    DO UPDATE SET request_count = s.request_count + EXCLUDED.request_count;
+    RETURN NULL;
+END
+$$
+"""
+
+COUNTED_COLUMNS = "created_at, completed_at, status, category_id, urgency"
+
+# app.analytics.REBUILD_SQL without its :since filter; that is the canonical
+# definition, and ROLLUP_FUNCTION above counts by the same rules
+REBUILD = """
+    INSERT INTO daily_request_stats (day, transition, category_id, urgency, request_count)
+    SELECT created_at::date, 'created', coalesce(category_id, 0), coalesce(urgency, ''), count(*)
+    FROM pin_requests
+    WHERE created_at IS NOT NULL
+    GROUP BY 1, 3, 4
+    UNION ALL
+    SELECT completed_at::date, 'completed', coalesce(category_id, 0), coalesce(urgency, ''), count(*)
+    FROM pin_requests
+    WHERE status = 'completed' AND completed_at IS NOT NULL
+    GROUP BY 1, 3, 4
+"""
+
+
+def upgrade():
+    # create_app() runs create_all() before `flask db upgrade`, so the table may already exist
+    if not sa.inspect(op.get_bind()).has_table('daily_request_stats'):
+        op.create_table(
+            'daily_request_stats',
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('transition', sa.String(length=20), nullable=False),
+            sa.Column('category_id', sa.Integer(), autoincrement=False, nullable=False),
+            sa.Column('urgency', sa.String(length=20), nullable=False),
+            sa.Column('request_count', sa.Integer(), server_default='0', nullable=False),
+            sa.PrimaryKeyConstraint('day', 'transition', 'category_id', 'urgency')
+        )
+    op.execute(ROLLUP_FUNCTION)
+    old = ", ".join(f"OLD.{c}" for c in COUNTED_COLUMNS.split(", "))
+    new = ", ".join(f"NEW.{c}" for c in COUNTED_COLUMNS.split(", "))
+    # Table lock: no write slips between installing the triggers and the backfill
+    op.execute("LOCK TABLE pin_requests IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER IF EXISTS pin_requests_daily_stats_write ON pin_requests")
+    op.execute("DROP TRIGGER IF EXISTS pin_requests_daily_stats_update ON pin_requests")
+    op.execute(
+        "CREATE TRIGGER pin_requests_daily_stats_write AFTER INSERT OR DELETE ON pin_requests "
+        "FOR EACH ROW EXECUTE FUNCTION pin_requests_daily_stats()"
+    )
+    op.execute(
+        f"CREATE TRIGGER pin_requests_daily_stats_update AFTER UPDATE OF {COUNTED_COLUMNS} ON pin_requests "
+        f"FOR EACH ROW WHEN (({old}) IS DISTINCT FROM ({new})) "
+        "EXECUTE FUNCTION pin_requests_daily_stats()"
+    )
+    op.execute("DELETE FROM daily_request_stats")
+    op.execute(REBUILD)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS pin_requests_daily_stats_update ON pin_requests")
+    op.execute("DROP TRIGGER IF EXISTS pin_requests_daily_stats_write ON pin_requests")
+    op.execute("DROP FUNCTION IF EXISTS pin_requests_daily_stats()")
+    op.drop_table('daily_request_stats')
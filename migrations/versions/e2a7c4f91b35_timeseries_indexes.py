@@ -0,0 +1,28 @@
+"""index created_at and matched_at for analytics time windows
+
+Revision ID: e2a7c4f91b35
+Revises: d9f4b2c6e813
+Create Date: 2026-10-18 20:48:12.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a7c4f91b35'
+down_revision = 'd9f4b2c6e813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_created_at ON pin_requests (created_at)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_match_history_matched_at ON match_history (matched_at)")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_match_history_matched_at")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_pin_requests_created_at")
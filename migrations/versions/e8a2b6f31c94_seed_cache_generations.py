@@ -0,0 +1,37 @@
+"""start cache generations from the clock for every tracked table
+
+Revision ID: e8a2b6f31c94
+Revises: d41c7a9e6b20
+Create Date: 2026-10-18 14:05:11.872630
+
+A freshly seeded database has no cache_generations rows, which would make
+every table read as generation 0 and give the same ETags as the last
+database that was seeded. Seeding the rows from the clock avoids that.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a2b6f31c94'
+down_revision = 'd41c7a9e6b20'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['pin_requests', 'match_history', 'csr_shortlist', 'feedback', 'categories', 'users',
+          'request_view_counts']
+
+
+def upgrade():
+    values = ", ".join(f"('{name}')" for name in TABLES)
+    op.execute(f"""
+        INSERT INTO cache_generations (table_name, generation)
+        SELECT name, (extract(epoch FROM clock_timestamp()) * 1000)::bigint
+        FROM (VALUES {values}) AS t(name)
+        ON CONFLICT (table_name) DO NOTHING
+    """)
+
+
+def downgrade():
+    pass
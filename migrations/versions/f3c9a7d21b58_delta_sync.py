@@ -0,0 +1,63 @@
+"""add updated_at and sync_tombstones for ?since= delta sync
+
+Revision ID: f3c9a7d21b58
+Revises: e8a2b6f31c94
+Create Date: 2026-10-18 15:32:47.604118
+
+Existing rows get the migration time as updated_at: no client holds a
+cursor from before this revision, so there is nothing to backfill.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3c9a7d21b58'
+down_revision = 'e8a2b6f31c94'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ['pin_requests', 'match_history', 'csr_shortlist', 'feedback']
+
+
+def upgrade():
+    bind = op.get_bind()
+    tables = [t for t in TABLES if sa.inspect(bind).has_table(t)]
+    for table in tables:
+        # now() is stable, so Postgres stores the default once instead of rewriting the table
+        op.execute(f"""
+            ALTER TABLE {table} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITHOUT TIME ZONE
+            NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+        """)
+
+    # create_app() runs create_all() before `flask db upgrade`, so the table may already exist
+    if not sa.inspect(bind).has_table('sync_tombstones'):
+        op.create_table(
+            'sync_tombstones',
+            sa.Column('tombstone_id', sa.BigInteger(), nullable=False),
+            sa.Column('table_name', sa.String(length=64), nullable=False),
+            sa.Column('row_id', sa.Integer(), nullable=False),
+            sa.Column('request_id', sa.Integer(), nullable=True),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('csr_id', sa.Integer(), nullable=True),
+            sa.Column('deleted_at', sa.DateTime(), server_default=sa.text("(now() AT TIME ZONE 'utc')"), nullable=False),
+            sa.PrimaryKeyConstraint('tombstone_id')
+        )
+        op.create_index('ix_sync_tombstones_deleted_at', 'sync_tombstones', ['deleted_at'])
+
+    # CONCURRENTLY keeps the tables writable while the indexes build
+    with op.get_context().autocommit_block():
+        for table in tables + ['request_view_counts']:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_updated_at ON {table} (updated_at)"
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in TABLES + ['request_view_counts']:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_updated_at")
+    op.drop_table('sync_tombstones')
+    for table in reversed(TABLES):
+        op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS updated_at")
@@ -0,0 +1,34 @@
+"""index pin_requests (created_at, pin_requests_id) for keyset pages
+
+Revision ID: f6b1d8e3a4c2
+Revises: e2a7c4f91b35
+Create Date: 2026-10-19 10:12:44.518203
+
+Keyset pages compare (created_at, pin_requests_id) row values; with both
+columns in the index a page is one index range scan, with no sort of ties.
+It replaces the created_at-only index, which served the same range scans.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b1d8e3a4c2'
+down_revision = 'e2a7c4f91b35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_created_at_id "
+            "ON pin_requests (created_at, pin_requests_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_pin_requests_created_at")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pin_requests_created_at ON pin_requests (created_at)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_pin_requests_created_at_id")
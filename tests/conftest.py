@@ -0,0 +1,18 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def db_app():
+    """The app on the development database; tests using it are skipped when Postgres is not reachable."""
+    for name, value in (('DB_HOST', 'localhost'), ('DB_PORT', '5432'), ('DB_USER', 'csruser'),
+                        ('DB_PASS', 'csrpass'), ('DB_NAME', 'csrdb'), ('SECRET_KEY', 'testing-secret')):
+        os.environ.setdefault(name, value)
+    try:
+        from app import create_app
+        return create_app()
+    except Exception as e:
+        if "connection" in str(e).lower() or "database" in str(e).lower():
+            pytest.skip(f"Database connection not available: {e}")
+        raise
@@ -0,0 +1,181 @@
+import importlib.util
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+
+def test_bucket_count_bounds_generate_series():
+    """The cap is checked before querying, so the estimate must never undercount."""
+    from app.analytics import bucket_count
+
+    start, end = datetime(2026, 1, 30, 12), datetime(2026, 3, 1)
+    assert bucket_count(start, end, 'month') >= 2  # Jan, Feb
+    assert bucket_count(start, end, 'day') >= 31
+    assert bucket_count(datetime(2026, 10, 1), datetime(2026, 10, 2), 'hour') >= 24
+    assert bucket_count(datetime(2026, 10, 1), datetime(2026, 10, 29), 'week') >= 5
+
+
+WINDOW = datetime(2031, 1, 1)  # after any real data, so only the fixture rows fall in it
+
+
+@pytest.fixture
+def window_requests(db_app):
+    """Two requests and a match in the first days of WINDOW, removed afterwards."""
+    from sqlalchemy import text
+    from app.cache import bump_generations
+    from app.database import db
+
+    with db_app.app_context():
+        pin = db.session.execute(text("SELECT users_id FROM users WHERE role = 'pin' LIMIT 1")).scalar()
+        csr = db.session.execute(text("SELECT users_id FROM users WHERE role = 'csr_rep' LIMIT 1")).scalar()
+        category = db.session.execute(text("SELECT min(categories_id) FROM categories")).scalar()
+        if pin is None or csr is None or category is None:
+            pytest.skip("No pin and csr_rep users and categories to test with")
+        insert = text("""
+            INSERT INTO pin_requests (user_id, category_id, title, status, urgency, created_at, completed_at)
+            VALUES (:user, :category, 'Analytics test', :status, :urgency, :created, :completed)
+            RETURNING pin_requests_id
+        """)
+        first = db.session.execute(insert, {"user": pin, "category": category, "status": 'open', "urgency": 'high',
+                                            "created": WINDOW.replace(hour=10), "completed": None}).scalar()
+        second = db.session.execute(insert, {"user": pin, "category": None, "status": 'completed', "urgency": 'low',
+                                             "created": WINDOW.replace(day=2, hour=23, minute=30),
+                                             "completed": WINDOW.replace(day=3, hour=1)}).scalar()
+        db.session.execute(text(
+            "INSERT INTO match_history (csr_id, request_id, matched_at, match_status) VALUES (:csr, :req, :at, 'completed')"
+        ), {"csr": csr, "req": second, "at": WINDOW.replace(day=3, minute=30)})
+        bump_generations('pin_requests', 'match_history')
+        db.session.commit()
+    try:
+        yield {"category": category, "ids": [first, second]}
+    finally:
+        with db_app.app_context():
+            ids = {"ids": [first, second]}
+            db.session.execute(text("DELETE FROM match_history WHERE request_id = ANY(:ids)"), ids)
+            db.session.execute(text("DELETE FROM pin_requests WHERE pin_requests_id = ANY(:ids)"), ids)
+            bump_generations('pin_requests', 'match_history')
+            db.session.commit()
+
+
+def test_request_timeseries_fills_every_bucket(db_app, window_requests):
+    """Every bucket comes back, grouped or not, including windows without any event."""
+    from app.analytics import request_timeseries
+
+    days = [WINDOW + timedelta(days=n) for n in range(3)]
+    end = WINDOW + timedelta(days=3)
+    with db_app.app_context():
+        assert [tuple(row) for row in request_timeseries(WINDOW, end, 'day')] == [
+            (days[0], 0, 1, 0, 0), (days[1], 0, 1, 0, 0), (days[2], 0, 0, 1, 1),
+        ]
+
+        category = window_requests["category"]
+        rows = request_timeseries(WINDOW, end, 'day', 'category')
+        assert sorted(tuple(row) for row in rows) == sorted([
+            (days[0], 0, 0, 0, 0), (days[0], category, 1, 0, 0),
+            (days[1], 0, 1, 0, 0), (days[1], category, 0, 0, 0),
+            (days[2], 0, 0, 1, 1), (days[2], category, 0, 0, 0),
+        ])
+        rows = request_timeseries(WINDOW, end, 'day', 'urgency')
+        assert {(row[0], row[1]): row[2] for row in rows}[(days[0], 'high')] == 1
+        assert len(rows) == 6
+
+        # Nothing happens in 2030: every bucket still comes back, without groups
+        empty = request_timeseries(datetime(2030, 1, 1), datetime(2030, 1, 4), 'day', 'urgency')
+        assert [tuple(row) for row in empty] == [(datetime(2030, 1, n), None, 0, 0, 0) for n in (1, 2, 3)]
+
+
+def test_timeseries_route_keeps_empty_buckets_and_converts_offsets(db_app, window_requests):
+    client = db_app.test_client()
+
+    for group_by in ('category', 'urgency'):
+        body = client.get(f'/api/pm/analytics/timeseries?from=2030-01-01&to=2030-01-04&group_by={group_by}').get_json()
+        assert [point["start"] for point in body["series"]] == ['2030-01-01T00:00:00', '2030-01-02T00:00:00', '2030-01-03T00:00:00']
+        assert all(point["groups"] == [] and point["created"] == 0 for point in body["series"])
+
+    # Midnight to midnight at UTC+8 is 16:00 to 16:00 UTC the day before
+    body = client.get('/api/pm/analytics/timeseries?bucket=hour'
+                      '&from=2031-01-03T00:00:00%2B08:00&to=2031-01-04T00:00:00%2B08:00').get_json()
+    assert body["from"] == '2031-01-02T16:00:00' and body["to"] == '2031-01-03T16:00:00'
+    assert len(body["series"]) == 24
+    assert sum(point["created"] for point in body["series"]) == 1  # 23:30 on the 2nd
+    assert sum(point["completed"] for point in body["series"]) == 1  # 01:00 on the 3rd
+
+
+def _old_counts(days):
+    """{(day, transition): count} by the COUNT(*) predicates /api/pm/analytics used before the rollup."""
+    from sqlalchemy import func
+    from app.database import db
+    from app.models import PinRequest
+
+    counts = {}
+    for day in days:
+        start, end = datetime.combine(day, datetime.min.time()), datetime.combine(day, datetime.max.time())
+        created, closed = db.session.query(
+            func.count().filter(PinRequest.created_at >= start, PinRequest.created_at <= end),
+            func.count().filter(PinRequest.completed_at >= start, PinRequest.completed_at <= end,
+                                PinRequest.status == 'completed'),
+        ).one()
+        counts.update({(day, 'created'): created, (day, 'completed'): closed})
+    return {key: count for key, count in counts.items() if count}
+
+
+def test_daily_rollup_follows_requests_through_every_write(db_app, window_requests):
+    """The trigger-kept rollup equals the old COUNT(*) predicates after each kind of write."""
+    from sqlalchemy import text
+    from app.analytics import daily_request_counts, request_breakdown
+    from app.database import db
+
+    days = [(WINDOW + timedelta(days=n)).date() for n in range(5)]
+    first, second = window_requests["ids"]
+    writes = [
+        ("accept", "UPDATE pin_requests SET status = 'in_progress' WHERE pin_requests_id = :first"),
+        ("complete", "UPDATE pin_requests SET status = 'completed', completed_at = :done WHERE pin_requests_id = :first"),
+        ("recategorize", "UPDATE pin_requests SET category_id = NULL, urgency = NULL WHERE pin_requests_id = :first"),
+        ("reopen", "UPDATE pin_requests SET status = 'open' WHERE pin_requests_id = :second"),
+        ("move", "UPDATE pin_requests SET created_at = :done WHERE pin_requests_id = :second"),
+        ("delete", "DELETE FROM pin_requests WHERE pin_requests_id = :first"),
+    ]
+    with db_app.app_context():
+        for step, statement in [("create", None)] + writes:
+            if statement is not None:
+                db.session.execute(text(statement), {"first": first, "second": second,
+                                                     "done": WINDOW.replace(day=4, hour=12)})
+                db.session.commit()
+            rollup = {(day, transition): count for day, transition, count in daily_request_counts(days[0], days[-1])
+                      if count}
+            assert rollup == _old_counts(days), step
+
+        # Only the second request is left: created on the 4th, reopened, low urgency, no category
+        assert request_breakdown(days[0], days[-1], 'created', 'category') == {0: 1}
+        assert request_breakdown(days[0], days[-1], 'created', 'urgency') == {'low': 1}
+        assert request_breakdown(days[0], days[-1], 'completed', 'day') == {}
+
+
+def test_rollup_rebuilds_agree_with_the_triggers(db_app, window_requests):
+    """REBUILD_SQL, the migration's copy of it and the triggers produce the same table."""
+    from sqlalchemy import text
+    from app.analytics import REBUILD_SQL
+    from app.database import db
+
+    path = os.path.join(os.path.dirname(__file__), '..', 'migrations', 'versions', 'd9f4b2c6e813_daily_request_stats.py')
+    spec = importlib.util.spec_from_file_location('daily_request_stats_migration', path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    snapshot = text("SELECT day, transition, category_id, urgency, request_count FROM daily_request_stats "
+                    "WHERE request_count <> 0 ORDER BY 1, 2, 3, 4")
+    with db_app.app_context():
+        with db.engine.connect() as conn:
+            with conn.begin() as transaction:
+                kept = conn.execute(snapshot).all()
+                conn.execute(text("DELETE FROM daily_request_stats"))
+                conn.execute(text(migration.REBUILD))
+                assert conn.execute(snapshot).all() == kept
+                conn.execute(text("DELETE FROM daily_request_stats"))
+                conn.execute(REBUILD_SQL, {"since": None})
+                assert conn.execute(snapshot).all() == kept
+                conn.execute(text("DELETE FROM daily_request_stats WHERE day >= :since"), {"since": WINDOW.date()})
+                conn.execute(REBUILD_SQL, {"since": WINDOW.date()})
+                assert conn.execute(snapshot).all() == kept
+                transaction.rollback()
@@ -0,0 +1,62 @@
+def test_response_cache_generations_and_limits():
+    """Entries are served only for matching generations and evicted LRU-first past the limits."""
+    from app.cache import ResponseCache
+
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.put('a', (1,), b'aaaa')
+    assert cache.get('a', (1,)) == b'aaaa'
+    assert cache.get('a', (2,)) is None  # a write bumped the generation
+    assert cache.get('a', (1,)) is None  # and the stale entry is gone
+
+    cache.put('a', (1,), b'aaaa')
+    cache.put('b', (1,), b'bbbb')
+    cache.get('a', (1,))
+    cache.put('c', (1,), b'cccc')  # over max_entries: 'b' is least recently used
+    assert cache.get('b', (1,)) is None
+    assert cache.get('a', (1,)) == b'aaaa'
+
+    cache.put('d', (1,), b'dddddd')  # over max_bytes
+    stats = cache.stats()
+    assert stats['bytes'] <= 10
+    assert stats['evictions'] == 2
+    cache.put('huge', (1,), b'x' * 11)
+    assert cache.get('huge', (1,)) is None
+    assert cache.stats()['hits'] == 3
+
+def test_conditional_response_answers_304_without_running_the_view():
+    """A matching If-None-Match short-circuits; a generation bump changes the tag."""
+    from flask import Flask, jsonify
+    from sqlalchemy import text
+    from app.database import db
+    from app.cache import conditional_response
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    calls = []
+
+    @app.route('/items')
+    @conditional_response('items')
+    def items():
+        calls.append(1)
+        return jsonify([1, 2, 3]), 200
+
+    with app.app_context():
+        db.session.execute(text("CREATE TABLE cache_generations (table_name TEXT PRIMARY KEY, generation INTEGER)"))
+        db.session.execute(text("INSERT INTO cache_generations VALUES ('items', 1)"))
+        db.session.commit()
+
+        client = app.test_client()
+        first = client.get('/items')
+        etag = first.headers['ETag']
+        assert first.status_code == 200
+
+        second = client.get('/items', headers={'If-None-Match': etag})
+        assert second.status_code == 304
+        assert len(calls) == 1
+
+        db.session.execute(text("UPDATE cache_generations SET generation = 2"))
+        db.session.commit()
+        third = client.get('/items', headers={'If-None-Match': etag})
+        assert third.status_code == 200
+        assert third.headers['ETag'] != etag
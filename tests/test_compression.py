@@ -0,0 +1,69 @@
+import gzip
+
+def test_compress_response_thresholds_streams_and_opt_out():
+    """Large and streamed bodies are gzipped; small bodies and opted-out routes are not."""
+    from flask import Blueprint, Flask, Response, jsonify
+    from app.compression import compress_response, no_compression, MIN_SIZE
+
+    bp = Blueprint('bp', __name__)
+    bp.after_request(compress_response)
+    rows = [{"id": i, "title": "Help with groceries"} for i in range(200)]
+
+    @bp.route('/big')
+    def big():
+        return jsonify(rows)
+
+    @bp.route('/small')
+    def small():
+        return jsonify({"ok": True})
+
+    @bp.route('/stream')
+    def stream():
+        return Response((f"{i},row\n" for i in range(500)), mimetype='text/csv')
+
+    @bp.route('/raw')
+    @no_compression
+    def raw():
+        return jsonify(rows)
+
+    app = Flask(__name__)
+    app.register_blueprint(bp)
+    client = app.test_client()
+    headers = {'Accept-Encoding': 'gzip'}
+
+    response = client.get('/big', headers=headers)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == client.get('/big').data
+
+    assert len(client.get('/small').data) < MIN_SIZE
+    assert 'Content-Encoding' not in client.get('/small', headers=headers).headers
+    assert 'Content-Encoding' not in client.get('/raw', headers=headers).headers
+
+    streamed = client.get('/stream', headers=headers)
+    assert streamed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(streamed.data).decode() == "".join(f"{i},row\n" for i in range(500))
+
+
+def test_choose_encoding_follows_q_values(monkeypatch):
+    """Brotli only when the client rates it at least as high as gzip."""
+    from flask import Flask
+    from app import compression
+
+    monkeypatch.setattr(compression, 'brotli', object())
+    app = Flask(__name__)
+    for header, expected in [
+        ('br;q=0.1, gzip;q=1.0', 'gzip'),
+        ('gzip, br', 'br'),
+        ('br;q=0.5, gzip;q=0.5', 'br'),
+        ('br', 'br'),
+        ('gzip;q=0.2', 'gzip'),
+        ('*;q=0.3, gzip;q=0.8', 'gzip'),
+        ('identity', None),
+    ]:
+        with app.test_request_context(headers={'Accept-Encoding': header}):
+            assert compression._choose_encoding() == expected, header
+
+    monkeypatch.setattr(compression, 'brotli', None)
+    with app.test_request_context(headers={'Accept-Encoding': 'br, gzip;q=0.1'}):
+        assert compression._choose_encoding() == 'gzip'
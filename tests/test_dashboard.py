@@ -0,0 +1,53 @@
+import threading
+
+
+def test_run_sections_serial_and_pooled():
+    """Sections return the same results either way; pooled ones run in their own app context."""
+    from flask import Flask, current_app
+    from app.dashboard import run_sections
+
+    app = Flask(__name__)
+    sections = {
+        "a": lambda: [1, 2],
+        "b": lambda: (current_app.name, threading.current_thread().name),
+    }
+    with app.app_context():
+        serial, serial_ms = run_sections(sections, workers=0)
+        pooled, pooled_ms = run_sections(sections, workers=2)
+
+    assert serial["a"] == pooled["a"] == [1, 2]
+    assert serial["b"] == (app.name, threading.current_thread().name)
+    assert pooled["b"][0] == app.name
+    assert pooled["b"][1].startswith("dashboard")
+    assert set(serial_ms) == set(pooled_ms) == {"a", "b"}
+    assert all(ms >= 0 for ms in serial_ms.values())
+
+
+def test_dashboard_loads_users_only_for_the_users_section(db_app):
+    """Without the users section only the referenced requesters' names are read, and never passwords."""
+    from sqlalchemy import event, text
+    from app.database import db
+
+    with db_app.app_context():
+        csr_id = db.session.execute(text("SELECT users_id FROM users WHERE role = 'csr_rep' LIMIT 1")).scalar()
+        engine = db.engine
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        client = db_app.test_client()
+        body = client.get(f'/api/csr/dashboard/{csr_id}?sections=open_requests,accepted,shortlist').get_json()
+        assert set(body) == {"open_requests", "accepted", "shortlist", "meta"}
+        user_reads = [s for s in statements if 'FROM users' in s]
+        assert all('WHERE users.users_id IN' in s for s in user_reads)
+        assert not any('password' in s for s in statements)
+
+        statements.clear()
+        body = client.get(f'/api/csr/dashboard/{csr_id}?sections=users').get_json()
+        assert body["users"] and set(body["users"][0]) == {"users_id", "name", "role", "email"}
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert not any('password' in s for s in statements)
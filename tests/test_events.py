@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+
+def test_event_hub_routes_by_channel_and_caps_connections():
+    """Events reach only matching subscriptions; the cap refuses extra streams."""
+    from app.events import EventHub, format_event, stream
+
+    hub = EventHub(max_connections=2)
+    csr = hub.subscribe(["role:csr_rep", "user:10"])
+    pin = hub.subscribe(["user:5"])
+    assert hub.subscribe(["user:6"]) is None
+
+    message = {"id": 7, "type": "request.accepted", "channels": ["role:csr_rep"], "data": {"request_id": 3}}
+    hub.dispatch(message)
+    assert csr.queue.get_nowait() == message
+    assert pin.queue.empty()
+
+    # A replayed event is not sent twice when the live copy arrives
+    hub.dispatch(message)
+    newer = dict(message, id=8)
+    hub.dispatch(newer)
+    body = stream(hub, csr, [message])
+    assert [next(body), next(body), next(body)] == ["retry: 3000\n\n", format_event(message), format_event(newer)]
+    body.close()
+    assert hub.connections() == 1
+
+
+def test_publish_hands_out_event_ids_in_commit_order(db_app):
+    """A second publisher waits for the first to commit, so resuming after its id cannot skip the first."""
+    from sqlalchemy import text
+    from app.database import db
+    from app.events import publish
+    from app.models import PinRequest
+
+    channel = 'test:publish-order'
+    first_published, release_first = threading.Event(), threading.Event()
+    commits = []
+
+    def publish_and_commit(name, hold=None):
+        with db_app.app_context():
+            req = PinRequest.query.first()
+            publish(f'test.{name}', req, [channel])
+            if hold is not None:
+                first_published.set()
+                hold.wait(10)
+            db.session.commit()
+            commits.append(name)
+
+    with db_app.app_context():
+        if PinRequest.query.first() is None:
+            pytest.skip("No requests to publish events for")
+        engine = db.engine
+    first = threading.Thread(target=publish_and_commit, args=('first', release_first))
+    second = threading.Thread(target=publish_and_commit, args=('second',))
+    try:
+        first.start()
+        assert first_published.wait(10)
+        second.start()
+        second.join(0.5)
+        assert second.is_alive()  # queued behind the uncommitted first event
+        release_first.set()
+        first.join(10)
+        second.join(10)
+        assert commits == ['first', 'second']
+        with engine.connect() as conn:
+            types = conn.execute(text(
+                "SELECT event_type FROM request_events WHERE :channel = ANY(channels) ORDER BY event_id"
+            ), {"channel": channel}).scalars().all()
+        assert types == ['test.first', 'test.second']
+    finally:
+        release_first.set()
+        for thread in (first, second):
+            if thread.is_alive():
+                thread.join(10)
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM request_events WHERE :channel = ANY(channels)"), {"channel": channel})
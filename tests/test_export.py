@@ -0,0 +1,36 @@
+import json
+from datetime import datetime
+
+import pytest
+
+
+def test_export_rows_encode_as_csv_and_ndjson():
+    """Datetimes go out as ISO 8601 and booleans as true/false; NULL is an empty CSV cell."""
+    from app.export import csv_converters, encode_rows, export_statement
+
+    statement = export_statement('feedback')
+    columns = [str(column.key) for column in statement.selected_columns]
+    assert columns == ["id", "request_id", "request_title", "category", "rating", "comment", "anonymous", "submitted_at"]
+    rows = [(1, 7, "Groceries", "Shopping", 5, 'Kind, "quick"', True, datetime(2026, 1, 2, 3, 4, 5)),
+            (2, 8, "Lift", "Transport", None, None, False, None)]
+
+    body = encode_rows(rows, columns, 'csv', csv_converters(statement), header=True).decode()
+    assert body.splitlines() == [
+        "id,request_id,request_title,category,rating,comment,anonymous,submitted_at",
+        '1,7,Groceries,Shopping,5,"Kind, ""quick""",true,2026-01-02T03:04:05',
+        "2,8,Lift,Transport,,,false,",
+    ]
+
+    lines = encode_rows(rows, columns, 'ndjson').decode().splitlines()
+    assert json.loads(lines[0])["submitted_at"] == "2026-01-02T03:04:05"
+    assert json.loads(lines[1])["rating"] is None
+
+
+def test_export_statement_rejects_unknown_dataset_and_status_filter():
+    from app.export import ExportError, export_statement
+
+    with pytest.raises(ExportError):
+        export_statement('users')
+    with pytest.raises(ExportError):
+        export_statement('feedback', status='completed')
+    assert 'match_history.match_status' in str(export_statement('matches', status='pending'))
@@ -0,0 +1,29 @@
+import pytest
+
+
+def test_gazetteer_prefers_postcode_then_longest_place():
+    """Postcodes resolve by postal sector; otherwise the most specific place name wins."""
+    from app.geo import Gazetteer
+
+    gazetteer = Gazetteer(
+        places={"jurong": (1.0, 103.0), "jurong west": (2.0, 103.0), "tampines": (3.0, 103.0)},
+        sectors={"52": (4.0, 103.0)},
+    )
+    assert gazetteer.locate("Jurong West St 52") == (2.0, 103.0)
+    assert gazetteer.locate("Jurong Ave 4") == (1.0, 103.0)
+    assert gazetteer.locate("Blk 201 Tampines St 21, S(520201)") == (4.0, 103.0)
+    assert gazetteer.locate("Westjurong") is None
+    assert gazetteer.locate(None) is None
+
+
+def test_parse_geo_args():
+    from app.geo import DEFAULT_NEAREST, GeoQueryError, parse_geo_args
+
+    assert parse_geo_args({}) is None
+    assert parse_geo_args({"lat": "1.3", "lon": "103.8"})["nearest"] == DEFAULT_NEAREST
+    query = parse_geo_args({"near": "Toa Payoh Lorong 5", "radius_km": "2"})
+    assert query["radius_km"] == 2 and query["nearest"] is None
+    for args in ({"lat": "1.3"}, {"lat": "x", "lon": "1"}, {"near": "Atlantis"},
+                 {"nearest": "5"}, {"lat": "1", "lon": "1", "radius_km": "500"}):
+        with pytest.raises(GeoQueryError):
+            parse_geo_args(args)
@@ -48,3 +48,13 @@ def test_database_import():
     assert db is not None
     assert migrate is not None
     assert init_db is not None
+
+def test_normalize_role():
+    """Legacy role labels map to the canonical values stored in users.role."""
+    from app.models import normalize_role, ROLES
+
+    assert normalize_role('CSR Rep') == 'csr_rep'
+    assert normalize_role('PM') == 'platform_manager'
+    assert normalize_role(' Admin ') == 'admin'
+    assert normalize_role('wizard') is None
+    assert all(normalize_role(role) == role for role in ROLES)
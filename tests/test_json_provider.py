@@ -0,0 +1,27 @@
+import pytest
+from datetime import datetime
+
+def test_fast_json_provider_dates_and_msgpack():
+    """Datetimes are ISO 8601 and Accept: application/msgpack switches the encoding."""
+    from flask import Flask, jsonify
+    from app.json_provider import FastJSONProvider, msgpack
+
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+
+    @app.route('/item')
+    def item():
+        return jsonify({"id": 1, "created_at": datetime(2025, 8, 10, 10, 15)})
+
+    client = app.test_client()
+    response = client.get('/item')
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == {"id": 1, "created_at": "2025-08-10T10:15:00"}
+
+    if msgpack is None:
+        pytest.skip("msgpack not installed")
+    packed = client.get('/item', headers={'Accept': 'application/msgpack'})
+    assert packed.mimetype == 'application/msgpack'
+    assert msgpack.unpackb(packed.data) == {"id": 1, "created_at": "2025-08-10T10:15:00"}
+    # Browsers (*/*) keep getting JSON
+    assert client.get('/item', headers={'Accept': '*/*'}).mimetype == 'application/json'
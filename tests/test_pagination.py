@@ -0,0 +1,136 @@
+import pytest
+from datetime import datetime
+
+def test_cursor_round_trip():
+    """Cursors are opaque tokens that decode back to the sort position."""
+    from app.pagination import encode_cursor, decode_cursor
+
+    token = encode_cursor('created_at', 'desc', datetime(2025, 8, 10, 10, 15), 42)
+    assert '=' not in token
+    assert decode_cursor(token) == ('created_at', 'desc', '2025-08-10T10:15:00', 42)
+
+def test_parse_page_args_validates_input():
+    """Limit is capped, sort keys are whitelisted and cursors must match the sort."""
+    from app.models import PinRequest
+    from app.pagination import parse_page_args, encode_cursor, PaginationError, MAX_PAGE_LIMIT
+
+    sort_keys = {"created_at": PinRequest.created_at, "id": PinRequest.pin_requests_id, "title": PinRequest.title}
+
+    page = parse_page_args({'limit': '100000'}, sort_keys, 'created_at')
+    assert page['limit'] == MAX_PAGE_LIMIT
+    assert page['order'] == 'desc'
+    assert page['cursor'] is None
+
+    token = encode_cursor('created_at', 'desc', datetime(2025, 8, 10), 7)
+    page = parse_page_args({'cursor': token}, sort_keys, 'created_at')
+    assert page['cursor'] == (datetime(2025, 8, 10), 7)
+
+    for bad in ({'limit': '0'}, {'limit': 'x'}, {'sort': 'password'}, {'order': 'sideways'},
+                {'cursor': 'not-a-cursor'}, {'cursor': token, 'sort': 'id'},
+                {'cursor': encode_cursor('title', 'desc', None, 7), 'sort': 'title'}):
+        with pytest.raises(PaginationError):
+            parse_page_args(bad, sort_keys, 'created_at')
+
+class RecordingQuery:
+    """Just enough of Query for keyset_page; records the Postgres SQL of every fetch."""
+
+    def __init__(self, statement, log, rows=()):
+        self.statement, self.log, self.rows = statement, log, rows
+
+    def _derive(self, statement):
+        return RecordingQuery(statement, self.log, self.rows)
+
+    def filter(self, *criteria):
+        return self._derive(self.statement.where(*criteria))
+
+    def order_by(self, *clauses):
+        return self._derive(self.statement.order_by(*clauses))
+
+    def limit(self, count):
+        return self._derive(self.statement.limit(count))
+
+    def all(self):
+        from sqlalchemy.dialects import postgresql
+        self.log.append(str(self.statement.compile(dialect=postgresql.dialect())))
+        return list(self.rows)
+
+def test_keyset_page_compares_row_values_without_null_branches():
+    """NOT NULL keys page with one row-value predicate; nullable keys page their NULL rows separately."""
+    from sqlalchemy import select
+    from app.models import PinRequest
+    from app.pagination import parse_page_args, keyset_page, encode_cursor
+
+    sort_keys = {"title": PinRequest.title, "created_at": PinRequest.created_at}
+    log = []
+    token = encode_cursor('title', 'desc', 'Fix squeaky window', 7)
+    page = parse_page_args({'cursor': token, 'limit': '2'}, sort_keys, 'title')
+    keyset_page(RecordingQuery(select(PinRequest), log), page, PinRequest.pin_requests_id)
+    assert len(log) == 1
+    sql = log[0]
+    assert '(pin_requests.title, pin_requests.pin_requests_id) < (' in sql
+    assert 'ORDER BY pin_requests.title DESC, pin_requests.pin_requests_id DESC' in sql
+    assert 'NULLS' not in sql and 'IS NULL' not in sql and ' OR ' not in sql
+
+    # created_at may be NULL: once its non-NULL rows run out, the NULL rows follow by id
+    log = []
+    token = encode_cursor('created_at', 'asc', datetime(2025, 8, 10), 7)
+    page = parse_page_args({'cursor': token, 'order': 'asc'}, sort_keys, 'created_at')
+    keyset_page(RecordingQuery(select(PinRequest), log), page, PinRequest.pin_requests_id)
+    assert len(log) == 2
+    assert '(pin_requests.created_at, pin_requests.pin_requests_id) > (' in log[0]
+    assert 'created_at IS NOT NULL' in log[0] and 'NULLS' not in log[0] and ' OR ' not in log[0]
+    assert 'created_at IS NULL' in log[1] and 'ORDER BY pin_requests.pin_requests_id ASC' in log[1]
+    assert 'pin_requests.pin_requests_id >' not in log[1]  # the cursor was still in the non-NULL rows
+
+    log = []
+    page = parse_page_args({'cursor': encode_cursor('created_at', 'asc', None, 7), 'order': 'asc'}, sort_keys, 'created_at')
+    keyset_page(RecordingQuery(select(PinRequest), log), page, PinRequest.pin_requests_id)
+    assert len(log) == 1 and 'created_at IS NULL' in log[0] and 'pin_requests.pin_requests_id > ' in log[0]
+
+
+def test_history_window_converts_offset_timestamps(db_app):
+    """?from=/?to= with an offset select the same matches whatever the session time zone."""
+    from datetime import datetime
+    from sqlalchemy import event, text
+    from app.database import db
+
+    with db_app.app_context():
+        pin = db.session.execute(text("SELECT users_id FROM users WHERE role = 'pin' LIMIT 1")).scalar()
+        csr = db.session.execute(text("SELECT users_id FROM users WHERE role = 'csr_rep' LIMIT 1")).scalar()
+        if pin is None or csr is None:
+            pytest.skip("No pin and csr_rep users to test with")
+        req = db.session.execute(text(
+            "INSERT INTO pin_requests (user_id, title, status) VALUES (:user, 'Window test', 'in_progress') "
+            "RETURNING pin_requests_id"
+        ), {"user": pin}).scalar()
+        match = db.session.execute(text(
+            "INSERT INTO match_history (csr_id, request_id, matched_at, match_status) "
+            "VALUES (:csr, :req, :at, 'accepted') RETURNING match_history_id"
+        ), {"csr": csr, "req": req, "at": datetime(2031, 1, 3, 0, 30)}).scalar()
+        db.session.commit()
+        engine = db.engine
+
+    def tokyo_session(dbapi_connection, record):
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute("SET TIME ZONE 'Asia/Tokyo'")
+
+    # Fresh connections in a session zone that is neither UTC nor the offset asked for
+    engine.dispose()
+    event.listen(engine, 'connect', tokyo_session)
+    client = db_app.test_client()
+    try:
+        def match_ids(start, end):
+            body = client.get(f'/api/csr/accepted?csr_id={csr}&from={start}&to={end}').get_json()
+            return [row["match_id"] for row in body["items"]]
+
+        # 08:00-09:00 at UTC+8 is 00:00-01:00 UTC
+        assert match_ids('2031-01-03T08:00:00%2B08:00', '2031-01-03T09:00:00%2B08:00') == [match]
+        assert match_ids('2031-01-03T00:00:00', '2031-01-03T01:00:00') == [match]
+        assert match_ids('2031-01-03T08:00:00', '2031-01-03T09:00:00') == []
+    finally:
+        event.remove(engine, 'connect', tokyo_session)
+        engine.dispose()
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM match_history WHERE request_id = :req"), {"req": req})
+            conn.execute(text("DELETE FROM request_events WHERE (payload->>'request_id')::int = :req"), {"req": req})
+            conn.execute(text("DELETE FROM pin_requests WHERE pin_requests_id = :req"), {"req": req})
@@ -0,0 +1,56 @@
+def test_open_request_index_scores_and_stays_dense():
+    """History categories and locations lift a request; closed and shortlisted ones drop out."""
+    from app.recommendations import CsrProfile, OpenRequestIndex
+
+    now = 1_700_000_000.0
+    index = OpenRequestIndex(capacity=2)
+    index.apply([
+        (1, 1, "Tampines", "low", now, "open"),
+        (2, 2, "Bedok", "low", now, "open"),
+        (3, 2, "Bedok", "high", now, "open"),
+        (4, 1, " tampines ", "low", now, "open"),
+    ])
+    profile = CsrProfile.from_history(
+        matches=[(1, "Tampines", "completed", 3), (2, "Bedok", "pending", 1)],
+        shortlist=[(4, 1, "Tampines")],
+    )
+    ids, scores = index.top_k(profile, 10, now=now)
+    assert ids == [1, 3, 2]
+    assert scores == sorted(scores, reverse=True)
+
+    # Request 1 is accepted elsewhere: swap-removed, the rest keep their rows
+    index.apply([(1, 1, "Tampines", "low", now, "matched")])
+    index.discard([2])
+    assert len(index) == 2
+    assert index.top_k(CsrProfile(), 10, now=now)[0] == [3, 4]
+
+
+def test_open_request_index_drops_location_codes_of_closed_requests():
+    """Codes are renumbered to the locations still open; scores come out the same."""
+    from app.recommendations import CsrProfile, OpenRequestIndex
+
+    now = 1_700_000_000.0
+    index = OpenRequestIndex()
+    index.apply([(n, 1, f"Block {n}", "low", now, "open") for n in range(1, 6)])
+    index.apply([(n, 1, f"Block {n}", "low", now, "completed") for n in (1, 2, 4)])
+    profile = CsrProfile(locations={"block 5": 1.0, "block 3": 0.5})
+    before = index.top_k(profile, 10, now=now)
+
+    index._compact_locations()
+    assert index._locations == {'': 0, 'block 3': 1, 'block 5': 2}
+    assert index.top_k(profile, 10, now=now) == before == ([5, 3], before[1])
+
+    index.clear()
+    assert index._locations == {'': 0}
+
+
+def test_recommendations_are_not_revalidated(db_app):
+    """The waiting-time term moves with the clock, so the ranking carries no ETag."""
+    from sqlalchemy import text
+    from app.database import db
+
+    with db_app.app_context():
+        csr = db.session.execute(text("SELECT users_id FROM users WHERE role = 'csr_rep' LIMIT 1")).scalar()
+    response = db_app.test_client().get(f'/api/csr/recommendations/{csr or 0}?limit=5')
+    assert response.status_code == 200
+    assert response.headers.get('ETag') is None
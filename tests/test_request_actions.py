@@ -0,0 +1,51 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+
+def test_accept_and_shortlist_survive_a_concurrent_double_click(db_app):
+    """A click racing an uncommitted insert of the same (csr, request) gets that row's id, not a 500."""
+    from sqlalchemy import text
+    from app.database import db
+    from app.models import User, PinRequest
+
+    app = db_app
+    with app.app_context():
+        pin = User.query.filter_by(role='pin').first()
+        csr = User.query.filter_by(role='csr_rep').first()
+        if pin is None or csr is None:
+            pytest.skip("No pin and csr_rep users to test with")
+        req = PinRequest(user_id=pin.users_id, title='Double click test', status='open')
+        db.session.add(req)
+        db.session.commit()
+        req_id, csr_id = req.pin_requests_id, csr.users_id
+        engine = db.engine
+        db.session.remove()
+
+    client = app.test_client()
+    try:
+        for path, table, key, id_column in (
+            (f'/api/requests/{req_id}/accept', 'match_history', 'match_id', 'match_history_id'),
+            (f'/api/requests/{req_id}/shortlist', 'csr_shortlist', 'shortlist_id', 'csr_shortlist_id'),
+        ):
+            with engine.connect() as other:
+                first_click = other.begin()
+                row_id = other.execute(text(
+                    f"INSERT INTO {table} (csr_id, request_id) VALUES (:csr, :req) RETURNING {id_column}"
+                ), {"csr": csr_id, "req": req_id}).scalar()
+                with ThreadPoolExecutor(1) as pool:
+                    second_click = pool.submit(client.post, path, json={"csr_id": csr_id})
+                    time.sleep(0.5)  # its insert now waits on the open one
+                    first_click.commit()
+                    response = second_click.result(timeout=10)
+            assert response.status_code == 200
+            assert response.get_json()[key] == row_id
+            # And a plain repeat click reuses the row too
+            assert client.post(path, json={"csr_id": csr_id}).get_json()[key] == row_id
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM match_history WHERE request_id = :req"), {"req": req_id})
+            conn.execute(text("DELETE FROM csr_shortlist WHERE request_id = :req"), {"req": req_id})
+            conn.execute(text("DELETE FROM request_events WHERE (payload->>'request_id')::int = :req"), {"req": req_id})
+            conn.execute(text("DELETE FROM pin_requests WHERE pin_requests_id = :req"), {"req": req_id})
@@ -0,0 +1,23 @@
+from sqlalchemy import create_engine, text
+
+def test_schema_registry_snapshot():
+    """The registry answers table/column questions from its snapshot until refreshed."""
+    from app.schema import SchemaRegistry
+
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE pin_requests (pin_requests_id INTEGER PRIMARY KEY, title TEXT)"))
+
+    registry = SchemaRegistry()
+    registry.refresh(engine)
+    assert registry.has_table('pin_requests')
+    assert registry.has_column('pin_requests', 'title')
+    assert not registry.has_column('pin_requests', 'view_count')
+    assert not registry.has_table('feedback')
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE feedback (feedback_id INTEGER PRIMARY KEY)"))
+    assert not registry.has_table('feedback')
+
+    registry.refresh(engine)
+    assert registry.has_table('feedback')
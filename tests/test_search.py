@@ -0,0 +1,7 @@
+def test_search_query_and_highlights():
+    """Words become prefix terms; highlighted text is escaped before marks are added."""
+    from app.routes import HIGHLIGHT_START, HIGHLIGHT_STOP, _highlight, _search_tsquery
+
+    assert _search_tsquery("Groceries, near Tampines!") == "groceries:* & near:* & tampines:*"
+    assert _search_tsquery("  ' & | ") == ""
+    assert _highlight(f"<b>{HIGHLIGHT_START}milk{HIGHLIGHT_STOP}</b>") == "&lt;b&gt;<mark>milk</mark>&lt;/b&gt;"
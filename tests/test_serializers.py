@@ -0,0 +1,25 @@
+import pytest
+from types import SimpleNamespace
+
+def test_request_fields_styles_and_selection():
+    """Default keeps the legacy double keys; ?style= picks one; ?fields= trims the payload."""
+    from app.serializers import RequestFields, FieldSelectionError
+
+    req = SimpleNamespace(pin_requests_id=3, title='Groceries', preferred_time='', urgency='high')
+    fields = ["id", "title", "preferred_time", "urgent", "match_id"]
+
+    assert RequestFields.from_args({}, fields).render(req, match_id=9) == {
+        "id": 3, "title": "Groceries", "preferred_time": None, "preferredTime": None,
+        "urgent": True, "match_id": 9,
+    }
+    assert RequestFields.from_args({'style': 'camel'}, fields).render(req, match_id=9) == {
+        "id": 3, "title": "Groceries", "preferredTime": None, "urgent": True, "matchId": 9,
+    }
+    # Field names are accepted in either case
+    lean = RequestFields.from_args({'fields': 'id,matchId', 'style': 'snake'}, fields)
+    assert lean.render(req, match_id=9) == {"id": 3, "match_id": 9}
+    assert not lean.wants("title")
+
+    for bad in ({'fields': 'id,password'}, {'style': 'kebab'}):
+        with pytest.raises(FieldSelectionError):
+            RequestFields.from_args(bad, fields)
@@ -0,0 +1,86 @@
+import pytest
+
+
+def test_read_cursor_full_and_malformed():
+    """since=0 asks for the full listing; anything undecodable is a SyncCursorError."""
+    from flask import Flask
+    from app.sync import SyncCursorError, read_cursor
+
+    app = Flask(__name__)
+    with app.test_request_context('/?since=0'):
+        assert read_cursor('0', ('pin_requests',)) is None
+        for token in ('garbage', 'WyJub3QtYS1kYXRlIiwgW11d'):
+            with pytest.raises(SyncCursorError):
+                read_cursor(token, ('pin_requests',))
+
+
+def test_delta_sync_returns_changed_rows_and_tombstones(db_app):
+    """A cursor brings back updated rows, late commits inside OVERLAP and deleted ids, and nothing else."""
+    from sqlalchemy import text
+    from app.cache import bump_generations
+    from app.database import db
+
+    with db_app.app_context():
+        pin = db.session.execute(text("SELECT users_id FROM users WHERE role = 'pin' LIMIT 1")).scalar()
+        if pin is None:
+            pytest.skip("No pin user to test with")
+        # Written an hour ago, so only what the test touches is newer than the cursor
+        ids = [db.session.execute(text("""
+            INSERT INTO pin_requests (user_id, title, status, created_at, updated_at)
+            VALUES (:user, :title, 'open', now() AT TIME ZONE 'utc' - interval '1 hour',
+                    now() AT TIME ZONE 'utc' - interval '1 hour')
+            RETURNING pin_requests_id
+        """), {"user": pin, "title": f"Sync test {n}"}).scalar() for n in range(4)]
+        bump_generations('pin_requests')
+        db.session.commit()
+        engine = db.engine
+        db.session.remove()
+    updated, deleted, late, untouched = ids
+    listing = f'/api/help_requests/{pin}'
+    client = db_app.test_client()
+
+    try:
+        with engine.connect() as conn:
+            before_cursor = conn.execute(text("SELECT now() AT TIME ZONE 'utc'")).scalar()
+        body = client.get(f'{listing}?since=0').get_json()
+        assert body["full"] and body["deleted"] == []
+        assert set(ids) <= {row["id"] for row in body["changed"]}
+        cursor = body["cursor"]
+
+        assert client.patch(f'/api/help-requests/{updated}', json={"title": "Sync test renamed"}).status_code == 200
+        assert client.delete(f'/api/help-requests/{deleted}').status_code == 200
+        with engine.begin() as conn:
+            # A write stamped before the cursor was issued but committed after it
+            conn.execute(text("UPDATE pin_requests SET title = 'Sync test late', updated_at = :at "
+                              "WHERE pin_requests_id = :id"), {"at": before_cursor, "id": late})
+
+        body = client.get(f'{listing}?since={cursor}').get_json()
+        assert not body["full"]
+        changed = {row["id"]: row for row in body["changed"]}
+        assert changed[updated]["title"] == "Sync test renamed"
+        assert changed[late]["title"] == "Sync test late"
+        assert deleted not in changed and untouched not in changed
+        assert body["deleted"] == [deleted]
+
+        # Category names are copied into the rows, so a category change forces a full resync
+        with db_app.app_context():
+            bump_generations('categories')
+            db.session.commit()
+        body = client.get(f'{listing}?since={body["cursor"]}').get_json()
+        assert body["full"] and body["deleted"] == []
+        assert {updated, late, untouched} <= {row["id"] for row in body["changed"]}
+
+        # prune-tombstones drops tombstones past the retention window
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE sync_tombstones SET deleted_at = deleted_at - interval '31 days' "
+                              "WHERE request_id = :id"), {"id": deleted})
+        result = db_app.test_cli_runner().invoke(args=['prune-tombstones', '--days', '30'])
+        assert result.exit_code == 0 and result.output.startswith("Pruned ")
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT count(*) FROM sync_tombstones WHERE request_id = :id"),
+                                {"id": deleted}).scalar() == 0
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM sync_tombstones WHERE request_id = ANY(:ids)"), {"ids": ids})
+            conn.execute(text("DELETE FROM request_events WHERE (payload->>'request_id')::int = ANY(:ids)"), {"ids": ids})
+            conn.execute(text("DELETE FROM pin_requests WHERE pin_requests_id = ANY(:ids)"), {"ids": ids})
@@ -0,0 +1,58 @@
+from sqlalchemy import create_engine
+
+def test_view_buffer_aggregates_and_keeps_counts_on_failed_flush():
+    """Views are summed per request and survive a flush that cannot reach the table."""
+    from app.view_counter import ViewCountBuffer
+
+    buffer = ViewCountBuffer()
+    for _ in range(3):
+        buffer.record(7)
+    buffer.record(9)
+    assert buffer._pending == {7: 3, 9: 1}
+    assert buffer.flush() == 0  # no engine configured yet
+
+    # sqlite has no request_view_counts table, so the batch is put back
+    assert buffer.flush(create_engine('sqlite://')) == 0
+    assert buffer._pending == {7: 3, 9: 1}
+
+
+def test_view_buffer_flush_upserts_counts_and_skips_deleted_requests(db_app):
+    """Two flushes add up in request_view_counts; a deleted request's views are dropped, not retried."""
+    from sqlalchemy import text
+    from app.database import db
+    from app.view_counter import ViewCountBuffer
+
+    with db_app.app_context():
+        user = db.session.execute(text("SELECT min(users_id) FROM users")).scalar()
+        insert = text("INSERT INTO pin_requests (user_id, title, status) VALUES (:user, 'View count test', 'open') "
+                      "RETURNING pin_requests_id")
+        kept = db.session.execute(insert, {"user": user}).scalar()
+        deleted = db.session.execute(insert, {"user": user}).scalar()
+        db.session.execute(text("DELETE FROM pin_requests WHERE pin_requests_id = :id"), {"id": deleted})
+        db.session.commit()
+        engine = db.engine
+
+    def stored_views():
+        with engine.connect() as conn:
+            return dict(conn.execute(text(
+                "SELECT request_id, view_count FROM request_view_counts WHERE request_id = ANY(:ids)"
+            ), {"ids": [kept, deleted]}).all())
+
+    buffer = ViewCountBuffer()
+    try:
+        for _ in range(3):
+            buffer.record(kept)
+        buffer.record(deleted, 2)
+        assert buffer.flush(engine) == 2
+        assert stored_views() == {kept: 3}
+
+        buffer.record(kept, 4)
+        buffer.record(deleted)
+        assert buffer.flush(engine) == 2
+        assert stored_views() == {kept: 7}
+        assert buffer._pending == {}
+        assert buffer.flush(engine) == 0
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM request_view_counts WHERE request_id = :id"), {"id": kept})
+            conn.execute(text("DELETE FROM pin_requests WHERE pin_requests_id = :id"), {"id": kept})